@@ -0,0 +1,15 @@
+# -*- coding: utf-8; mode: Python; -*-
+"""Performance benchmarks for marketdata.
+
+The benchmarks are plain scripts, not collected by `pytest`.
+Run them from the repository root, e.g.::
+
+    python -m benchmarks.bench_csv_ingest
+
+`bench_suite` runs the load, lookup and enrichment benchmarks
+and writes machine-readable results, to track regressions::
+
+    python -m benchmarks.bench_suite --output results.json
+    python -m benchmarks.bench_suite --baseline results.json
+
+"""
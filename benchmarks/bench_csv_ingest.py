@@ -0,0 +1,65 @@
+# -*- coding: utf-8; mode: Python; -*-
+"""Benchmark MIC registry csv ingest.
+
+Compares the streaming `read_mic_csv()` with the former
+`csv.DictReader` + `Counter` + list-of-dicts path,
+on the bundled registry scaled up synthetically.
+
+Usage::
+
+    python -m benchmarks.bench_csv_ingest [scale ...]
+
+"""
+
+import os
+import sys
+import csv
+import tempfile
+from collections import Counter
+import pandas as pd
+
+from marketdata.referencedata.mic_csv import read_mic_csv
+from benchmarks.synthetic import scaled_csv, measure, FIXTURE_ENCODING
+
+
+def legacy_read(fna_csv, encoding=FIXTURE_ENCODING):
+    mic_rows = []
+    with open(fna_csv, 'r', encoding=encoding) as the_file:
+        reader = csv.DictReader(the_file)
+        for line in reader:
+            mic_rows.append(line)
+    row = Counter()
+    for k in mic_rows:
+        row.update(k)
+    return pd.DataFrame([k.values() for k in mic_rows], columns=row.keys())
+
+
+def streaming_read(fna_csv, encoding=FIXTURE_ENCODING):
+    return read_mic_csv(fna_csv, encoding=encoding)
+
+
+def chunked_read(fna_csv, encoding=FIXTURE_ENCODING):
+    n = 0
+    for chunk in read_mic_csv(fna_csv, encoding=encoding, chunksize=10000):
+        n += len(chunk)
+    return n
+
+
+def main(scales):
+    print('{:>6} {:>10} {:>10} {:>10} {:>10}'.format(
+        'scale', 'MB', 'variant', 'seconds', 'peak MB'))
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in scales:
+            fna = scaled_csv(os.path.join(tmp, 'mic_x{}.csv'.format(scale)),
+                             scale)
+            size = os.path.getsize(fna) / 2**20
+            for name, func in (('legacy', legacy_read),
+                               ('streaming', streaming_read),
+                               ('chunked', chunked_read)):
+                elapsed, peak = measure(func, fna)
+                print('{:>6} {:>10.1f} {:>10} {:>10.3f} {:>10.1f}'.format(
+                    scale, size, name, elapsed, peak / 2**20))
+
+
+if __name__ == '__main__':
+    main([int(a) for a in sys.argv[1:]] or [1, 10, 100])
@@ -0,0 +1,50 @@
+# -*- coding: utf-8; mode: Python; -*-
+"""Benchmark bulk MIC validation and enrichment.
+
+Enriches synthetic batches of execution records,
+drawn from the bundled registry with 1% unknown venue MICs,
+as string and as categorical columns.
+
+Usage::
+
+    python -m benchmarks.bench_enrich [rows ...]
+
+"""
+
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+from marketdata.referencedata.mic_csv import read_mic_csv
+from marketdata.referencedata.mic_enrich import MICEnricher
+from benchmarks.synthetic import FIXTURE_CSV
+
+
+def venues(mic, rows, seed=0):
+    rng = np.random.default_rng(seed)
+    codes = np.append(mic['MIC'].to_numpy(dtype=object), 'XXXX')
+    p = np.full(len(codes), 0.99 / (len(codes) - 1))
+    p[-1] = 0.01
+    return pd.Series(codes[rng.choice(len(codes), size=rows, p=p)],
+                     dtype=str)
+
+
+def main(sizes):
+    mic = read_mic_csv(FIXTURE_CSV)
+    enricher = MICEnricher(mic)
+    print('{:>10} {:>12} {:>10} {:>14}'.format(
+        'rows', 'input', 'seconds', 'rows/s'))
+    for rows in sizes:
+        s = venues(mic, rows)
+        for name, mics in (('str', s), ('category', s.astype('category'))):
+            t0 = time.perf_counter()
+            df = enricher.enrich(mics)
+            elapsed = time.perf_counter() - t0
+            assert len(df) == rows
+            print('{:>10} {:>12} {:>10.3f} {:>14,.0f}'.format(
+                rows, name, elapsed, rows / elapsed))
+
+
+if __name__ == '__main__':
+    main([int(a) for a in sys.argv[1:]] or [1000000, 10000000])
@@ -0,0 +1,85 @@
+# -*- coding: utf-8; mode: Python; -*-
+"""Benchmark point-in-time lookups in the MIC registry history.
+
+Builds a history of monthly publications of the bundled registry,
+each deactivating and adding a few MICs,
+then enriches synthetic trades with the registry in effect
+at their trade dates.
+
+Usage::
+
+    python -m benchmarks.bench_history [rows ...]
+
+"""
+
+import os
+import sys
+import time
+import datetime
+import tempfile
+import numpy as np
+import pandas as pd
+
+from marketdata.referencedata.mic_csv import read_mic_csv
+from marketdata.referencedata.mic_history import MICHistory
+from benchmarks.synthetic import FIXTURE_CSV
+
+UTC = datetime.timezone.utc
+
+
+def build_history(fna, mic, publications, changes=20, seed=0):
+    rng = np.random.default_rng(seed)
+    start = datetime.datetime(2015, 1, 1, tzinfo=UTC)
+    history = MICHistory(fna)
+    for n in range(publications):
+        pub = start + datetime.timedelta(days=30 * n)
+        deleted = rng.choice(len(mic), size=changes, replace=False)
+        mic = mic.copy()
+        mic.loc[mic.index[deleted], 'STATUS'] = 'DELETED'
+        added = mic.iloc[:changes].copy()
+        added['MIC'] = ['N{:03X}'.format(n * changes + i)
+                        for i in range(changes)]
+        mic = pd.concat([mic, added], ignore_index=True)
+        history.add(mic, pub, pub + datetime.timedelta(days=5))
+    return history
+
+
+def main(sizes, publications=60):
+    mic = read_mic_csv(FIXTURE_CSV)
+    with tempfile.TemporaryDirectory() as d:
+        fna = os.path.join(d, 'history.feather')
+        t0 = time.perf_counter()
+        build_history(fna, mic, publications)
+        print('{} publications added in {:.3f} s'.format(
+            publications, time.perf_counter() - t0))
+        t0 = time.perf_counter()
+        history = MICHistory(fna)
+        print('{} states opened in {:.3f} s'.format(
+            len(history), time.perf_counter() - t0))
+        first = history.versions[0][1]
+        span = (history.versions[-1][1] - first).total_seconds()
+        rng = np.random.default_rng(1)
+        codes = history._table['MIC'].unique()
+        #
+        t0 = time.perf_counter()
+        for m in codes[:1000]:
+            history.as_of(m, first + datetime.timedelta(seconds=span / 2))
+        print('as_of: {:,.0f} lookups/s'.format(
+            1000 / (time.perf_counter() - t0)))
+        #
+        print('{:>10} {:>10} {:>14}'.format('rows', 'seconds', 'rows/s'))
+        for rows in sizes:
+            mics = pd.Series(codes[rng.integers(len(codes), size=rows)],
+                             dtype=str)
+            dates = first + pd.to_timedelta(
+                rng.uniform(0, span, size=rows), unit='s')
+            t0 = time.perf_counter()
+            df = history.as_of_join(mics, dates)
+            elapsed = time.perf_counter() - t0
+            assert len(df) == rows
+            print('{:>10} {:>10.3f} {:>14,.0f}'.format(
+                rows, elapsed, rows / elapsed))
+
+
+if __name__ == '__main__':
+    main([int(a) for a in sys.argv[1:]] or [100000, 1000000])
@@ -0,0 +1,90 @@
+# -*- coding: utf-8; mode: Python; -*-
+"""Benchmark import time of marketdata.referencedata.
+
+Each case runs in a fresh interpreter,
+and reports the median wall time and the heavy modules imported.
+Exits with status 1 if the median import time of
+`marketdata.referencedata.iso10383mic` exceeds `--max-ms`.
+
+Usage::
+
+    python -m benchmarks.bench_import [--repeat N] [--max-ms MS]
+
+"""
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+from benchmarks.synthetic import FIXTURE_DIR
+
+HEAVY_MODULES = ('lxml', 'dateutil', 'requests', 'cachecontrol',
+                 'requests_testadapter', 'pandas', 'pyarrow')
+
+_TEMPLATE = '''
+import sys, time, json
+t0 = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - t0
+print(json.dumps([elapsed, [m for m in {heavy!r} if m in sys.modules]]))
+'''
+
+
+def run(code, repeat):
+    root = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+    times = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, '-c',
+             _TEMPLATE.format(code=code, heavy=HEAVY_MODULES)],
+            check=True, stdout=subprocess.PIPE, universal_newlines=True,
+            cwd=root)
+        elapsed, modules = json.loads(out.stdout)
+        times.append(elapsed)
+    return statistics.median(times), modules
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--repeat', type=int, default=5)
+    ap.add_argument('--max-ms', type=float, default=None)
+    args = ap.parse_args(argv)
+    #
+    with tempfile.TemporaryDirectory() as tmp:
+        kwargs = dict(mic_site='file://' + FIXTURE_DIR + '/',
+                      mic_rel_url='market-identifier-codes.html',
+                      mic_cache_dir=os.path.join(tmp, 'cache'),
+                      mic_persistence_dir=os.path.join(tmp, 'persistence'))
+        prologue = ('from marketdata.referencedata.iso10383mic'
+                    ' import ISO10383MIC\n'
+                    'mic = ISO10383MIC(**{!r})\n'.format(kwargs))
+        run(prologue + 'mic.open_shared()', 1)
+        cases = (
+            ('import iso10383mic',
+             'import marketdata.referencedata.iso10383mic'),
+            ('snapshot lookup',
+             prologue + 'mic.download_mic(); mic.lookup("XCSE")'),
+            ('shared lookup',
+             prologue + 'mic.open_shared().lookup("XCSE")'),
+        )
+        results = {}
+        for name, code in cases:
+            results[name] = run(code, args.repeat)
+            ms, modules = results[name]
+            print('{:<20} {:>8.1f} ms  {}'.format(
+                name, ms * 1000, ' '.join(modules) or '-'))
+    #
+    import_ms = results['import iso10383mic'][0] * 1000
+    if args.max_ms is not None and import_ms > args.max_ms:
+        print('Import time {:.1f} ms exceeds {:.1f} ms.'.format(
+            import_ms, args.max_ms))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
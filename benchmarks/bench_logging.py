@@ -0,0 +1,86 @@
+# -*- coding: utf-8; mode: Python; -*-
+"""Benchmark the cost of diagnostics on the hot paths.
+
+Times repeated loads of the persisted bundled registry,
+and calls of the cache heuristic,
+with DEBUG logging disabled and enabled (to a null handler),
+and compares the per-call cost of the cached, lazily formatted
+method loggers with the former logger-per-call pattern.
+
+Usage::
+
+    python -m benchmarks.bench_logging [loads] [calls]
+
+"""
+
+import os
+import sys
+import time
+import inspect
+import logging
+import datetime
+import tempfile
+from email.utils import formatdate
+
+from marketdata.referencedata.iso10383mic import (
+    ISO10383MIC, classname, method_logger)
+from marketdata.referencedata.one_day_heuristic import OneDayHeuristic
+from benchmarks.synthetic import FIXTURE_DIR
+
+
+class _Response:
+    def __init__(self):
+        self.headers = {'date': formatdate(usegmt=True),
+                        'expires': formatdate(usegmt=True),
+                        'cache-control': 'no-cache'}
+
+
+class _Legacy:
+    def log(self, t):
+        lna = classname(self) + '.' + inspect.currentframe().f_code.co_name
+        logger = logging.getLogger(lna)
+        logger.debug('... mtime = ' + t.isoformat())
+
+
+class _Current:
+    def log(self, t):
+        logger = method_logger(classname(self), 'log')
+        logger.debug('... mtime = %s', t)
+
+
+def per_call(func, n, *args):
+    t0 = time.perf_counter()
+    for _ in range(n):
+        func(*args)
+    return (time.perf_counter() - t0) / n
+
+
+def main(loads, calls):
+    root = logging.getLogger()
+    root.addHandler(logging.NullHandler())
+    t = datetime.datetime.now(tz=datetime.timezone.utc)
+    with tempfile.TemporaryDirectory() as tmp:
+        mic = ISO10383MIC(mic_site='file://' + FIXTURE_DIR + '/',
+                          mic_rel_url='market-identifier-codes.html',
+                          mic_cache_dir=os.path.join(tmp, 'cache'),
+                          mic_persistence_dir=os.path.join(tmp, 'persist'))
+        mic.download_mic()
+        heuristic = OneDayHeuristic()
+        response = _Response()
+        print('{:>8} {:>22} {:>12}'.format('DEBUG', 'call', 'us/call'))
+        for level in (logging.WARNING, logging.DEBUG):
+            root.setLevel(level)
+            name = 'on' if level == logging.DEBUG else 'off'
+            for label, func, n, args in (
+                    ('download_mic', mic.download_mic, loads, ()),
+                    ('update_headers', heuristic.update_headers, calls,
+                     (response,)),
+                    ('log, logger per call', _Legacy().log, calls, (t,)),
+                    ('log, cached logger', _Current().log, calls, (t,))):
+                print('{:>8} {:>22} {:>12.2f}'.format(
+                    name, label, per_call(func, n, *args) * 1e6))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 100000)
@@ -0,0 +1,66 @@
+# -*- coding: utf-8; mode: Python; -*-
+"""Benchmark the compact, typed MIC registry.
+
+Compares memory use and typical queries of the plain string registry
+with `compact_mic()`, and month-year parsing with `dateutil`,
+on the bundled registry scaled up synthetically.
+
+Usage::
+
+    python -m benchmarks.bench_mic_schema [scale ...]
+
+"""
+
+import os
+import sys
+import timeit
+import tempfile
+from dateutil import parser as dtparser
+
+from marketdata.referencedata.mic_csv import read_mic_csv
+from marketdata.referencedata.mic_schema import compact_mic, parse_month_year
+from benchmarks.synthetic import scaled_csv
+
+
+def queries(df):
+    return {
+        'groupby country':
+            lambda: df.groupby('COUNTRY', observed=True).size(),
+        'filter O/S == S':
+            lambda: df[df['O/S'] == 'S'],
+        'filter country GB':
+            lambda: df[df['ISO COUNTRY CODE (ISO 3166)'] == 'GB'],
+    }
+
+
+def best(func, number=5):
+    return min(timeit.repeat(func, number=1, repeat=number))
+
+
+def main(scales):
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in scales:
+            fna = scaled_csv(os.path.join(tmp, 'mic_x{}.csv'.format(scale)),
+                             scale)
+            df = read_mic_csv(fna)
+            cdf = compact_mic(df)
+            print('scale {}: {} rows'.format(scale, len(df)))
+            print('  {:<24} {:>12} {:>12}'.format('', 'plain', 'compact'))
+            print('  {:<24} {:>12.2f} {:>12.2f}'.format(
+                'memory MB',
+                df.memory_usage(deep=True).sum() / 2**20,
+                cdf.memory_usage(deep=True).sum() / 2**20))
+            q, cq = queries(df), queries(cdf)
+            for name in q:
+                print('  {:<24} {:>12.5f} {:>12.5f}'.format(
+                    name + ' s', best(q[name]), best(cq[name])))
+            dates = df['STATUS DATE']
+            print('  {:<24} {:>12.5f} {:>12.5f}'.format(
+                'parse dates s',
+                best(lambda: [dtparser.parse(d, fuzzy=True)
+                              for d in dates if d], number=1),
+                best(lambda: parse_month_year(dates))))
+
+
+if __name__ == '__main__':
+    main([int(a) for a in sys.argv[1:]] or [1, 10, 100])
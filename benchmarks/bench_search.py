@@ -0,0 +1,55 @@
+# -*- coding: utf-8; mode: Python; -*-
+"""Benchmark MIC search latency, as behind an autocomplete.
+
+Types venue names from the bundled registry one character at a time,
+searching after every keystroke, and reports latency percentiles
+with a cold and a warm term cache.
+
+Usage::
+
+    python -m benchmarks.bench_search [names]
+
+"""
+
+import sys
+import time
+import numpy as np
+
+from marketdata.referencedata.mic_csv import read_mic_csv
+from marketdata.referencedata.mic_search import MICSearchIndex
+from benchmarks.synthetic import FIXTURE_CSV
+
+
+def keystrokes(mic, names, seed=0):
+    rng = np.random.default_rng(seed)
+    texts = mic['NAME-INSTITUTION DESCRIPTION'].to_numpy(dtype=object)
+    queries = []
+    for text in rng.choice(texts, size=names):
+        text = ' '.join(text.split()[:3])
+        queries.extend(text[:n] for n in range(1, len(text) + 1))
+    return queries
+
+
+def main(names):
+    mic = read_mic_csv(FIXTURE_CSV)
+    t0 = time.perf_counter()
+    index = MICSearchIndex(mic)
+    print('index of {} tokens built in {:.1f} ms'.format(
+        len(index), (time.perf_counter() - t0) * 1e3))
+    queries = keystrokes(mic, names)
+    print('{:>6} {:>8} {:>8} {:>8} {:>8}'.format(
+        'cache', 'queries', 'p50 us', 'p99 us', 'max us'))
+    for cache in ('cold', 'warm'):
+        latencies = []
+        for q in queries:
+            if cache == 'cold':
+                index._terms.clear()
+            t0 = time.perf_counter()
+            index.search(q)
+            latencies.append((time.perf_counter() - t0) * 1e6)
+        print('{:>6} {:>8} {:>8.0f} {:>8.0f} {:>8.0f}'.format(
+            cache, len(queries), *np.percentile(latencies, [50, 99, 100])))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
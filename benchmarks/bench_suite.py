@@ -0,0 +1,238 @@
+# -*- coding: utf-8; mode: Python; -*-
+"""Benchmark suite of the MIC registry, with machine-readable results.
+
+Serves the bundled publication page, with the registry scaled up
+synthetically, from a local HTTP server, and measures at every scale:
+
+* `cold_load`, `download_mic()` with empty cache and persistence,
+* `warm_load`, a new instance loading the persisted data and snapshot,
+* `cache_hit_load`, a new instance with empty persistence,
+  the page served from the HTTP cache, the data file fetched again,
+* `lookup`, point lookups of random MICs,
+* `enrich`, bulk enrichment of random MICs.
+
+Loads run in a fresh process each, and report their peak memory
+and the `LoadStats` phases.
+The results are written as JSON, and can be compared with
+the results of a baseline, e.g. of the previous release.
+
+Usage::
+
+    python -m benchmarks.bench_suite [--scales 1 10 100 1000]
+        [--output results.json]
+        [--baseline baseline.json [--tolerance 0.25]]
+
+Exits with status 1 if a result is slower than its baseline
+by more than the tolerance.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import datetime
+import platform
+import tempfile
+import threading
+import subprocess
+import email.utils
+import http.server
+import numpy as np
+
+from benchmarks.synthetic import FIXTURE_DIR, scaled_csv, measure_call
+
+LOOKUPS = 100000
+ENRICH_ROWS = 1000000
+
+
+class _CachingHandler(http.server.SimpleHTTPRequestHandler):
+    """Serve files as the publication site does, cacheable for a day."""
+
+    def end_headers(self):
+        self.send_header('Cache-Control', 'public, max-age=86400')
+        self.send_header('Expires', email.utils.formatdate(
+            time.time() + 86400, usegmt=True))
+        super().end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(directory):
+    """Serve `directory` over HTTP on localhost, return the server."""
+    def handler(*args, **kwargs):
+        return _CachingHandler(*args, directory=directory, **kwargs)
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def synthetic_site(directory, scale):
+    """Write the publication page and a registry scaled by `scale`."""
+    os.makedirs(directory)
+    shutil.copy(os.path.join(FIXTURE_DIR, 'market-identifier-codes.html'),
+                directory)
+    scaled_csv(os.path.join(directory, 'ISO10383_MIC.csv'), scale)
+
+
+def load(site, cache_dir, persistence_dir):
+    from marketdata.referencedata.iso10383mic import ISO10383MIC
+    mic = ISO10383MIC(mic_site=site,
+                      mic_rel_url='market-identifier-codes.html',
+                      mic_cache_dir=cache_dir,
+                      mic_persistence_dir=persistence_dir)
+    mic.download_mic()
+    return len(mic.mic), mic.stats.as_dict()
+
+
+def load_result(name, scale, site, cache_dir, persistence_dir):
+    (rows, stats), seconds, peak = measure_call(
+        load, site, cache_dir, persistence_dir)
+    return {'name': name, 'scale': scale, 'rows': rows,
+            'seconds': seconds, 'peak_bytes': peak,
+            'ops_per_second': None, 'stats': stats}
+
+
+def lookup_result(scale, mic):
+    rng = np.random.default_rng(0)
+    codes = rng.choice(mic.mic['MIC'].to_numpy(dtype=object), size=LOOKUPS)
+    lookup = mic.lookup
+    t0 = time.perf_counter()
+    for code in codes:
+        lookup(code)
+    seconds = time.perf_counter() - t0
+    return {'name': 'lookup', 'scale': scale, 'rows': len(mic.mic),
+            'seconds': seconds, 'peak_bytes': None,
+            'ops_per_second': LOOKUPS / seconds, 'stats': None}
+
+
+def enrich_result(scale, mic):
+    import pandas as pd
+    rng = np.random.default_rng(0)
+    mics = pd.Series(rng.choice(mic.mic['MIC'].to_numpy(dtype=object),
+                                size=ENRICH_ROWS), dtype=str)
+    mic.enrich(mics[:1])
+    t0 = time.perf_counter()
+    mic.enrich(mics)
+    seconds = time.perf_counter() - t0
+    return {'name': 'enrich', 'scale': scale, 'rows': len(mic.mic),
+            'seconds': seconds, 'peak_bytes': None,
+            'ops_per_second': ENRICH_ROWS / seconds, 'stats': None}
+
+
+def run(scales, tmp):
+    from marketdata.referencedata.iso10383mic import ISO10383MIC
+    # Import the load stack up front, for the forked loads
+    # to measure loading only, see bench_import for import times
+    import pandas  # noqa: F401
+    import requests  # noqa: F401
+    import cachecontrol  # noqa: F401
+    from marketdata.referencedata import mic_csv, mic_snapshot  # noqa: F401
+    mic_snapshot.snapshot_available()
+    results = []
+    server = serve(tmp)
+    try:
+        for scale in scales:
+            synthetic_site(os.path.join(tmp, 'x{}'.format(scale)), scale)
+            site = 'http://127.0.0.1:{}/x{}/'.format(server.server_port,
+                                                     scale)
+            cache_dir = os.path.join(tmp, 'cache_x{}'.format(scale))
+            persistence_dir = os.path.join(tmp,
+                                           'persistence_x{}'.format(scale))
+            results.append(load_result('cold_load', scale, site,
+                                       cache_dir, persistence_dir))
+            results.append(load_result('warm_load', scale, site,
+                                       cache_dir, persistence_dir))
+            results.append(load_result('cache_hit_load', scale, site,
+                                       cache_dir, persistence_dir + '_2'))
+            mic = ISO10383MIC(mic_site=site,
+                              mic_rel_url='market-identifier-codes.html',
+                              mic_cache_dir=cache_dir,
+                              mic_persistence_dir=persistence_dir)
+            mic.download_mic()
+            results.append(lookup_result(scale, mic))
+            results.append(enrich_result(scale, mic))
+            for r in results[-5:]:
+                print('{:>6} {:>15} {:>10} {:>10.4f} {:>10} {:>14}'.format(
+                    r['scale'], r['name'], r['rows'], r['seconds'],
+                    '' if r['peak_bytes'] is None
+                    else '{:.1f}'.format(r['peak_bytes'] / 2**20),
+                    '' if r['ops_per_second'] is None
+                    else '{:,.0f}'.format(r['ops_per_second'])),
+                    file=sys.stderr)
+    finally:
+        server.shutdown()
+    return results
+
+
+def environment():
+    import pandas as pd
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL, universal_newlines=True,
+            cwd=os.path.dirname(os.path.realpath(__file__))).stdout.strip()
+    except OSError:
+        commit = ''
+    return {'created': datetime.datetime.now(
+                tz=datetime.timezone.utc).isoformat(),
+            'commit': commit or None,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__}
+
+
+def regressions(results, baseline, tolerance):
+    """Return the results slower than their baseline by over `tolerance`."""
+    base = {(r['name'], r['scale']): r for r in baseline['results']}
+    slower = []
+    for r in results:
+        b = base.get((r['name'], r['scale']))
+        if b is not None and r['seconds'] > b['seconds'] * (1 + tolerance):
+            slower.append((r, b))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.bench_suite',
+        description='Benchmark MIC registry load, lookup and enrichment.')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100],
+                        help='scales of the synthetic registries')
+    parser.add_argument('--output', default='-',
+                        help='file to write the JSON results to,'
+                        ' default standard output')
+    parser.add_argument('--baseline',
+                        help='JSON results to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='relative slowdown reported as a regression')
+    args = parser.parse_args(argv)
+    print('{:>6} {:>15} {:>10} {:>10} {:>10} {:>14}'.format(
+        'scale', 'benchmark', 'rows', 'seconds', 'peak MB', 'ops/s'),
+        file=sys.stderr)
+    with tempfile.TemporaryDirectory() as tmp:
+        results = run(args.scales, tmp)
+    report = dict(environment(), results=results)
+    if args.output == '-':
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, 'w') as fh:
+            json.dump(report, fh, indent=2)
+    if args.baseline:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+        slower = regressions(results, baseline, args.tolerance)
+        for r, b in slower:
+            print('REGRESSION {} x{}: {:.4f}s, baseline {:.4f}s'.format(
+                r['name'], r['scale'], r['seconds'], b['seconds']),
+                file=sys.stderr)
+        return 1 if slower else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
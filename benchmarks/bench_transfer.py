@@ -0,0 +1,100 @@
+# -*- coding: utf-8; mode: Python; -*-
+"""Benchmark the memory of fetching files to disk.
+
+Fetches the largest files of the bundled publication set,
+from `file://` and from a local HTTP server,
+holding the whole body in memory before writing it out,
+as `download_mic()` used to, or streaming it to disk in chunks,
+and reports the peak memory allocated by Python.
+
+Fetches go through the session `download_mic()` fetches
+the data file with, drawing from the shared `HTTPSessionPool`,
+and, for comparison, through the caching session of the
+publication page, with an empty HTTP cache.
+`CacheControl` serializes the whole body in memory to store it,
+which is why the data file is not fetched through it.
+
+Usage::
+
+    python -m benchmarks.bench_transfer
+
+"""
+
+import os
+import time
+import tempfile
+import threading
+import functools
+import tracemalloc
+import http.server
+
+from marketdata.referencedata.iso10383mic import ISO10383MIC
+from benchmarks.synthetic import FIXTURE_DIR
+
+FILES = ('ISO10383_MIC.xml', 'ISO10383_MIC.xls', 'ISO10383_MIC.pdf')
+
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def buffered(sess, url, fna):
+    resp = sess.get(url)
+    with open(fna, 'wb') as fh:
+        fh.write(resp.content)
+
+
+def streamed(sess, url, fna):
+    with sess.get(url, stream=True) as resp:
+        ISO10383MIC._write_stream(fna, resp)
+
+
+def peak(func, *args):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - t0
+    _, nbytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return nbytes, elapsed
+
+
+def main():
+    handler = functools.partial(_QuietHandler, directory=FIXTURE_DIR)
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    sess = ISO10383MIC()._data_session()
+    http_site = 'http://127.0.0.1:{}/'.format(server.server_port)
+    print('{:>18} {:>12} {:>10} {:>10} {:>10}'.format(
+        'file', 'site', 'transfer', 'peak MiB', 'ms'))
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            fna = os.path.join(tmp, 'fetched')
+            n = 0
+            for name in FILES:
+                for site, url in (('file', 'file://' + FIXTURE_DIR + '/'),
+                                  ('http', http_site),
+                                  ('http cached', http_site)):
+                    for label, func in (('buffered', buffered),
+                                        ('streamed', streamed)):
+                        if site == 'http cached':
+                            # A new, empty, HTTP cache
+                            n += 1
+                            s = ISO10383MIC(
+                                mic_cache_dir=os.path.join(
+                                    tmp, 'cache{}'.format(n)),
+                            )._cached_session()
+                        else:
+                            s = sess
+                        nbytes, elapsed = peak(func, s, url + name, fna)
+                        print('{:>18} {:>12} {:>10} {:>10.2f} {:>10.1f}'
+                              .format(name, site, label, nbytes / 2**20,
+                                      elapsed * 1e3))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+# -*- coding: utf-8; mode: Python; -*-
+"""Benchmark MIC registry xml ingest against csv ingest.
+
+Compares `read_mic_xml()` and `read_mic_csv()`,
+reading the whole registry and reading it in chunks,
+on the bundled csv and xml files of the same publication,
+scaled up synthetically.
+
+Usage::
+
+    python -m benchmarks.bench_xml_ingest [scale ...]
+
+"""
+
+import os
+import sys
+import tempfile
+
+from marketdata.referencedata.mic_csv import read_mic_csv
+from marketdata.referencedata.mic_xml import read_mic_xml
+from benchmarks.synthetic import (scaled_csv, scaled_xml, measure,
+                                  FIXTURE_ENCODING)
+
+CHUNKSIZE = 10000
+
+
+def csv_read(fna):
+    return read_mic_csv(fna, encoding=FIXTURE_ENCODING)
+
+
+def csv_chunked_read(fna):
+    n = 0
+    for chunk in read_mic_csv(fna, encoding=FIXTURE_ENCODING,
+                              chunksize=CHUNKSIZE):
+        n += len(chunk)
+    return n
+
+
+def xml_read(fna):
+    return read_mic_xml(fna)
+
+
+def xml_chunked_read(fna):
+    n = 0
+    for chunk in read_mic_xml(fna, chunksize=CHUNKSIZE):
+        n += len(chunk)
+    return n
+
+
+def main(scales):
+    print('{:>6} {:>6} {:>10} {:>10} {:>10} {:>10}'.format(
+        'scale', 'format', 'MB', 'variant', 'seconds', 'peak MB'))
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in scales:
+            fna_csv = scaled_csv(
+                os.path.join(tmp, 'mic_x{}.csv'.format(scale)), scale)
+            fna_xml = scaled_xml(
+                os.path.join(tmp, 'mic_x{}.xml'.format(scale)), scale)
+            for fmt, fna, variants in (
+                    ('csv', fna_csv, (('whole', csv_read),
+                                      ('chunked', csv_chunked_read))),
+                    ('xml', fna_xml, (('whole', xml_read),
+                                      ('chunked', xml_chunked_read)))):
+                size = os.path.getsize(fna) / 2**20
+                for name, func in variants:
+                    elapsed, peak = measure(func, fna)
+                    print('{:>6} {:>6} {:>10.1f} {:>10} {:>10.3f} {:>10.1f}'
+                          .format(scale, fmt, size, name, elapsed,
+                                  peak / 2**20))
+
+
+if __name__ == '__main__':
+    main([int(a) for a in sys.argv[1:]] or [1, 10, 100])
@@ -0,0 +1,112 @@
+# -*- coding: utf-8; mode: Python; -*-
+"""Synthetic MIC registries scaled up from the bundled test data."""
+
+import os
+import re
+import csv
+import time
+import resource
+import multiprocessing
+
+FIXTURE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.realpath(__file__))),
+    'tests', 'data', 'iso10383mic', 'www.iso20022.org',
+)
+FIXTURE_CSV = os.path.join(FIXTURE_DIR, 'ISO10383_MIC.csv')
+FIXTURE_XML = os.path.join(FIXTURE_DIR, 'ISO10383_MIC.xml')
+FIXTURE_ENCODING = 'windows-1252'
+
+
+def scaled_csv(fna, scale, src=FIXTURE_CSV, encoding=FIXTURE_ENCODING):
+    """Write a copy of `src` with every data row repeated `scale` times.
+
+    MIC and OPERATING MIC of the copies are suffixed with the copy number,
+    so they stay unique across the synthetic registry.
+    """
+    with open(src, 'r', encoding=encoding, newline='') as fi:
+        rows = list(csv.reader(fi))
+    header, body = rows[0], rows[1:]
+    i_mic = header.index('MIC')
+    i_op = header.index('OPERATING MIC')
+    with open(fna, 'w', encoding=encoding, newline='') as fo:
+        writer = csv.writer(fo, quoting=csv.QUOTE_ALL)
+        writer.writerow(header)
+        for n in range(scale):
+            suffix = '' if n == 0 else str(n)
+            for row in body:
+                if suffix:
+                    row = list(row)
+                    row[i_mic] += suffix
+                    row[i_op] += suffix
+                writer.writerow(row)
+    return fna
+
+
+def scaled_xml(fna, scale, src=FIXTURE_XML):
+    """Write a copy of the xml file `src` with every row repeated.
+
+    As `scaled_csv()`, MIC and OPERATING MIC of the copies are suffixed
+    with the copy number.
+    """
+    with open(src, 'r', encoding='utf-8') as fi:
+        text = fi.read()
+    first = text.index('<MICs_x0020_List_x0020_by_x0020_Country>')
+    last = text.rindex('</MICs_x0020_List_x0020_by_x0020_Country>')
+    last += len('</MICs_x0020_List_x0020_by_x0020_Country>')
+    head, body, tail = text[:first], text[first:last], text[last:]
+    codes = re.compile(r'(<(MIC|OPERATING_x0020_MIC)>)([^<]*)(</\2>)')
+    with open(fna, 'w', encoding='utf-8') as fo:
+        fo.write(head)
+        for n in range(scale):
+            if n == 0:
+                fo.write(body)
+            else:
+                fo.write(codes.sub(
+                    lambda m: m.group(1) + m.group(3) + str(n) + m.group(4),
+                    body))
+            fo.write('\n')
+        fo.write(tail)
+    return fna
+
+
+def _measure_child(conn, func, args):
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    t0 = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - t0
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    conn.send((result, elapsed, (after - before) * 1024))
+    conn.close()
+
+
+def measure_call(func, *args):
+    """Run `func(*args)` in a fresh process.
+
+    Returns
+    -------
+    tuple
+        The result of the call, which must be picklable,
+        wall time in seconds, and growth of peak resident memory in bytes.
+    """
+    ctx = multiprocessing.get_context('fork')
+    parent, child = ctx.Pipe(duplex=False)
+    p = ctx.Process(target=_measure_child, args=(child, func, args))
+    p.start()
+    result = parent.recv()
+    p.join()
+    return result
+
+
+def measure(func, *args):
+    """Run `func(*args)` in a fresh process.
+
+    Returns
+    -------
+    tuple
+        Wall time in seconds, and growth of peak resident memory in bytes.
+    """
+    return measure_call(_discard, func, *args)[1:]
+
+
+def _discard(func, *args):
+    func(*args)
@@ -0,0 +1,215 @@
+# -*- coding: utf-8; mode: Python; -*-
+
+import threading
+import requests
+from urllib3 import PoolManager
+from urllib3.exceptions import ReadTimeoutError
+from urllib3.util.retry import Retry
+from cachecontrol.adapter import CacheControlAdapter
+from .local_file_adapter import LocalFileAdapter
+
+
+class _PooledAdapter:
+    """Transport adapter mixin drawing connections from an `HTTPSessionPool`.
+
+    Fills in the timeout of the pool when a request has none,
+    and raises `requests.ReadTimeout` for reads timing out.
+    Closing the adapter leaves the connections of the pool open.
+    """
+    def __init__(self, session_pool, **kwargs):
+        self.session_pool = session_pool
+        super().__init__(max_retries=session_pool.retry(), **kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False,
+                         **pool_kwargs):
+        self.poolmanager = self.session_pool.pool_manager()
+
+    def send(self, request, stream=False, timeout=None, **kwargs):
+        if timeout is None:
+            timeout = self.session_pool.timeout
+        try:
+            # As keywords, the adapters below may take other parameters
+            # in other positions
+            return super().send(request, stream=stream, timeout=timeout,
+                                **kwargs)
+        except requests.ConnectionError as e:
+            # Out of retries, requests reports read timeouts
+            # as connection errors
+            reason = getattr(e.args[0] if e.args else None, 'reason', None)
+            if isinstance(reason, ReadTimeoutError):
+                raise requests.ReadTimeout(e, request=request) from e
+            raise
+
+    def close(self):
+        for proxy in self.proxy_manager.values():
+            proxy.clear()
+
+
+class _HTTPAdapter(_PooledAdapter, requests.adapters.HTTPAdapter):
+    pass
+
+
+class _CacheControlAdapter(_PooledAdapter, CacheControlAdapter):
+    pass
+
+
+class HTTPSessionPool:
+    """Pool of keep-alive HTTP connections, shared by requests sessions.
+
+    Every session returned by `session()` sends its requests
+    through the connections of the pool,
+    so connections and TLS sessions are reused across sessions,
+    e.g. across refreshes of every `ISO10383MIC` in the process.
+    See `shared_pool()`.
+
+    Parameters
+    ----------
+
+    pool_connections : int, optional
+        Number of hosts to keep connections to. Defaults to 10.
+    pool_maxsize : int, optional
+        Maximum number of connections kept open to a host.
+        Defaults to 10.
+    pool_block : bool, optional
+        Wait for a free connection, rather than opening
+        one more, not kept, when `pool_maxsize` are in use.
+        Defaults to `False`.
+    timeout : float or tuple or None, optional
+        Timeout in seconds of the requests without their own timeout,
+        as a `(connect, read)` tuple or a float for both.
+        Defaults to `(10, 60)`.
+        `None` waits forever.
+    retries : int, optional
+        Maximum number of retries of a request
+        failing to connect or read,
+        or answered with a status in `status_forcelist`.
+        Defaults to 3.
+    backoff_factor : float, optional
+        The n-th retry waits `backoff_factor * 2 ** (n - 1)` seconds,
+        the first one not at all. Defaults to 0.5.
+    status_forcelist : tuple of int, optional
+        Statuses retried, honouring `Retry-After`.
+        Defaults to `(429, 500, 502, 503, 504)`.
+
+    Notes
+    -----
+
+    Only idempotent requests (GET, HEAD, ...) are retried.
+    A request still answered with a status in `status_forcelist`
+    after its retries returns that response, it does not raise.
+    Connections to `file://` URLs are not pooled,
+    they are served by a `LocalFileAdapter`.
+
+    The pool is thread-safe, a session is best used by a single thread.
+    """
+    def __init__(self, pool_connections=10, pool_maxsize=10,
+                 pool_block=False, timeout=(10, 60), retries=3,
+                 backoff_factor=0.5,
+                 status_forcelist=(429, 500, 502, 503, 504)):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.status_forcelist = tuple(status_forcelist)
+        self._pool_manager = None
+        self._lock = threading.Lock()
+
+    def pool_manager(self):
+        """Return the `urllib3` pool manager holding the connections.
+
+        Created by the first call.
+        """
+        with self._lock:
+            if self._pool_manager is None:
+                self._pool_manager = PoolManager(
+                    num_pools=self.pool_connections,
+                    maxsize=self.pool_maxsize,
+                    block=self.pool_block)
+            return self._pool_manager
+
+    def retry(self):
+        """Return the `urllib3` retry configuration of the requests."""
+        return Retry(total=self.retries,
+                     backoff_factor=self.backoff_factor,
+                     status_forcelist=self.status_forcelist,
+                     raise_on_status=False)
+
+    def adapter(self, cache=None, heuristic=None):
+        """Return a transport adapter drawing from the pool.
+
+        Parameters
+        ----------
+        cache : object or None, optional
+            A `CacheControl` cache, to cache the responses.
+            Defaults to `None`, not cached.
+        heuristic : BaseHeuristic or None, optional
+            The `CacheControl` heuristic of the cached responses.
+        """
+        if cache is None:
+            return _HTTPAdapter(self)
+        return _CacheControlAdapter(self, cache=cache, heuristic=heuristic)
+
+    def session(self, cache=None, heuristic=None):
+        """Return a requests session sending through the pool.
+
+        The session serves `file://` URLs with a `LocalFileAdapter`,
+        and the others with an `adapter()` of the pool,
+        caching the responses if a `cache` is given.
+        Sessions are cheap, the connections belong to the pool.
+        """
+        sess = requests.session()
+        sess.mount('file://', LocalFileAdapter())
+        adapter = self.adapter(cache=cache, heuristic=heuristic)
+        sess.mount('http://', adapter)
+        sess.mount('https://', adapter)
+        return sess
+
+    def clear(self):
+        """Close the connections of the pool."""
+        with self._lock:
+            if self._pool_manager is not None:
+                self._pool_manager.clear()
+
+
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+
+def shared_pool():
+    """Return the process-wide `HTTPSessionPool`.
+
+    Created by the first call, with the default parameters,
+    unless set by `configure_shared_pool()`.
+    Every `ISO10383MIC` without its own `mic_http_pool` fetches through it.
+    """
+    global _shared_pool
+    pool = _shared_pool
+    if pool is None:
+        with _shared_pool_lock:
+            if _shared_pool is None:
+                _shared_pool = HTTPSessionPool()
+            pool = _shared_pool
+    return pool
+
+
+def configure_shared_pool(**kwargs):
+    """Replace the process-wide `HTTPSessionPool`.
+
+    Parameters
+    ----------
+    **kwargs
+        Parameters of the new `HTTPSessionPool`.
+
+    Returns
+    -------
+    HTTPSessionPool
+        The new pool, used by the sessions created from now on.
+        Sessions already created keep the former pool.
+    """
+    global _shared_pool
+    pool = HTTPSessionPool(**kwargs)
+    with _shared_pool_lock:
+        _shared_pool = pool
+    return pool
@@ -1,19 +1,20 @@
 # -*- coding: utf-8; mode: Python; -*-
 
 import os
-import sys
 import datetime
-import csv
-import inspect
-from lxml import html
-from dateutil import parser as dtparser
-import requests
-from cachecontrol import CacheControl
-from cachecontrol.caches.file_cache import FileCache
-import pandas as pd
+import functools
+import collections
+import hashlib
 import logging
-from .one_day_heuristic import OneDayHeuristic
-from requests_testadapter import Resp
+from .mic_index import MICIndex
+from .mic_stats import LoadStats
+from .refresh_policy import PublicationRefreshPolicy
+
+#
+# Heavy dependencies (lxml, dateutil, requests, cachecontrol, pandas,
+# pyarrow) are imported on the code paths that need them,
+# so a lookup served from a snapshot never imports the download stack.
+#
 
 # From . import oneDayHeuristic
 # import oneDayHeuristic
@@ -23,7 +24,6 @@ from requests_testadapter import Resp
 #
 #
 module_logger = logging.getLogger(__name__)
-module_logger.setLevel(logging.DEBUG)
 
 # docstring guide https://numpydoc.readthedocs.io/en/latest/format.html
 
@@ -40,55 +40,20 @@ def typename(x):
 def classname(x):
     return x.__class__.__qualname__
 
-#
-#
-#
-
-
-class LocalFileAdapter(requests.adapters.HTTPAdapter):
-    """Transport adapter to handle local files in requests.
-
-    The requests library doesn't know how to handle local files.
-    The current version allows you to define transport adapters.
-
-    References
-    ----------
-
-    Based on `b1r3k <https://stackoverflow.com/users/216172/b1r3k>`_'s
-    `answer <https://stackoverflow.com/a/22989322>`_.
-
-    This implementation uses
-    `requests-testadapter <https://github.com/ambv/requests-testadapter>`_.
-
-    Examples
-    --------
-
-    Intended usage:
 
-    >>> requests_session = requests.session()
-    >>> requests_session.mount('file://', LocalFileAdapter())
-    >>> requests_session.get('file:///dev/null')
+@functools.lru_cache(maxsize=None)
+def method_logger(qualname, method):
+    """Return the logger of `method` of class `qualname`, created once."""
+    return logging.getLogger(qualname + '.' + method)
 
-    """
-    def build_response_from_file(self, request):
-        lna = classname(self) + '.' + inspect.currentframe().f_code.co_name
-        logger = logging.getLogger(lna)
-
-        logger.debug('url       = "{}"'.format(request.url))
-        file_path = request.url[7:]
-        logger.debug('file_path = "{}"'.format(file_path))
-        with open(file_path, 'rb') as file:
-            buff = bytearray(os.path.getsize(file_path))
-            file.readinto(buff)
-            resp = Resp(buff)
-            r = self.build_response(request, resp)
-
-            return r
-
-    def send(self, request, stream=False, timeout=None,
-             verify=True, cert=None, proxies=None):
 
-        return self.build_response_from_file(request)
+def __getattr__(name):
+    # LocalFileAdapter used to be defined here, import it on demand
+    if name == 'LocalFileAdapter':
+        from .local_file_adapter import LocalFileAdapter
+        return LocalFileAdapter
+    raise AttributeError('module {!r} has no attribute {!r}'.format(
+        __name__, name))
 
 
 class ISO10383MIC:
@@ -98,6 +63,10 @@ class ISO10383MIC:
     trading platforms, regulated or non-regulated markets
     and trade reporting facilities.
 
+    An instance is updated in place by `download_mic()`,
+    and is not thread-safe.
+    Use a `MICRegistry` to share the registry between threads.
+
 
     Parameters
     ----------
@@ -117,6 +86,73 @@ class ISO10383MIC:
     mic_persistence_dir : str, optional
         Path name to a directory to store data intended
         to exist, and be shared across class instances.
+    mic_compact : bool, optional
+        Convert the MIC registry to a compact, typed representation,
+        with categorical columns and datetime dates.
+        See `compact_mic()`.
+        Defaults to `False`, all columns as strings.
+    mic_snapshot : bool, optional
+        Persist a binary snapshot of the parsed MIC registry
+        in `mic_persistence_dir`,
+        and load it instead of parsing the publication page and csv file
+        when it matches the current publication.
+        Requires `pyarrow`, and is ignored if it is not installed.
+        Defaults to `True`.
+    mic_refresh_policy : RefreshPolicy, optional
+        When to fetch persisted data from `mic_site` again.
+        A fetch due by the policy revalidates the publication page
+        with `mic_site`, rather than use the HTTP cache.
+        Defaults to `PublicationRefreshPolicy()`,
+        trusting persisted data until the announced next publication.
+    mic_shared : bool, optional
+        Publish the MIC registry and its lookup indexes
+        to a memory-mapped file in `mic_persistence_dir`
+        on every call to `download_mic()`,
+        to be shared by processes through `open_shared()`.
+        Requires `pyarrow`.
+        Defaults to `False`.
+    mic_history : bool, optional
+        Add every publication loaded by `download_mic()`
+        to the point-in-time history in `mic_persistence_dir`,
+        see `open_history()`.
+        Requires `pyarrow`.
+        Defaults to `False`.
+    mic_format : {'csv', 'xml'}, optional
+        Format of the MIC registry file to download and parse.
+        The xml file is UTF-8 encoded,
+        and keeps characters the csv file cannot represent
+        in `mic_csv_encoding`.
+        Defaults to 'csv'.
+    mic_lock_timeout : float or None, optional
+        Maximum number of seconds `download_mic()` waits
+        for another process loading the MIC registry
+        into the same `mic_persistence_dir`.
+        Defaults to `None`, wait until it is done.
+    mic_cache : {'file', 'memory', 'sqlite'} or object, optional
+        The HTTP cache of the publication page fetched from `mic_site`:
+        'file' for the unbounded `CacheControl` `FileCache`
+        in `mic_cache_dir`, one file per entry,
+        'memory' for a bounded, in-memory `LRUCache`,
+        'sqlite' for a bounded `SQLiteCache`, a single file
+        in `mic_cache_dir`,
+        or a cache object implementing the `CacheControl` cache interface,
+        e.g. an `LRUCache` or `SQLiteCache` with other bounds.
+        Defaults to 'file'.
+    mic_heuristic : PublicationHeuristic, optional
+        How long responses from `mic_site` are cached,
+        and how long the persisted files may be used when stale:
+        while being revalidated in the background,
+        `stale_while_revalidate`,
+        or when fetching from `mic_site` fails, `stale_if_error`.
+        Defaults to `PublicationHeuristic()`,
+        caching responses for a day, and never using stale files.
+    mic_http_pool : HTTPSessionPool, optional
+        The pool of keep-alive connections to fetch from `mic_site`,
+        with the timeout and the retries of the fetches.
+        Defaults to `shared_pool()`, shared by every instance
+        in the process: connections are reused across refreshes
+        and instances, and fetches time out after 10 seconds connecting
+        or 60 seconds waiting for data, after 3 retries with backoff.
 
     Attributes
     ----------
@@ -129,12 +165,39 @@ class ISO10383MIC:
         next version of the MIC registry.
     mic : pandas.DataFrame or None
         This version of the MIC registry.
+    fetch_time : datetime.datetime or None
+        The time the publication page of this version
+        was fetched from `mic_site`.
+    index : MICIndex or None
+        Hash indexes over this version of the MIC registry.
+        Rebuilt by every call to `download_mic()`.
     from_cache : boleean
-        Is data fetched from cached session, rather than
-        from `mic_site`.
+        Is the publication page fetched from the HTTP cache,
+        rather than from `mic_site`.
+        The csv or xml file is never cached,
+        it is fetched from `mic_site` unless persisted.
     from_persisted : boleean
         Is data fetched from persisted data, rather than
         from `mic_site`, or cached session.
+    revalidation_counts : collections.Counter
+        How often a refresh found the csv or xml file unchanged:
+        `same_publication` (not fetched, publication unchanged),
+        `not_modified` (conditional request answered 304),
+        `unchanged` (fetched content identical),
+        `modified` (fetched content changed),
+        and `parse_skipped` (registry already parsed from it).
+    changes : MICChangeSet or None
+        The changes from the previous version of the MIC registry
+        to this version, or `None` if there is no previous version.
+        See `subscribe()`.
+    stats : LoadStats or None
+        The timings and counters of the last load,
+        see `add_stats_hook()`.
+    http_cache : object or None
+        The HTTP cache selected by `mic_cache`,
+        created by the first fetch of the publication page.
+        The `LRUCache` and `SQLiteCache` report
+        hit rate and evictions as `http_cache.stats`.
 
     Notes
     -----
@@ -175,10 +238,22 @@ class ISO10383MIC:
                  mic_csv_encoding='windows-1252',
                  mic_tmp_dir='/tmp/ISO10383MIC',
                  mic_cache_dir='/tmp/ISO10383MIC/cache',
-                 mic_persistence_dir='/tmp/ISO10383MIC/persistence'):
+                 mic_persistence_dir='/tmp/ISO10383MIC/persistence',
+                 mic_compact=False,
+                 mic_snapshot=True,
+                 mic_shared=False,
+                 mic_refresh_policy=None,
+                 mic_history=False,
+                 mic_format='csv',
+                 mic_lock_timeout=None,
+                 mic_cache='file',
+                 mic_heuristic=None,
+                 mic_http_pool=None):
         #
-        lna = classname(self) + '.' + inspect.currentframe().f_code.co_name
-        logger = logging.getLogger(lna)
+        # The parameters, to load with another instance, see _revalidate()
+        self._init_kwargs = dict(locals())
+        del self._init_kwargs['self']
+        logger = method_logger(classname(self), '__init__')
 
         logger.debug('Class "%s" instantiated.',
                      classname(self))
@@ -190,8 +265,19 @@ class ISO10383MIC:
         self.implementation_time = None
         self.next_publication_time = None
         self.mic = None
+        self.index = None
+        self._enricher = None
+        self._search_index = None
+        self._aload_future = None
+        self.fetch_time = None
         self.from_cache = False
         self.from_persisted = False
+        self.revalidation_counts = collections.Counter()
+        self._csv_digest = None
+        self.changes = None
+        self._subscribers = []
+        self.stats = None
+        self._stats_hooks = []
         #
         self._mic_site = mic_site
         self._mic_rel_url = mic_rel_url
@@ -199,6 +285,34 @@ class ISO10383MIC:
         self._mic_tmp_dir = mic_tmp_dir
         self._mic_cache_dir = mic_cache_dir
         self._mic_persistence_dir = mic_persistence_dir
+        self._mic_compact = mic_compact
+        if mic_snapshot:
+            from .mic_snapshot import snapshot_available
+            mic_snapshot = snapshot_available()
+        self._mic_snapshot = mic_snapshot
+        self._mic_shared = mic_shared
+        self._mic_history = mic_history
+        if mic_format not in ('csv', 'xml'):
+            raise ValueError('Unsupported mic_format {!r}.'.format(mic_format))
+        self._mic_format = mic_format
+        self._mic_lock_timeout = mic_lock_timeout
+        if isinstance(mic_cache, str):
+            from .mic_cache import CACHE_BACKENDS
+            if mic_cache not in CACHE_BACKENDS:
+                raise ValueError(
+                    'Unsupported mic_cache {!r}.'.format(mic_cache))
+        self._mic_cache = mic_cache
+        self.http_cache = None
+        self._mic_http_pool = mic_http_pool
+        self._session = None
+        self._data_sess = None
+        # Created by the first fetch if not given, see _loaded_heuristic()
+        self._heuristic = mic_heuristic
+        self._revalidation = None
+        self._history = None
+        if mic_refresh_policy is None:
+            mic_refresh_policy = PublicationRefreshPolicy()
+        self._refresh_policy = mic_refresh_policy
 
     def download_mic(self):
         """Download MIC registry and convert it to a pandas.DataFrame.
@@ -228,15 +342,198 @@ class ISO10383MIC:
         pandas.DataFrame
             The MIC registry as downloaded.
 
+        Raises
+        ------
+        TimeoutError
+            If another process loading the MIC registry
+            did not finish within `mic_lock_timeout`.
+
+        Notes
+        -----
+
+        Processes sharing `mic_persistence_dir` load one at a time,
+        under a file lock.
+        Processes started while one fetches from `mic_site`
+        wait for it,
+        and then find the persisted data fresh and reuse it,
+        rather than fetching it again.
+        Persisted files are written to a temporary file
+        and renamed into place,
+        so they are never read partially written.
+        """
+        previous = self._previous_version()
+        with self._persistence_lock():
+            stats = self._timed_load()
+            if self._mic_shared:
+                with stats.timed('shared_publish'):
+                    self._publish_shared()
+            if self._mic_history:
+                with stats.timed('history_add'):
+                    self.open_history().add(self.mic,
+                                            self.publication_time,
+                                            self.implementation_time)
+        self._publish_changes(previous)
+        self._publish_stats(stats)
+        return self.mic
+
+    def subscribe(self, subscriber):
+        """Subscribe to the changes between versions of the MIC registry.
+
+        Whenever `download_mic()` loads a new version of the registry,
+        the changes from the previous version, as a `MICChangeSet`,
+        are passed to every subscriber,
+        so derived data can be updated incrementally.
+        The previous version is the one loaded by this instance,
+        or, on the first load, the persisted snapshot.
+
+        Parameters
+        ----------
+        subscriber : callable or queue
+            Called with the `MICChangeSet`,
+            or, if it has a `put_nowait()` method, like a `queue.Queue`,
+            the `MICChangeSet` is put on it.
+
+        Notes
+        -----
+
+        Subscribers are called in the thread running `download_mic()`.
+        Use `loop.call_soon_threadsafe()` to hand change sets
+        over to an asyncio event loop.
         """
+        self._subscribers.append(subscriber)
 
-        # logger = logging.getLogger(__name__)
-        lna = classname(self) + '.' + inspect.currentframe().f_code.co_name
-        logger = logging.getLogger(lna)
+    def unsubscribe(self, subscriber):
+        """Remove a subscriber added by `subscribe()`."""
+        self._subscribers.remove(subscriber)
 
-        logger.debug('Class method "%s" entry.',
-                     classname(self) + '.' +
-                     inspect.currentframe().f_code.co_name + '()')
+    def _previous_version(self):
+        """Return the loaded version of the registry, to diff against.
+
+        Returns
+        -------
+        tuple or None
+            The MIC registry, its publication time,
+            and the digest of the file it was parsed from.
+        """
+        if self.mic is not None:
+            return self.mic, self.publication_time, self._csv_digest
+        if not self._subscribers:
+            return None
+        fna_snap = os.path.join(self._mic_persistence_dir,
+                                'ISO10383_MIC.feather')
+        snap = self._read_snapshot(fna_snap)
+        if snap is None:
+            return None
+        return (snap[0], snap[1]['publication_time'],
+                snap[1].get('csv_digest'))
+
+    def _publish_changes(self, previous):
+        logger = method_logger(classname(self), '_publish_changes')
+        if previous is None or self.mic is previous[0]:
+            return
+        if (previous[2] is not None and previous[2] == self._csv_digest
+                and previous[1] == self.publication_time):
+            # Reloaded from the very same file, nothing to diff
+            return
+        from .mic_diff import diff_mic
+        changes = diff_mic(previous[0], self.mic,
+                           publication_time=self.publication_time,
+                           previous_publication_time=previous[1])
+        if not changes and self.publication_time == previous[1]:
+            return
+        logger.debug('MIC registry changes: %r.', changes)
+        self.changes = changes
+        for subscriber in list(self._subscribers):
+            try:
+                put = getattr(subscriber, 'put_nowait', None)
+                if put is not None:
+                    put(changes)
+                else:
+                    subscriber(changes)
+            except Exception:
+                logger.exception('Subscriber %r failed.', subscriber)
+
+    def add_stats_hook(self, hook):
+        """Add a hook receiving the timings and counters of every load.
+
+        Parameters
+        ----------
+        hook : callable
+            Called with the `LoadStats` of every `download_mic()`,
+            e.g. to forward `LoadStats.as_dict()`
+            to a metrics system.
+
+        Notes
+        -----
+
+        Hooks are called in the thread running `download_mic()`,
+        after the subscribers.
+        A failing hook is logged, and does not fail the load.
+        """
+        self._stats_hooks.append(hook)
+
+    def remove_stats_hook(self, hook):
+        """Remove a hook added by `add_stats_hook()`."""
+        self._stats_hooks.remove(hook)
+
+    def _timed_load(self):
+        """Load the MIC registry, and return the `LoadStats` of the load."""
+        stats = LoadStats()
+        counts = collections.Counter(self.revalidation_counts)
+        self._load_mic(stats)
+        stats.counters.update(self.revalidation_counts - counts)
+        stats.from_cache = self.from_cache
+        stats.from_persisted = self.from_persisted
+        self.stats = stats
+        return stats
+
+    def _publish_stats(self, stats):
+        logger = method_logger(classname(self), '_publish_stats')
+        stats.finish()
+        logger.debug('Load stats: %r.', stats)
+        for hook in list(self._stats_hooks):
+            try:
+                hook(stats)
+            except Exception:
+                logger.exception('Stats hook %r failed.', hook)
+
+    @property
+    def refresh_policy(self):
+        """The `RefreshPolicy` deciding when to fetch from `mic_site`."""
+        return self._refresh_policy
+
+    async def aload(self, executor=None):
+        """Download the MIC registry without blocking the event loop.
+
+        The asyncio counterpart of `download_mic()`.
+        The download, file I/O and parsing run in `executor`,
+        and concurrent callers share one in-flight load.
+
+        Parameters
+        ----------
+        executor : concurrent.futures.Executor, optional
+            Executor to run the load in.
+            Defaults to the default executor of the running loop.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The MIC registry as downloaded.
+        """
+        import asyncio
+        loop = asyncio.get_running_loop()
+        future = self._aload_future
+        if future is None or future.done() or future.get_loop() is not loop:
+            future = loop.run_in_executor(executor, self.download_mic)
+            self._aload_future = future
+        # A cancelled caller must not cancel the load shared with others
+        return await asyncio.shield(future)
+
+    def _load_mic(self, stats):
+        logger = method_logger(classname(self), '_load_mic')
+
+        logger.debug('Class method "%s._load_mic()" entry.',
+                     classname(self))
         #
         # Coded from the contents of
         # 'https://www.iso20022.org/market-identifier-codes'
@@ -244,34 +541,77 @@ class ISO10383MIC:
         os.makedirs(self._mic_persistence_dir, exist_ok=True)
         fna_pub = os.path.join(self._mic_persistence_dir,
                                'market-identifier-codes.html')
+        fna_snap = os.path.join(self._mic_persistence_dir,
+                                'ISO10383_MIC.feather')
         #
-        requests_session = requests.session()
-        requests_session.mount('file://', LocalFileAdapter())
-
         use_persisted_mic_pub = False
+        # Due for refresh by the refresh policy, poll mic_site itself
+        refresh_due = False
+        stale_if_error_until = None
+        snap = None
+        page = None
         if os.path.isfile(fna_pub):
             logger.debug(' Persistence file "%s" exists.',
                          fna_pub)
             now = datetime.datetime.now(tz=datetime.timezone.utc)
             mtime = datetime.datetime.fromtimestamp(os.stat(fna_pub).st_mtime,
                                                     datetime.timezone.utc)
-            age = now - mtime
-            logger.debug('... mtime = ' + mtime.isoformat())
-            logger.debug('... now = ' + now.isoformat())
-            logger.debug('... File age = ' + str(age))
-            if (age < datetime.timedelta(days=0, hours=23)):
-                logger.debug(
-                    '... less than 23 hours old - use persisted file.')
-                use_persisted_mic_pub = True
-        #
-        if (use_persisted_mic_pub):
+            logger.debug('... mtime = %s', mtime)
+            logger.debug('... now = %s', now)
             # read content from persisted file
-            fh = open(fna_pub, 'rb')
-            binary_page_content = fh.read()
-            fh.close()
-            self.from_cache = False
-            self.from_persisted = True
-        else:
+            with stats.timed('page_read') as t:
+                fh = open(fna_pub, 'rb')
+                binary_page_content = fh.read()
+                fh.close()
+                t.nbytes = len(binary_page_content)
+            page_digest = hashlib.sha1(binary_page_content).hexdigest()
+            #
+            # The next publication time is known from the snapshot
+            # taken from this very publication page, or by parsing it
+            with stats.timed('snapshot_read') as t:
+                snap = self._read_snapshot(fna_snap, page_digest=page_digest)
+                t.nbytes = self._file_size(fna_snap, snap)
+            if snap is None:
+                try:
+                    with stats.timed('page_parse', len(binary_page_content)):
+                        page = self._publication_page(binary_page_content,
+                                                      page_digest)
+                except ValueError as e:
+                    # Never used, and so due for refresh
+                    logger.warning('Persisted file "%s" is unparseable: %s.',
+                                   fna_pub, e)
+                    page = None
+            if snap is None and page is None:
+                refresh_due = True
+            else:
+                next_publication_time = (
+                    snap[1]['next_publication_time'] if snap is not None
+                    else page[3])
+                next_check = self._refresh_policy.next_check(
+                    mtime, next_publication_time)
+                logger.debug('... next check = %s', next_check)
+                heuristic = self._heuristic
+                stale_while_revalidate = getattr(
+                    heuristic, 'stale_while_revalidate', None)
+                stale_if_error = getattr(heuristic, 'stale_if_error', None)
+                refresh_due = now >= next_check
+                if now < next_check:
+                    logger.debug('... not due for refresh'
+                                 ' - use persisted file.')
+                    use_persisted_mic_pub = True
+                    self.fetch_time = mtime
+                elif (stale_while_revalidate is not None
+                      and now < next_check + stale_while_revalidate):
+                    logger.debug('... stale - use persisted file,'
+                                 ' and revalidate in the background.')
+                    use_persisted_mic_pub = True
+                    self.fetch_time = mtime
+                    stats.counters['stale_while_revalidate'] += 1
+                    self._revalidate()
+                if stale_if_error is not None:
+                    stale_if_error_until = next_check + stale_if_error
+        #
+        if not use_persisted_mic_pub:
             logger.debug('Persisted file "%s"'
                          ' is unsuitable, fetch from source.',
                          fna_pub)
@@ -279,155 +619,675 @@ class ISO10383MIC:
             logger.debug('fetch from "%s".',
                          self._mic_site + self._mic_rel_url)
             #
-            cache_override = OneDayHeuristic()
-
-            # cached_sess = CacheControl(requests.Session(),
-            os.makedirs(self._mic_cache_dir, exist_ok=True)
-
-            cached_sess = CacheControl(requests_session,
-                                       heuristic=cache_override,
-                                       cache=FileCache(self._mic_cache_dir))
-            resp = cached_sess.get(self._mic_site + self._mic_rel_url)
+            cached_sess = self._cached_session()
+            # Revalidate with mic_site, rather than get the page
+            # cached by the heuristic for longer than the policy says
+            headers = {'Cache-Control': 'no-cache'} if refresh_due else {}
+            try:
+                with stats.timed('page_fetch') as t:
+                    resp = cached_sess.get(self._mic_site
+                                           + self._mic_rel_url,
+                                           headers=headers)
+                    # Never persist an error page as the publication page
+                    resp.raise_for_status()
+                    t.nbytes = len(resp.content)
+            except Exception as e:
+                import requests
+                if (not isinstance(e, requests.RequestException)
+                        or stale_if_error_until is None
+                        or now >= stale_if_error_until):
+                    raise
+                logger.warning('Fetch from "%s" failed: %s,'
+                               ' use stale persisted file "%s".',
+                               self._mic_site + self._mic_rel_url,
+                               e, fna_pub)
+                use_persisted_mic_pub = True
+                self.fetch_time = mtime
+                stats.counters['stale_if_error'] += 1
+        if (use_persisted_mic_pub):
+            self.from_cache = False
+            self.from_persisted = True
+            stats.counters['persisted'] += 1
+        else:
+            snap = None
+            page = None
             binary_page_content = resp.content
             try:
                 self.from_cache = resp.from_cache
                 logger.debug('from_cache reported by CacheControl:'
-                             + ' from_cache = {}'.format(self.from_cache))
+                             ' from_cache = %s', self.from_cache)
             except AttributeError:
                 self.from_cache = False
                 logger.debug('from_cache missing from CacheControl.'
-                             + ' Default from_cache ='
-                             + ' {}'.format(self.from_cache))
+                             ' Default from_cache = %s', self.from_cache)
             #
             # Write new content to persisted file
-            fh = open(fna_pub, 'wb')
-            fh.write(binary_page_content)
-            fh.close()
+            self._write_file(fna_pub, binary_page_content)
+            page_digest = hashlib.sha1(binary_page_content).hexdigest()
+            self.fetch_time = datetime.datetime.fromtimestamp(
+                os.stat(fna_pub).st_mtime, datetime.timezone.utc)
             self.from_persisted = False
+            stats.counters['cache_hit' if self.from_cache
+                           else 'cache_miss'] += 1
         #
-        # Parse it using the html module and save the result in tree.
+        # Use the parsed snapshot, if taken from this very publication page
         #
-        # We need to use page.content rather than page.text because
-        # html.fromstring implicitly expects bytes as input.
-        tree = html.fromstring(binary_page_content)
-        # A good introduction to XPath is on
-        # http://www.w3schools.com/xml/xpath_intro.asp
+        if snap is not None:
+            self._use_snapshot(snap, stats)
+            logger.debug('Return MIC from snapshot "%s".', fna_snap)
+            return self.mic
         #
-        XPATH_ROW = '//*[@id="block-iso20022-theme-content"]/article' \
-            + '/div[2]/div[3]/div/div/table/tbody/tr'
-        XPATH_CSV_URL = XPATH_ROW + '/td[3]/a/@href'
-        XPATH_PUB_DATE = XPATH_ROW + '/td[6]/text()'
-        XPATH_IMP_DATE = XPATH_ROW + '/td[7]/text()'
-        XPATH_NEXT_DATE = XPATH_ROW + '/td[8]/text()'
+        # Parse the publication page, unless already done
         #
-        mic_csv_rel_url = tree.xpath(XPATH_CSV_URL)[0].replace('\u00A0', ' ')
-        logger.debug('Parsed Rel. URL to publication in csv format: "'
-                     + mic_csv_rel_url
-                     + '"')
-        d = tree.xpath(XPATH_PUB_DATE)[0].replace('\u00A0', ' ')
-        self.publication_time \
-            = dtparser.parse(d).replace(tzinfo=datetime.timezone.utc)
-        logger.debug('Parsed Publication date: '
-                     + self.publication_time.isoformat())
-        d = tree.xpath(XPATH_IMP_DATE)[0].replace('\u00A0', ' ')
-        self.implementation_time \
-            = dtparser.parse(d).replace(tzinfo=datetime.timezone.utc)
-        logger.debug('Parsed Implementation date: '
-                     + self.implementation_time.isoformat())
-        d = tree.xpath(XPATH_NEXT_DATE)[0].replace('\u00A0', ' ')
-        self.next_publication_time \
-            = dtparser.parse(d).replace(tzinfo=datetime.timezone.utc)
-        logger.debug('Parsed Next Publication date: '
-                     + self.next_publication_time.isoformat())
+        if page is None:
+            with stats.timed('page_parse', len(binary_page_content)):
+                page = self._publication_page(binary_page_content,
+                                              page_digest)
+        mic_data_rel_url = page[0]
+        self.publication_time = page[1]
+        self.implementation_time = page[2]
+        self.next_publication_time = page[3]
+        if self._heuristic is not None:
+            self._heuristic.next_publication_time = self.next_publication_time
+        #
+        # Use the parsed snapshot, if taken from the same publication
         #
-        # Fetch the MIC registry content as a CSV file
+        with stats.timed('snapshot_read') as t:
+            snap = self._read_snapshot(fna_snap,
+                                       publication_time=self.publication_time)
+            t.nbytes = self._file_size(fna_snap, snap)
+        if snap is not None:
+            self._use_snapshot(snap, stats)
+            logger.debug('Return MIC from snapshot "%s".', fna_snap)
+            self._save_snapshot(fna_snap, page_digest, stats)
+            return self.mic
+        #
+        # Fetch the MIC registry content as a csv or xml file
         #
 
-        fna_csv = os.path.join(self._mic_persistence_dir, 'ISO10383_MIC.csv')
+        fna_data = os.path.join(self._mic_persistence_dir,
+                                'ISO10383_MIC.' + self._mic_format)
 
         use_persisted_mic_csv = False
 
         # Only consider persisted mic if persisted publication page was used
         use_p = (use_persisted_mic_pub
-                 and os.path.isfile(fna_csv)
+                 and os.path.isfile(fna_data)
                  and self.from_persisted)
         if (use_p):
-            logger.debug('Class method "%s": Persisted csv file "%s" exists.',
-                         classname(self)
-                         + '.'
-                         + inspect.currentframe().f_code.co_name
-                         + '()',
-                         fna_csv)
-            now = datetime.datetime.now(tz=datetime.timezone.utc)
-            mtime = datetime.datetime.fromtimestamp(os.stat(fna_csv).st_mtime,
+            logger.debug('Class method "%s._load_mic()":'
+                         ' Persisted data file "%s" exists.',
+                         classname(self), fna_data)
+            mtime = datetime.datetime.fromtimestamp(os.stat(fna_data).st_mtime,
                                                     datetime.timezone.utc)
-            age = now - mtime
-            logger.debug('... mtime = ' + mtime.isoformat())
-            logger.debug('... now   = ' + now.isoformat())
-            logger.debug('... File age = ' + str(age))
-            if (age < datetime.timedelta(days=0, hours=23)):
-                logger.debug(
-                    '... less than 23 hours old - use persisted file.')
+            logger.debug('... mtime = %s', mtime)
+            if self._refresh_policy.is_fresh(mtime,
+                                             self.next_publication_time):
+                logger.debug('... not due for refresh - use persisted file.')
                 use_persisted_mic_csv = True
         #
+        # Validators of the persisted data file, from its last fetch
+        fna_validators = fna_data + '.json'
+        validators = self._read_json(fna_validators)
+        persisted_validators = dict(validators)
+        same_publication = (
+            os.path.isfile(fna_data)
+            and validators.get('sha1') is not None
+            and validators.get('publication_time')
+            == self.publication_time.isoformat())
+        #
         if (use_persisted_mic_csv):
             # read content from persisted file
             logger.debug('Persisted file "%s" is suitable.',
-                         fna_csv)
+                         fna_data)
+            stats.counters['persisted'] += 1
+        elif same_publication:
+            # The data file of a publication does not change
+            logger.debug('Persisted file "%s" is from the same publication.',
+                         fna_data)
+            self.revalidation_counts['same_publication'] += 1
+            os.utime(fna_data)
         else:
             logger.debug('Persisted file "%s"'
                          ' is unsuitable, fetch from source.',
-                         fna_csv)
-            csv_url = self._mic_site + mic_csv_rel_url
+                         fna_data)
+            data_url = self._mic_site + mic_data_rel_url
             logger.debug('fetch "%s to local file %s".',
-                         csv_url,
-                         fna_csv)
-            # Get the csv file
-            # cached_sess = CacheControl(requests.Session(),
-            cached_sess = CacheControl(requests_session,
-                                       heuristic=OneDayHeuristic(),
-                                       cache=FileCache(self._mic_cache_dir))
-            resp = cached_sess.get(csv_url)
-            try:
-                self.from_cache = resp.from_cache
-                logger.debug('from_cache reported by CacheControl:'
-                             + ' from_cache = {}'.format(self.from_cache))
-            except AttributeError:
-                self.from_cache = False
-                logger.debug('from_cache missing from CacheControl.'
-                             + ' Default from_cache ='
-                             + ' {}'.format(self.from_cache))
+                         data_url,
+                         fna_data)
+            # Get the data file, unless not modified since the last fetch
+            headers = {}
+            if os.path.isfile(fna_data) and validators.get('sha1'):
+                if validators.get('etag'):
+                    headers['If-None-Match'] = validators['etag']
+                if validators.get('last_modified'):
+                    headers['If-Modified-Since'] = validators['last_modified']
+            # Not through the HTTP cache, which would hold a copy of
+            # the persisted file, and the whole body in memory to store it.
+            # Streamed to a temporary file, see `_write_stream()`
+            data_sess = self._data_session()
+            fna_tmp = '{}.{}.tmp'.format(fna_data, os.getpid())
+            with stats.timed('data_fetch') as t:
+                with data_sess.get(data_url, headers=headers,
+                                   stream=True) as resp:
+                    if resp.status_code != 304:
+                        # Never persist an error page as the data file
+                        resp.raise_for_status()
+                        sha1, t.nbytes = self._write_stream(fna_tmp, resp)
             self.from_persisted = False
-            # Write new (binary) csv file to persisted file
-            fh = open(fna_csv, 'wb')
-            fh.write(resp.content)
-            fh.close()
-        #
+            if resp.status_code == 304:
+                logger.debug('Persisted file "%s" is not modified.', fna_data)
+                self.revalidation_counts['not_modified'] += 1
+                os.utime(fna_data)
+            else:
+                if (sha1 == validators.get('sha1')
+                        and os.path.isfile(fna_data)):
+                    logger.debug('Persisted file "%s" is unchanged.',
+                                 fna_data)
+                    self.revalidation_counts['unchanged'] += 1
+                    os.remove(fna_tmp)
+                    os.utime(fna_data)
+                else:
+                    self.revalidation_counts['modified'] += 1
+                    # New (binary) data file becomes the persisted file
+                    os.replace(fna_tmp, fna_data)
+                validators['sha1'] = sha1
+            for k, h in (('etag', 'ETag'), ('last_modified', 'Last-Modified')):
+                validators[k] = resp.headers.get(h, validators.get(k))
+        validators['publication_time'] = self.publication_time.isoformat()
+        if validators != persisted_validators:
+            self._write_json(fna_validators, validators)
         #
-        # Read and parse the downloaded CSV file to a list of Dict
-        mic_rows = []
-        with open(fna_csv, 'r', encoding=self._mic_csv_encoding) as the_file:
-            reader = csv.DictReader(the_file)
-            try:
-                for line in reader:
-                    mic_rows.append(line)
-            except csv.Error as e:
-                msg = 'file {}, line {}: {}'.format(
-                    fna_csv, reader.line_num, e)
-                logger.critical(msg)
-                sys.exit(msg)
         #
-        # Create DataFrame from the list of OrderedDict's
-        from collections import Counter
-        row = Counter()
-        for k in mic_rows:
-            row.update(k)
-        self.mic = pd.DataFrame([k.values() for k in mic_rows],
-                                columns=row.keys())
+        if (self.mic is not None
+                and validators.get('sha1') is not None
+                and validators['sha1'] == self._csv_digest):
+            # Already parsed from the very same data file
+            logger.debug('Persisted file "%s" is already parsed.', fna_data)
+            self.revalidation_counts['parse_skipped'] += 1
+        else:
+            # Parse the downloaded file straight into DataFrame columns
+            with stats.timed('data_parse', os.path.getsize(fna_data)):
+                if self._mic_format == 'xml':
+                    from .mic_xml import read_mic_xml
+                    self.mic = read_mic_xml(fna_data)
+                else:
+                    from .mic_csv import read_mic_csv
+                    self.mic = read_mic_csv(fna_data,
+                                            encoding=self._mic_csv_encoding)
+            if self._mic_compact:
+                from .mic_schema import compact_mic
+                with stats.timed('frame_build') as t:
+                    self.mic = compact_mic(self.mic)
+                t.nbytes = int(self.mic.memory_usage(deep=True).sum())
+            with stats.timed('index_build'):
+                self.index = MICIndex(self.mic)
+            self._enricher = None
+            self._search_index = None
+            self._csv_digest = validators.get('sha1')
+        self._save_snapshot(fna_snap, page_digest, stats)
         #
         # print(self.micDf)
         logger.debug('Return MIC as pandas DataFrame.')
-        return(self.mic)
+        return self.mic
+
+    def _http_pool(self):
+        """Return the `HTTPSessionPool` to fetch from `mic_site`."""
+        if self._mic_http_pool is not None:
+            return self._mic_http_pool
+        from .http_session import shared_pool
+        return shared_pool()
+
+    def _cached_session(self):
+        """Return the caching requests session to fetch the page.
+
+        Created, with its cache, by the first call.
+        Its connections belong to the `HTTPSessionPool`.
+        """
+        if self._session is not None:
+            return self._session
+        from .mic_cache import make_cache
+
+        self.http_cache = make_cache(self._mic_cache, self._mic_cache_dir)
+        self._session = self._http_pool().session(
+            cache=self.http_cache, heuristic=self._loaded_heuristic())
+        return self._session
+
+    def _data_session(self):
+        """Return the requests session to fetch the csv or xml file.
+
+        Created by the first call, without HTTP cache:
+        the persisted file and its validators are its cache.
+        Its connections belong to the `HTTPSessionPool`.
+        """
+        if self._data_sess is None:
+            self._data_sess = self._http_pool().session()
+        return self._data_sess
+
+    def _loaded_heuristic(self):
+        if self._heuristic is None:
+            from .publication_heuristic import PublicationHeuristic
+            self._heuristic = PublicationHeuristic()
+        return self._heuristic
+
+    def _revalidate(self):
+        """Load the MIC registry with another instance, in the background.
+
+        The other instance fetches from `mic_site`,
+        and updates the persisted files,
+        which this instance loads by its next `download_mic()`.
+        """
+        import threading
+        if self._revalidation is not None and self._revalidation.is_alive():
+            return
+        from .publication_heuristic import PublicationHeuristic
+        heuristic = self._heuristic
+        kwargs = dict(self._init_kwargs, mic_heuristic=PublicationHeuristic(
+            ttl=heuristic.ttl,
+            until_next_publication=heuristic.until_next_publication,
+            stale_if_error=heuristic.stale_if_error))
+        loader = type(self)(**kwargs)
+        self._revalidation = threading.Thread(
+            target=self._revalidate_with, args=(loader,),
+            name='ISO10383MIC-revalidate', daemon=True)
+        self._revalidation.start()
+
+    def _revalidate_with(self, loader):
+        logger = method_logger(classname(self), '_revalidate_with')
+        try:
+            loader.download_mic()
+        except Exception:
+            logger.exception('Revalidation in the background failed.')
+
+    def _publication_page(self, binary_page_content, page_digest):
+        """Return the metadata of the MIC registry publication page.
+
+        The metadata is extracted once per version of the page,
+        and cached in a JSON sidecar of the persisted page.
+        It is extracted by `extract_publication()`,
+        or, if the page layout is not recognized,
+        by the XPath queries of `_parse_publication_page()`.
+
+        Returns
+        -------
+        tuple
+            Relative URL of the csv or xml file, publication time,
+            implementation time and next publication time.
+
+        Raises
+        ------
+        ValueError
+            If the page is not a MIC publication page,
+            or has no file of the `mic_format`.
+        """
+        logger = method_logger(classname(self), '_publication_page')
+        from .mic_publication import (extract_publication,
+                                      encode_publication,
+                                      decode_publication)
+        fna = os.path.join(self._mic_persistence_dir,
+                           'market-identifier-codes.html.json')
+        meta = self._read_json(fna)
+        if meta.get('sha1') == page_digest:
+            logger.debug('Use publication metadata from "%s".', fna)
+            meta = decode_publication(meta)
+        else:
+            meta = extract_publication(binary_page_content)
+            if meta is None:
+                logger.warning('Publication page layout not recognized,'
+                               ' fall back to XPath.')
+                from lxml import etree
+                try:
+                    meta = self._parse_publication_page(binary_page_content)
+                except (IndexError, etree.LxmlError) as e:
+                    raise ValueError(
+                        'Not a MIC publication page: {!r}.'.format(e)) from e
+            self._write_json(fna, dict(encode_publication(meta),
+                                       sha1=page_digest))
+        mic_data_rel_url = meta[self._mic_format + '_url']
+        if mic_data_rel_url is None:
+            raise ValueError('No {} file on the publication page.'.format(
+                self._mic_format))
+        return (mic_data_rel_url, meta['publication_time'],
+                meta['implementation_time'], meta['next_publication_time'])
+
+    def _parse_publication_page(self, binary_page_content):
+        """Parse the MIC registry publication page with XPath queries.
+
+        Returns
+        -------
+        dict
+            The publication metadata, as `extract_publication()`.
+        """
+        logger = method_logger(classname(self), '_parse_publication_page')
+        #
+        # Parse it using the html module and save the result in tree.
+        #
+        # We need to use page.content rather than page.text because
+        # html.fromstring implicitly expects bytes as input.
+        from lxml import html
+        from dateutil import parser as dtparser
+        tree = html.fromstring(binary_page_content)
+        # A good introduction to XPath is on
+        # http://www.w3schools.com/xml/xpath_intro.asp
+        #
+        XPATH_ROW = '//*[@id="block-iso20022-theme-content"]/article' \
+            + '/div[2]/div[3]/div/div/table/tbody/tr'
+        XPATH_CSV_URL = XPATH_ROW + '/td[3]/a/@href'
+        XPATH_XML_URL = XPATH_ROW + '/td[4]/a[1]/@href'
+        XPATH_PUB_DATE = XPATH_ROW + '/td[6]/text()'
+        XPATH_IMP_DATE = XPATH_ROW + '/td[7]/text()'
+        XPATH_NEXT_DATE = XPATH_ROW + '/td[8]/text()'
+        #
+        mic_csv_rel_url = tree.xpath(XPATH_CSV_URL)[0].replace('\u00A0', ' ')
+        logger.debug('Parsed Rel. URL to publication in csv format: "%s"',
+                     mic_csv_rel_url)
+        mic_xml_rel_url = None
+        for u in tree.xpath(XPATH_XML_URL):
+            mic_xml_rel_url = u.replace('\u00A0', ' ')
+            logger.debug('Parsed Rel. URL to publication in xml format: "%s"',
+                         mic_xml_rel_url)
+        d = tree.xpath(XPATH_PUB_DATE)[0].replace('\u00A0', ' ')
+        publication_time \
+            = dtparser.parse(d).replace(tzinfo=datetime.timezone.utc)
+        logger.debug('Parsed Publication date: %s', publication_time)
+        d = tree.xpath(XPATH_IMP_DATE)[0].replace('\u00A0', ' ')
+        implementation_time \
+            = dtparser.parse(d).replace(tzinfo=datetime.timezone.utc)
+        logger.debug('Parsed Implementation date: %s', implementation_time)
+        d = tree.xpath(XPATH_NEXT_DATE)[0].replace('\u00A0', ' ')
+        next_publication_time \
+            = dtparser.parse(d).replace(tzinfo=datetime.timezone.utc)
+        logger.debug('Parsed Next Publication date: %s', next_publication_time)
+        return {'csv_url': mic_csv_rel_url,
+                'xml_url': mic_xml_rel_url,
+                'publication_time': publication_time,
+                'implementation_time': implementation_time,
+                'next_publication_time': next_publication_time}
+
+    def _read_json(self, fna):
+        import json
+        try:
+            with open(fna, 'r') as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_json(self, fna, obj):
+        import json
+        fna_tmp = '{}.{}.tmp'.format(fna, os.getpid())
+        with open(fna_tmp, 'w') as fh:
+            json.dump(obj, fh)
+        os.replace(fna_tmp, fna)
+
+    def _write_file(self, fna, content):
+        fna_tmp = '{}.{}.tmp'.format(fna, os.getpid())
+        with open(fna_tmp, 'wb') as fh:
+            fh.write(content)
+        os.replace(fna_tmp, fna)
+
+    @staticmethod
+    def _write_stream(fna, resp, chunk_size=2**16):
+        """Write the body of a streamed response to `fna`, chunk by chunk.
+
+        The body is never held in memory as a whole.
+        Returns its SHA-1 digest, and its size.
+        On failure, the partially written file is removed.
+        """
+        sha1 = hashlib.sha1()
+        nbytes = 0
+        try:
+            with open(fna, 'wb') as fh:
+                for chunk in resp.iter_content(chunk_size):
+                    sha1.update(chunk)
+                    fh.write(chunk)
+                    nbytes += len(chunk)
+        except BaseException:
+            if os.path.exists(fna):
+                os.remove(fna)
+            raise
+        return sha1.hexdigest(), nbytes
+
+    def _persistence_lock(self):
+        """Return the file lock serializing loads across processes."""
+        from filelock import FileLock
+        os.makedirs(self._mic_persistence_dir, exist_ok=True)
+        timeout = self._mic_lock_timeout
+        return FileLock(os.path.join(self._mic_persistence_dir,
+                                     'ISO10383_MIC.lock'),
+                        timeout=-1 if timeout is None else timeout)
+
+    def _read_snapshot(self, fna_snap, page_digest=None,
+                       publication_time=None):
+        """Read a matching snapshot of the MIC registry.
+
+        A snapshot matches if it was taken from a publication page
+        with content digest `page_digest`,
+        or from a publication with publication time `publication_time`,
+        and with the same `mic_compact` setting.
+
+        Returns
+        -------
+        tuple or None
+            The MIC registry and the snapshot metadata,
+            or `None` if there is no matching snapshot.
+        """
+        if not self._mic_snapshot:
+            return None
+        from .mic_snapshot import read_snapshot
+        snap = read_snapshot(fna_snap)
+        if snap is None:
+            return None
+        mic, meta = snap
+        if meta.get('compact') != self._mic_compact:
+            return None
+        if meta.get('format', 'csv') != self._mic_format:
+            return None
+        if page_digest is not None and meta.get('page_digest') != page_digest:
+            return None
+        if (publication_time is not None
+                and meta.get('publication_time') != publication_time):
+            return None
+        return snap
+
+    def _use_snapshot(self, snap, stats):
+        mic, meta = snap
+        self.publication_time = meta['publication_time']
+        self.implementation_time = meta['implementation_time']
+        self.next_publication_time = meta['next_publication_time']
+        self.mic = mic
+        stats.counters['snapshot_hit'] += 1
+        with stats.timed('index_build'):
+            self.index = MICIndex(self.mic)
+        self._enricher = None
+        self._search_index = None
+        self._csv_digest = meta.get('csv_digest')
+
+    def _save_snapshot(self, fna_snap, page_digest, stats):
+        if not self._mic_snapshot:
+            return
+        from .mic_snapshot import write_snapshot
+        with stats.timed('snapshot_write') as t:
+            write_snapshot(fna_snap, self.mic,
+                           page_digest=page_digest,
+                           csv_digest=self._csv_digest,
+                           compact=self._mic_compact,
+                           format=self._mic_format,
+                           publication_time=self.publication_time,
+                           implementation_time=self.implementation_time,
+                           next_publication_time=self.next_publication_time)
+            t.nbytes = os.path.getsize(fna_snap)
+
+    def _file_size(self, fna, snap):
+        """Return the size of the snapshot file `fna`, if `snap` read."""
+        return None if snap is None else os.path.getsize(fna)
+
+    def _fna_shared(self):
+        return os.path.join(self._mic_persistence_dir, 'ISO10383_MIC.arrow')
+
+    def _publish_shared(self):
+        from .mic_shared import publish_shared, read_shared_meta
+        fna = self._fna_shared()
+        meta = read_shared_meta(fna)
+        if (meta is not None
+                and meta.get('compact') == self._mic_compact
+                and meta.get('publication_time') == self.publication_time):
+            return
+        publish_shared(fna, self.mic,
+                       compact=self._mic_compact,
+                       publication_time=self.publication_time,
+                       implementation_time=self.implementation_time,
+                       next_publication_time=self.next_publication_time)
+
+    def open_shared(self):
+        """Map the shared, read-only MIC registry.
+
+        The registry is mapped from a file in `mic_persistence_dir`,
+        published by `download_mic()` with `mic_shared=True`.
+        If there is no such file yet, the registry is downloaded
+        and published first.
+
+        Processes mapping the registry share its physical memory.
+        A new version published by a later `download_mic()`
+        atomically replaces the file,
+        and is mapped by `SharedMICRegistry.refresh()`.
+
+        Returns
+        -------
+        SharedMICRegistry
+            The mapped MIC registry.
+        """
+        from .mic_shared import SharedMICRegistry, read_shared_meta
+        fna = self._fna_shared()
+        if read_shared_meta(fna) is None:
+            with self._persistence_lock():
+                self._timed_load()
+                self._publish_shared()
+        return SharedMICRegistry(fna)
+
+    def open_history(self):
+        """Open the point-in-time history of the MIC registry.
+
+        The history is kept in `mic_persistence_dir`,
+        and holds the publications loaded by `download_mic()`
+        with `mic_history=True`.
+
+        Returns
+        -------
+        MICHistory
+            The history, answering `as_of()` lookups and bulk
+            `as_of_join()`'s, e.g. to replay historical trades.
+        """
+        if self._history is None:
+            from .mic_history import MICHistory
+            self._history = MICHistory(os.path.join(
+                self._mic_persistence_dir, 'ISO10383_MIC_history.feather'))
+        return self._history
+
+    def _loaded_index(self):
+        if self.index is None:
+            raise RuntimeError('MIC registry not loaded,'
+                               ' call download_mic() first.')
+        return self.index
+
+    def lookup(self, mic):
+        """Look up a MIC in the registry.
+
+        Parameters
+        ----------
+        mic : str
+            Market Identifier Code.
+
+        Returns
+        -------
+        MICRecord or None
+            The registry entry of `mic`, or `None` if `mic` is not
+            a registered MIC.
+
+        Raises
+        ------
+        RuntimeError
+            If the registry has not been loaded by `download_mic()`.
+        """
+        return self._loaded_index().lookup(mic)
+
+    def operating_mic(self, mic):
+        """Return the OPERATING MIC of `mic`, or `None` if unknown."""
+        return self._loaded_index().operating_mic(mic)
+
+    def segments(self, operating_mic):
+        """Return the market segment MICRecord's of `operating_mic`."""
+        return self._loaded_index().segments(operating_mic)
+
+    def _loaded_enricher(self):
+        self._loaded_index()
+        if self._enricher is None:
+            from .mic_enrich import MICEnricher
+            self._enricher = MICEnricher(self.mic)
+        return self._enricher
+
+    def validate(self, mics):
+        """Validate MIC codes in bulk.
+
+        Parameters
+        ----------
+        mics : pandas.Series or array-like of str
+            MIC codes.
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean mask, true for registered MIC codes.
+        """
+        return self._loaded_enricher().validate(mics)
+
+    def enrich(self, mics, columns=None):
+        """Validate and enrich MIC codes in bulk.
+
+        Parameters
+        ----------
+        mics : pandas.Series or array-like of str
+            MIC codes, e.g. the venue MIC of a batch of execution records.
+        columns : sequence of str, optional
+            The MIC registry columns to add.
+            Defaults to OPERATING MIC, COUNTRY, STATUS and O/S.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The enrichment columns aligned with `mics`,
+            and a boolean `VALID` column.
+            See `MICEnricher.enrich()`.
+        """
+        enricher = self._loaded_enricher()
+        if columns is None:
+            return enricher.enrich(mics)
+        return enricher.enrich(mics, columns=columns)
+
+    def search(self, query, limit=10):
+        """Search MICs by name, acronym, city or code.
+
+        The search index is built by the first search
+        of every version of the MIC registry.
+
+        Parameters
+        ----------
+        query : str
+            Words, or prefixes of words, e.g. 'MERCADO GAS' or 'EXAN'.
+        limit : int or None, optional
+            Maximum number of results.
+            Defaults to 10, `None` for all.
+
+        Returns
+        -------
+        list of MICSearchHit
+            The matching MICs, best match first.
+            See `MICSearchIndex.search()`.
+        """
+        self._loaded_index()
+        if self._search_index is None:
+            from .mic_search import MICSearchIndex
+            self._search_index = MICSearchIndex(self.mic)
+        return self._search_index.search(query, limit=limit)
 
 
 if __name__ == '__main__':
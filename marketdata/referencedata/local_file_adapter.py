@@ -0,0 +1,146 @@
+# -*- coding: utf-8; mode: Python; -*-
+
+import os
+import logging
+from email.utils import formatdate, parsedate_to_datetime
+import requests
+from requests_testadapter import Resp
+
+
+module_logger = logging.getLogger(__name__)
+
+
+class FileBody:
+    """Raw body of a response, read from an open file.
+
+    Stands for the `urllib3` response `requests` expects
+    as `Response.raw`, and closes the file at its end.
+
+    Parameters
+    ----------
+
+    file : file object
+        The file, opened in binary mode, owned by the body.
+    status : int, optional
+        HTTP status code. Defaults to 200.
+    headers : dict, optional
+        HTTP headers.
+    """
+    def __init__(self, file, status=200, headers=None):
+        self._file = file
+        self.status = status
+        self.headers = headers or {}
+        self.reason = requests.status_codes._codes.get(
+            status, [''])[0].upper().replace('_', ' ')
+
+    @property
+    def closed(self):
+        return self._file.closed
+
+    def read(self, amt=None, decode_content=None, **kwargs):
+        if self._file.closed:
+            return b''
+        data = self._file.read(amt)
+        if not data or amt is None or amt < 0:
+            # At the end of the file
+            self.close()
+        return data
+
+    def stream(self, amt=2**16, decode_content=None):
+        while True:
+            data = self.read(amt)
+            if not data:
+                break
+            yield data
+
+    def close(self):
+        self._file.close()
+
+    def release_conn(self):
+        self.close()
+
+
+class LocalFileAdapter(requests.adapters.HTTPAdapter):
+    """Transport adapter to handle local files in requests.
+
+    The requests library doesn't know how to handle local files.
+    The current version allows you to define transport adapters.
+
+    References
+    ----------
+
+    Based on `b1r3k <https://stackoverflow.com/users/216172/b1r3k>`_'s
+    `answer <https://stackoverflow.com/a/22989322>`_.
+
+    This implementation uses
+    `requests-testadapter <https://github.com/ambv/requests-testadapter>`_.
+
+    Like a static file web server, responses carry `ETag` and
+    `Last-Modified` validators derived from the file's status,
+    and conditional requests for an unmodified file are answered with
+    `304 Not Modified`.
+
+    The body is read from the file, not buffered in memory.
+    With `stream=True`, the response reads the open file as it is
+    iterated, e.g. by `iter_content()`, and closes it at its end,
+    or when the response is closed.
+    Otherwise the file is read once, into `content`.
+
+    Examples
+    --------
+
+    Intended usage:
+
+    >>> requests_session = requests.session()
+    >>> requests_session.mount('file://', LocalFileAdapter())
+    >>> requests_session.get('file:///dev/null')
+
+    """
+    def build_response_from_file(self, request, stream=False):
+        logger = module_logger
+
+        logger.debug('url       = "%s"', request.url)
+        file_path = request.url[7:]
+        logger.debug('file_path = "%s"', file_path)
+        file = open(file_path, 'rb')
+        try:
+            st = os.fstat(file.fileno())
+            headers = {
+                'Content-Length': str(st.st_size),
+                'ETag': '"{:x}-{:x}"'.format(st.st_mtime_ns, st.st_size),
+                'Last-Modified': formatdate(st.st_mtime, usegmt=True),
+            }
+            if self._not_modified(request, headers['ETag'], st.st_mtime):
+                logger.debug('Not modified.')
+                file.close()
+                headers['Content-Length'] = '0'
+                return self.build_response(request,
+                                           Resp(b'', 304, headers))
+            r = self.build_response(request, FileBody(file, 200, headers))
+        except BaseException:
+            file.close()
+            raise
+        if not stream:
+            # A single read of the whole file, closing it,
+            # rather than requests joining chunks of it
+            r._content = r.raw.read()
+        return r
+
+    @staticmethod
+    def _not_modified(request, etag, mtime):
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match is not None:
+            return etag in [t.strip() for t in if_none_match.split(',')]
+        if_modified_since = request.headers.get('If-Modified-Since')
+        if if_modified_since is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            return int(mtime) <= since.timestamp()
+        return False
+
+    def send(self, request, stream=False, timeout=None,
+             verify=True, cert=None, proxies=None):
+
+        return self.build_response_from_file(request, stream=stream)
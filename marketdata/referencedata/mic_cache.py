@@ -0,0 +1,302 @@
+# -*- coding: utf-8; mode: Python; -*-
+
+import os
+import time
+import datetime
+import threading
+import collections
+
+#
+# Backends of the HTTP cache of `ISO10383MIC`, see `mic_cache`.
+# They implement the cache interface of `CacheControl`,
+# get(), set(), delete() and close(),
+# without importing it.
+#
+CACHE_BACKENDS = ('file', 'memory', 'sqlite')
+
+
+class CacheStats:
+    """Hit, miss and eviction counters of a cache backend.
+
+    Attributes
+    ----------
+    hits, misses : int
+        Lookups finding a live entry, or not.
+    sets : int
+        Entries stored.
+    evictions : int
+        Entries removed to stay within the size bounds.
+    expirations : int
+        Entries removed past their age or expiry.
+    """
+    __slots__ = ('hits', 'misses', 'sets', 'evictions', 'expirations')
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def hit_rate(self):
+        """Share of lookups that hit, `None` before the first lookup."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else None
+
+    def as_dict(self):
+        """Return the counters and the hit rate as a dict."""
+        d = {k: getattr(self, k) for k in self.__slots__}
+        d['hit_rate'] = self.hit_rate
+        return d
+
+    def __repr__(self):
+        return '{}({})'.format(
+            type(self).__name__,
+            ', '.join('{}={}'.format(k, getattr(self, k))
+                      for k in self.__slots__))
+
+
+def _expiry(now, expires, max_age):
+    """Return the time an entry stored at `now` expires, or `None`."""
+    if isinstance(expires, datetime.datetime):
+        if expires.tzinfo is None:
+            expires = expires.replace(tzinfo=datetime.timezone.utc)
+        expires = expires.timestamp() - time.time()
+    limits = [t for t in (expires, max_age) if t is not None]
+    return now + min(limits) if limits else None
+
+
+class LRUCache:
+    """Bounded, in-memory, least recently used cache.
+
+    Parameters
+    ----------
+
+    max_entries : int, optional
+        Maximum number of entries. Defaults to 64.
+    max_bytes : int, optional
+        Maximum total size of the entries. Defaults to 64 MiB.
+    max_age : float or None, optional
+        Maximum age of an entry in seconds,
+        in addition to the expiry set by `CacheControl`.
+        Defaults to `None`, no maximum age.
+
+    Attributes
+    ----------
+    stats : CacheStats
+        Counters of the cache.
+
+    Notes
+    -----
+
+    The cache is thread-safe, and private to the process.
+    """
+    def __init__(self, max_entries=64, max_bytes=64 * 2**20, max_age=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.stats = CacheStats()
+        self.nbytes = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] is not None \
+                    and entry[1] <= time.monotonic():
+                self._remove(key)
+                self.stats.expirations += 1
+                entry = None
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry[0]
+
+    def set(self, key, value, expires=None):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if len(value) > self.max_bytes:
+                # Would evict everything, and still not fit
+                self.stats.evictions += 1
+                return
+            self._entries[key] = (value, _expiry(time.monotonic(), expires,
+                                                 self.max_age))
+            self.nbytes += len(value)
+            self.stats.sets += 1
+            while (len(self._entries) > self.max_entries
+                   or self.nbytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+                self.stats.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def _remove(self, key):
+        value, _ = self._entries.pop(key)
+        self.nbytes -= len(value)
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def close(self):
+        pass
+
+
+class SQLiteCache:
+    """Bounded cache in a single SQLite database file.
+
+    Parameters
+    ----------
+
+    fna : str
+        Path name of the database file, created if missing.
+    max_bytes : int, optional
+        Maximum total size of the entries. Defaults to 64 MiB.
+    max_age : float or None, optional
+        Maximum age of an entry in seconds,
+        in addition to the expiry set by `CacheControl`.
+        Defaults to `None`, no maximum age.
+
+    Attributes
+    ----------
+    stats : CacheStats
+        Counters of the cache, in this process.
+
+    Notes
+    -----
+
+    The cache can be shared by threads, and by processes
+    opening the same file.
+    Least recently used entries are evicted first.
+    """
+    def __init__(self, fna, max_bytes=64 * 2**20, max_age=None):
+        import sqlite3
+        self.fna = fna
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(fna)), exist_ok=True)
+        self._db = sqlite3.connect(fna, timeout=30, check_same_thread=False,
+                                   isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('CREATE TABLE IF NOT EXISTS cache ('
+                         ' key TEXT PRIMARY KEY,'
+                         ' value BLOB NOT NULL,'
+                         ' expires REAL,'
+                         ' accessed REAL NOT NULL)')
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+
+    @property
+    def nbytes(self):
+        """Total size of the entries."""
+        with self._lock:
+            return self._db.execute('SELECT COALESCE(SUM(LENGTH(value)), 0)'
+                                    ' FROM cache').fetchone()[0]
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._db.execute('SELECT value, expires FROM cache'
+                                   ' WHERE key = ?', (key,)).fetchone()
+            if row is not None and row[1] is not None and row[1] <= now:
+                self._db.execute('DELETE FROM cache WHERE key = ?', (key,))
+                self.stats.expirations += 1
+                row = None
+            if row is None:
+                self.stats.misses += 1
+                return None
+            self._db.execute('UPDATE cache SET accessed = ? WHERE key = ?',
+                             (now, key))
+            self.stats.hits += 1
+            return bytes(row[0])
+
+    def set(self, key, value, expires=None):
+        now = time.time()
+        with self._lock:
+            if len(value) > self.max_bytes:
+                self._db.execute('DELETE FROM cache WHERE key = ?', (key,))
+                self.stats.evictions += 1
+                return
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                self._db.execute('INSERT OR REPLACE INTO cache'
+                                 ' (key, value, expires, accessed)'
+                                 ' VALUES (?, ?, ?, ?)',
+                                 (key, value,
+                                  _expiry(now, expires, self.max_age), now))
+                self.stats.sets += 1
+                nbytes = self._db.execute(
+                    'SELECT COALESCE(SUM(LENGTH(value)), 0)'
+                    ' FROM cache').fetchone()[0]
+                if nbytes > self.max_bytes:
+                    for k, n in self._db.execute(
+                            'SELECT key, LENGTH(value) FROM cache'
+                            ' WHERE key != ? ORDER BY accessed',
+                            (key,)).fetchall():
+                        self._db.execute('DELETE FROM cache WHERE key = ?',
+                                         (k,))
+                        self.stats.evictions += 1
+                        nbytes -= n
+                        if nbytes <= self.max_bytes:
+                            break
+                self._db.execute('COMMIT')
+            except BaseException:
+                self._db.execute('ROLLBACK')
+                raise
+
+    def delete(self, key):
+        with self._lock:
+            self._db.execute('DELETE FROM cache WHERE key = ?', (key,))
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._db.execute('DELETE FROM cache')
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def make_cache(backend, cache_dir):
+    """Return the HTTP cache of `ISO10383MIC`.
+
+    Parameters
+    ----------
+    backend : {'file', 'memory', 'sqlite'} or object
+        'file' for the `CacheControl` `FileCache` in `cache_dir`,
+        unbounded, one file per entry,
+        'memory' for a default `LRUCache`,
+        'sqlite' for a default `SQLiteCache` in `cache_dir`,
+        or a cache object to use as is.
+    cache_dir : str
+        Path name of the cache directory.
+    """
+    if not isinstance(backend, str):
+        return backend
+    if backend == 'file':
+        from cachecontrol.caches.file_cache import FileCache
+        os.makedirs(cache_dir, exist_ok=True)
+        return FileCache(cache_dir)
+    if backend == 'memory':
+        return LRUCache()
+    if backend == 'sqlite':
+        return SQLiteCache(os.path.join(cache_dir, 'ISO10383MIC.sqlite'))
+    raise ValueError('Unsupported cache backend {!r}.'.format(backend))
@@ -0,0 +1,54 @@
+# -*- coding: utf-8; mode: Python; -*-
+
+import sys
+import logging
+import pandas as pd
+
+module_logger = logging.getLogger(__name__)
+
+
+def read_mic_csv(fna_csv, encoding='windows-1252', chunksize=None):
+    """Read a MIC registry csv file to a pandas.DataFrame.
+
+    The file is parsed in a single streaming pass,
+    building the columns directly
+    rather than materializing every row as a Python object first.
+    Every field is kept as a string,
+    and empty fields are kept as empty strings.
+
+    Parameters
+    ----------
+    fna_csv : str
+        Path name of the csv file.
+    encoding : str, optional
+        Character encoding of the csv file.
+        Defaults to 'windows-1252'.
+    chunksize : int or None, optional
+        If given, return an iterator of DataFrames
+        of at most `chunksize` rows each,
+        instead of a single DataFrame.
+
+    Returns
+    -------
+    pandas.DataFrame or iterator of pandas.DataFrame
+        The MIC registry, or chunks of it if `chunksize` is given.
+
+    Notes
+    -----
+
+    When the whole file is read,
+    a malformed file is logged as critical and terminates the process,
+    as a registry that cannot be parsed cannot be used.
+    When reading in chunks, parse errors are raised by the iterator.
+    """
+    try:
+        return pd.read_csv(fna_csv,
+                           encoding=encoding,
+                           dtype=str,
+                           keep_default_na=False,
+                           na_filter=False,
+                           chunksize=chunksize)
+    except (pd.errors.ParserError, UnicodeDecodeError) as e:
+        msg = 'file {}: {}'.format(fna_csv, e)
+        module_logger.critical(msg)
+        sys.exit(msg)
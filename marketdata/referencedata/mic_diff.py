@@ -0,0 +1,160 @@
+# -*- coding: utf-8; mode: Python; -*-
+
+from collections import namedtuple
+
+import pandas as pd
+
+from .mic_index import MIC_COLUMNS, MICRecord
+from .iso10383mic import classname
+
+
+#
+# STATUS values of MICs that are no longer in use.
+#
+INACTIVE_STATUSES = ('DELETED', 'EXPIRED')
+
+#
+# Kinds of changes, in the order of the attributes of a MICChangeSet.
+#
+CHANGE_KINDS = ('added', 'modified', 'deactivated', 'removed')
+
+MICChange = namedtuple('MICChange', ['kind', 'mic', 'old', 'new', 'fields'])
+MICChange.__doc__ = """One change of a MIC between two registry versions.
+
+`kind` is one of `CHANGE_KINDS`.
+`old` and `new` are the `MICRecord`'s of the MIC in the previous
+and the new version, `None` for added and removed MICs respectively.
+`fields` are the names of the changed registry columns,
+empty for added and removed MICs.
+"""
+
+
+class MICChangeSet:
+    """The changes between two versions of the MIC registry.
+
+    Parameters
+    ----------
+
+    added, modified, deactivated, removed : sequence of MICChange
+        The changes of each kind.
+    publication_time : datetime.datetime or None, optional
+        The publication time of the new version.
+    previous_publication_time : datetime.datetime or None, optional
+        The publication time of the previous version.
+
+    Attributes
+    ----------
+    added : tuple of MICChange
+        MICs registered in the new version only.
+    modified : tuple of MICChange
+        MICs with changed columns, other than deactivated MICs.
+    deactivated : tuple of MICChange
+        MICs whose STATUS changed to one of `INACTIVE_STATUSES`.
+    removed : tuple of MICChange
+        MICs registered in the previous version only.
+
+    Notes
+    -----
+
+    Iterating a change set yields all its changes,
+    and its length is the number of changed MICs.
+    """
+    def __init__(self, added=(), modified=(), deactivated=(), removed=(),
+                 publication_time=None, previous_publication_time=None):
+        self.added = tuple(added)
+        self.modified = tuple(modified)
+        self.deactivated = tuple(deactivated)
+        self.removed = tuple(removed)
+        self.publication_time = publication_time
+        self.previous_publication_time = previous_publication_time
+
+    def __iter__(self):
+        for kind in CHANGE_KINDS:
+            yield from getattr(self, kind)
+
+    def __len__(self):
+        return sum(len(getattr(self, kind)) for kind in CHANGE_KINDS)
+
+    def __repr__(self):
+        return '{}({})'.format(
+            classname(self),
+            ', '.join('{}={}'.format(kind, len(getattr(self, kind)))
+                      for kind in CHANGE_KINDS))
+
+    @property
+    def mics(self):
+        """The set of changed MIC codes, e.g. to invalidate caches."""
+        return frozenset(c.mic for c in self)
+
+
+def _by_mic(mic):
+    mic = mic.drop_duplicates('MIC', keep='last')
+    return mic.set_axis(pd.Index(mic['MIC'].astype(str).tolist()))
+
+
+def _records(mic, mics):
+    if not len(mics):
+        return {}
+    rows = mic.loc[mics]
+    values = [rows[c].tolist() if c in rows.columns else [None] * len(rows)
+              for c, _ in MIC_COLUMNS]
+    return dict(zip(rows.index, (MICRecord._make(v) for v in zip(*values))))
+
+
+def diff_mic(old, new, publication_time=None,
+             previous_publication_time=None):
+    """Compare two versions of the MIC registry.
+
+    The versions are joined on MIC and compared column by column,
+    so the cost is a few vectorized operations over the registry,
+    and `MICRecord`'s are only built for changed MICs.
+
+    Parameters
+    ----------
+    old : pandas.DataFrame
+        The previous version of the MIC registry.
+    new : pandas.DataFrame
+        The new version of the MIC registry.
+    publication_time : datetime.datetime or None, optional
+        The publication time of `new`.
+    previous_publication_time : datetime.datetime or None, optional
+        The publication time of `old`.
+
+    Returns
+    -------
+    MICChangeSet
+        The changes, each kind sorted by MIC.
+    """
+    old = _by_mic(old)
+    new = _by_mic(new)
+    columns = [c for c in new.columns if c in old.columns]
+    common = new.index.intersection(old.index).sort_values()
+    a = old.loc[common, columns].astype(object)
+    b = new.loc[common, columns].astype(object)
+    differs = ((a != b) & ~(a.isna() & b.isna())).to_numpy()
+    changed = differs.any(axis=1)
+    #
+    changed_mics = common[changed]
+    old_records = _records(old, changed_mics)
+    new_records = _records(new, changed_mics)
+    modified = []
+    deactivated = []
+    for mic, row in zip(changed_mics, differs[changed]):
+        o = old_records[mic]
+        n = new_records[mic]
+        fields = tuple(c for c, d in zip(columns, row) if d)
+        if (n.status in INACTIVE_STATUSES
+                and o.status not in INACTIVE_STATUSES):
+            deactivated.append(MICChange('deactivated', mic, o, n, fields))
+        else:
+            modified.append(MICChange('modified', mic, o, n, fields))
+    #
+    added_mics = new.index.difference(old.index).sort_values()
+    added = [MICChange('added', mic, None, r, ())
+             for mic, r in _records(new, added_mics).items()]
+    removed_mics = old.index.difference(new.index).sort_values()
+    removed = [MICChange('removed', mic, r, None, ())
+               for mic, r in _records(old, removed_mics).items()]
+    return MICChangeSet(added, modified, deactivated, removed,
+                        publication_time=publication_time,
+                        previous_publication_time=previous_publication_time)
@@ -0,0 +1,115 @@
+# -*- coding: utf-8; mode: Python; -*-
+
+import logging
+import numpy as np
+import pandas as pd
+from .iso10383mic import classname
+
+
+module_logger = logging.getLogger(__name__)
+
+
+#
+# Columns of the MIC registry added by default by `MICEnricher.enrich()`.
+#
+ENRICH_COLUMNS = (
+    'OPERATING MIC',
+    'COUNTRY',
+    'STATUS',
+    'O/S',
+)
+
+
+class MICEnricher:
+    """Vectorized validation and enrichment of MIC codes.
+
+    Maps arrays of MIC codes, e.g. the venue MIC of execution records,
+    to rows of one version of the MIC registry
+    with a single hash join, without per-row Python code.
+
+    Parameters
+    ----------
+
+    mic : pandas.DataFrame
+        The MIC registry.
+
+    Notes
+    -----
+
+    Enrichment columns are returned as categoricals
+    sharing the distinct values of the registry column,
+    so the cost per row is one integer code per column.
+    """
+    def __init__(self, mic):
+        logger = module_logger
+        logger.debug('Class "%s" instantiated.',
+                     classname(self))
+
+        self._mic = pd.Index(mic['MIC'].astype(str))
+        self._columns = {}
+        for c in mic.columns:
+            column = mic[c]
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                # Codes into the categories, unlike factorize()
+                # numbering values in order of appearance
+                codes = column.cat.codes.to_numpy()
+                categories = column.cat.categories
+            else:
+                codes, categories = pd.factorize(column)
+            self._columns[c] = (codes, categories)
+
+    def positions(self, mics):
+        """Return the registry row of each MIC code, or -1 if unknown.
+
+        Parameters
+        ----------
+        mics : pandas.Series or array-like of str
+            MIC codes.
+
+        Returns
+        -------
+        numpy.ndarray
+            Registry row numbers, aligned with `mics`.
+        """
+        if not isinstance(mics, (pd.Series, pd.Index, pd.Categorical,
+                                 np.ndarray)):
+            mics = np.asarray(mics, dtype=object)
+        # Look up each distinct code once, and broadcast the result
+        codes, uniques = pd.factorize(mics)
+        lookup = self._mic.get_indexer(pd.Index(uniques).astype(str))
+        return np.append(lookup, -1)[codes]
+
+    def validate(self, mics):
+        """Return a boolean mask of the registered MIC codes in `mics`."""
+        return self.positions(mics) >= 0
+
+    def enrich(self, mics, columns=ENRICH_COLUMNS):
+        """Enrich MIC codes with columns of the MIC registry.
+
+        Parameters
+        ----------
+        mics : pandas.Series or array-like of str
+            MIC codes.
+        columns : sequence of str, optional
+            The registry columns to add.
+            Defaults to `ENRICH_COLUMNS`.
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per code in `mics`, with the index of `mics`
+            if it is a `pandas.Series`,
+            a categorical column per entry in `columns`,
+            missing for unknown codes,
+            and a boolean `VALID` column, true for registered codes.
+        """
+        pos = self.positions(mics)
+        valid = pos >= 0
+        result = {}
+        for c in columns:
+            codes, categories = self._columns[c]
+            result[c] = pd.Categorical.from_codes(
+                np.where(valid, codes[pos], -1), categories)
+        result['VALID'] = valid
+        index = mics.index if isinstance(mics, pd.Series) else None
+        return pd.DataFrame(result, index=index)
@@ -0,0 +1,343 @@
+# -*- coding: utf-8; mode: Python; -*-
+
+import logging
+import numpy as np
+import pandas as pd
+
+from .mic_diff import diff_mic
+from .mic_enrich import ENRICH_COLUMNS
+from .mic_index import MIC_COLUMNS, MICRecord
+from .mic_snapshot import read_snapshot, write_snapshot
+from .iso10383mic import classname
+
+
+module_logger = logging.getLogger(__name__)
+
+
+#
+# Columns added to the registry columns in the history,
+# bounding the interval of each state of a MIC in valid time,
+# the implementation times, and in transaction time,
+# the publication times.
+#
+VALID_FROM = 'VALID FROM'
+VALID_TO = 'VALID TO'
+PUBLISHED = 'PUBLISHED'
+SUPERSEDED = 'SUPERSEDED'
+HISTORY_COLUMNS = (VALID_FROM, VALID_TO, PUBLISHED, SUPERSEDED)
+
+_TIME_DTYPE = 'datetime64[ns, UTC]'
+
+# Number of point-in-time views of the history kept by `MICHistory`
+_VIEW_CACHE_SIZE = 16
+
+
+def _timestamp(t):
+    t = pd.Timestamp(t)
+    if t.tzinfo is None:
+        return t.tz_localize('UTC')
+    return t.tz_convert('UTC')
+
+
+def _plain(mic, columns):
+    """Return `columns` of `mic`, with categoricals as their values."""
+    mic = mic[columns].copy()
+    for c in columns:
+        if isinstance(mic[c].dtype, pd.CategoricalDtype):
+            mic[c] = mic[c].astype(mic[c].cat.categories.dtype)
+    return mic
+
+
+class MICHistory:
+    """Point-in-time history of the MIC registry.
+
+    The history keeps every state of every MIC
+    once, with the interval in which it was in effect,
+    rather than a copy of every publication.
+    It is bitemporal:
+
+    * valid time, when a state was in effect,
+      starts at the implementation time of the publication
+      introducing it, and ends at the implementation time of
+      the publication changing or removing it,
+    * transaction time, when a state was known,
+      starts at the publication time of the publication
+      introducing it, and ends at the publication time of
+      the publication changing or removing it.
+
+    Parameters
+    ----------
+
+    fna : str
+        Path name of the history file.
+        Created by the first call to `add()`.
+        Requires `pyarrow`.
+
+    Attributes
+    ----------
+    versions : tuple
+        The `(publication_time, implementation_time)` pairs
+        of the publications added, in publication order.
+    """
+    def __init__(self, fna):
+        logger = module_logger
+        logger.debug('Class "%s" instantiated.',
+                     classname(self))
+
+        self._fna = fna
+        self._table = None
+        self.versions = ()
+        snap = read_snapshot(fna)
+        if snap is not None:
+            table, meta = snap
+            self._table = table.astype({c: _TIME_DTYPE
+                                        for c in HISTORY_COLUMNS})
+            self.versions = tuple((_timestamp(p), _timestamp(i))
+                                  for p, i in meta['versions'])
+        self._views = {}
+
+    def __len__(self):
+        """Number of MIC states in the history."""
+        return 0 if self._table is None else len(self._table)
+
+    def add(self, mic, publication_time, implementation_time):
+        """Add a publication of the MIC registry to the history.
+
+        Only the MICs added, changed or removed by the publication
+        add or close intervals.
+        The history file is rewritten atomically.
+
+        Parameters
+        ----------
+        mic : pandas.DataFrame
+            The MIC registry as published.
+        publication_time : datetime.datetime
+            The publication time of `mic`.
+        implementation_time : datetime.datetime
+            The implementation time of `mic`.
+
+        Returns
+        -------
+        bool
+            Was the publication added,
+            `False` if it is already in the history.
+
+        Raises
+        ------
+        ValueError
+            If the history holds a later publication.
+        """
+        pub = _timestamp(publication_time)
+        imp = _timestamp(implementation_time)
+        if any(pub == p for p, _ in self.versions):
+            return False
+        if self.versions and pub < self.versions[-1][0]:
+            raise ValueError(
+                'Publication {} is older than the latest publication {}'
+                ' in the history.'.format(pub.isoformat(),
+                                          self.versions[-1][0].isoformat()))
+        columns = [c for c, _ in MIC_COLUMNS if c in mic.columns]
+        new = _plain(mic, columns)
+        if self._table is None:
+            table = new.iloc[:0].assign(**{c: pd.Series(dtype=_TIME_DTYPE)
+                                           for c in HISTORY_COLUMNS})
+        else:
+            table = self._table
+        #
+        # Close the intervals of changed and removed MICs,
+        # and open intervals for the added and changed MICs
+        is_open = table[VALID_TO].isna()
+        current = table.loc[is_open]
+        common = [c for c in columns if c in current.columns]
+        changes = diff_mic(current[common], new[common])
+        added = {c.mic for c in changes.added}
+        removed = {c.mic for c in changes.removed}
+        close = is_open & table['MIC'].isin(changes.mics - added)
+        table = table.copy()
+        table.loc[close, VALID_TO] = imp
+        table.loc[close, SUPERSEDED] = pub
+        rows = new.loc[new['MIC'].isin(changes.mics - removed)]
+        rows = rows.assign(**{
+            c: pd.Series(t, index=rows.index, dtype=_TIME_DTYPE)
+            for c, t in ((VALID_FROM, imp), (VALID_TO, pd.NaT),
+                         (PUBLISHED, pub), (SUPERSEDED, pd.NaT))})
+        table = pd.concat([table, rows], ignore_index=True)
+        #
+        versions = self.versions + ((pub, imp),)
+        write_snapshot(self._fna, table,
+                       versions=[[p.isoformat(), i.isoformat()]
+                                 for p, i in versions])
+        self._table = table
+        self.versions = versions
+        self._views = {}
+        module_logger.debug('Added publication %s: %r.',
+                            pub.isoformat(), changes)
+        return True
+
+    def _view(self, known_at=None):
+        """Return the `_HistoryView` as known at `known_at`."""
+        key = None if known_at is None else _timestamp(known_at)
+        view = self._views.get(key)
+        if view is None:
+            if len(self._views) >= _VIEW_CACHE_SIZE:
+                self._views.clear()
+            view = self._views[key] = _HistoryView(self._table, key)
+        return view
+
+    def as_of(self, mic, date, known_at=None):
+        """Return the state of a MIC in effect at `date`.
+
+        Parameters
+        ----------
+        mic : str
+            Market Identifier Code.
+        date : datetime.datetime, datetime.date or str
+            The point in valid time, e.g. a trade date.
+            Naive times are taken as UTC.
+        known_at : datetime.datetime, optional
+            The point in transaction time:
+            only use publications published by `known_at`.
+            Defaults to all publications in the history.
+
+        Returns
+        -------
+        MICRecord or None
+            The state of `mic` at `date`,
+            or `None` if `mic` was not registered at `date`.
+        """
+        return self._view(known_at).record(mic, _timestamp(date).value)
+
+    def as_of_join(self, mics, dates, columns=ENRICH_COLUMNS, known_at=None):
+        """Enrich MIC codes with the registry in effect at their dates.
+
+        A bulk, vectorized `as_of()`,
+        e.g. for the venue MIC and trade date of historical trades.
+
+        Parameters
+        ----------
+        mics : pandas.Series or array-like of str
+            MIC codes.
+        dates : pandas.Series or array-like
+            The point in valid time of each code in `mics`.
+            Naive times are taken as UTC.
+        columns : sequence of str, optional
+            The registry columns to add.
+            Defaults to `ENRICH_COLUMNS`.
+        known_at : datetime.datetime, optional
+            The point in transaction time, see `as_of()`.
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per code in `mics`, with the index of `mics`
+            if it is a `pandas.Series`,
+            a categorical column per entry in `columns`,
+            missing for codes not registered at their date,
+            and a boolean `VALID` column, true for registered codes.
+        """
+        view = self._view(known_at)
+        t = pd.DatetimeIndex(pd.to_datetime(dates, utc=True)).as_unit('ns')
+        pos = view.positions(mics, t.asi8)
+        valid = pos >= 0
+        result = {}
+        for c in columns:
+            codes, categories = view.column(c)
+            result[c] = pd.Categorical.from_codes(
+                np.where(valid, codes[pos], -1), categories)
+        result['VALID'] = valid
+        index = mics.index if isinstance(mics, pd.Series) else None
+        return pd.DataFrame(result, index=index)
+
+
+class _HistoryView:
+    """The intervals of a `MICHistory` as known at one point in time.
+
+    States are sorted by MIC and VALID FROM,
+    so the state of a MIC at a time is found by binary search
+    over integer keys combining the MIC and the time.
+
+    Parameters
+    ----------
+
+    table : pandas.DataFrame or None
+        The intervals of the history.
+    known_at : pandas.Timestamp or None
+        Only use states published by `known_at`,
+        and reopen intervals closed after it.
+    """
+    def __init__(self, table, known_at):
+        if table is None:
+            table = pd.DataFrame({c: pd.Series(dtype=_TIME_DTYPE)
+                                  for c in HISTORY_COLUMNS})
+            table['MIC'] = pd.Series(dtype=str)
+        if known_at is not None:
+            table = table.loc[table[PUBLISHED] <= known_at].copy()
+            reopen = table[SUPERSEDED] > known_at
+            table.loc[reopen, VALID_TO] = pd.NaT
+            table.loc[reopen, SUPERSEDED] = pd.NaT
+        table = table.sort_values(['MIC', VALID_FROM],
+                                  ignore_index=True, kind='stable')
+        self.table = table
+        codes, self.mics = pd.factorize(table['MIC'].astype(str))
+        self.mics = pd.Index(self.mics)
+        self.valid_from = table[VALID_FROM].array.asi8
+        valid_to = table[VALID_TO].array.asi8.copy()
+        valid_to[table[VALID_TO].isna().to_numpy()] = np.iinfo(np.int64).max
+        self.valid_to = valid_to
+        # Dense ranks of the times, to combine them with MICs in a key
+        self.times = np.unique(self.valid_from)
+        self.width = len(self.times) + 1
+        self.codes = codes.astype(np.int64)
+        self.keys = (self.codes * self.width
+                     + np.searchsorted(self.times, self.valid_from,
+                                       side='right'))
+        self._columns = {}
+        self._records = None
+
+    def positions(self, mics, times):
+        """Return the row of the state of each MIC at its time, or -1."""
+        if not isinstance(mics, (pd.Series, pd.Index, pd.Categorical,
+                                 np.ndarray)):
+            mics = np.asarray(mics, dtype=object)
+        codes, uniques = pd.factorize(mics)
+        lookup = self.mics.get_indexer(pd.Index(uniques).astype(str))
+        codes = np.append(lookup, -1)[codes].astype(np.int64)
+        keys = (codes * self.width
+                + np.searchsorted(self.times, times, side='right'))
+        pos = np.searchsorted(self.keys, keys, side='right') - 1
+        found = ((codes >= 0) & (pos >= 0)
+                 & (self.codes[np.maximum(pos, 0)] == codes))
+        pos = np.where(found, pos, -1)
+        # Registered, but not at that time
+        found &= self.valid_from[pos] <= times
+        found &= times < self.valid_to[pos]
+        return np.where(found, pos, -1)
+
+    def column(self, c):
+        """Return the codes and categories of column `c`."""
+        if c not in self._columns:
+            if c in self.table.columns:
+                self._columns[c] = pd.factorize(self.table[c])
+            else:
+                self._columns[c] = (np.full(len(self.table), -1),
+                                    pd.Index([], dtype=object))
+        return self._columns[c]
+
+    def record(self, mic, time):
+        """Return the `MICRecord` of `mic` at `time`, or `None`."""
+        try:
+            code = self.mics.get_loc(mic)
+        except KeyError:
+            return None
+        key = code * self.width + np.searchsorted(self.times, time,
+                                                  side='right')
+        pos = np.searchsorted(self.keys, key, side='right') - 1
+        if (pos < 0 or self.codes[pos] != code
+                or not self.valid_from[pos] <= time < self.valid_to[pos]):
+            return None
+        if self._records is None:
+            values = [self.table[c].tolist() if c in self.table.columns
+                      else [None] * len(self.table)
+                      for c, _ in MIC_COLUMNS]
+            self._records = [MICRecord._make(v) for v in zip(*values)]
+        return self._records[pos]
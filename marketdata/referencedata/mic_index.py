@@ -0,0 +1,121 @@
+# -*- coding: utf-8; mode: Python; -*-
+
+import logging
+from collections import namedtuple
+
+
+module_logger = logging.getLogger(__name__)
+
+
+#
+# Mapping from the column names used in the published MIC registry
+# to the field names of a MICRecord.
+#
+MIC_COLUMNS = (
+    ('COUNTRY', 'country'),
+    ('ISO COUNTRY CODE (ISO 3166)', 'iso_country_code'),
+    ('MIC', 'mic'),
+    ('OPERATING MIC', 'operating_mic'),
+    ('O/S', 'os'),
+    ('NAME-INSTITUTION DESCRIPTION', 'name'),
+    ('ACRONYM', 'acronym'),
+    ('CITY', 'city'),
+    ('WEBSITE', 'website'),
+    ('STATUS DATE', 'status_date'),
+    ('STATUS', 'status'),
+    ('CREATION DATE', 'creation_date'),
+    ('COMMENTS', 'comments'),
+)
+
+MICRecord = namedtuple('MICRecord', [f for _, f in MIC_COLUMNS])
+MICRecord.__doc__ = """One row of the MIC registry.
+
+A lightweight, immutable record with one field per column
+of the published MIC registry.
+Columns missing from the registry are set to `None`.
+"""
+
+
+class MICIndex:
+    """Hash indexes over one version of the MIC registry.
+
+    The index is built once from a `pandas.DataFrame`
+    as returned by `ISO10383MIC.download_mic()`,
+    and answers lookups by MIC, by OPERATING MIC and by ISO COUNTRY CODE
+    in constant time.
+
+    Parameters
+    ----------
+
+    mic : pandas.DataFrame
+        The MIC registry to index.
+
+    Attributes
+    ----------
+    by_mic : dict
+        `MICRecord` keyed by MIC.
+    by_operating_mic : dict
+        Tuple of `MICRecord` keyed by OPERATING MIC.
+        Includes the record of the operating MIC itself.
+    by_country : dict
+        Tuple of `MICRecord` keyed by ISO COUNTRY CODE.
+
+    Notes
+    -----
+
+    The indexes are plain dictionaries and are never mutated
+    after construction.
+    A new version of the registry requires a new `MICIndex`.
+    """
+    def __init__(self, mic):
+        logger = module_logger
+
+        # Convert whole columns at once, rather than iterating rows
+        columns = [mic[c].tolist() if c in mic.columns else [None] * len(mic)
+                   for c, _ in MIC_COLUMNS]
+
+        by_mic = {}
+        by_operating_mic = {}
+        by_country = {}
+        for r in map(MICRecord._make, zip(*columns)):
+            by_mic[r.mic] = r
+            by_operating_mic.setdefault(r.operating_mic, []).append(r)
+            by_country.setdefault(r.iso_country_code, []).append(r)
+
+        self.by_mic = by_mic
+        self.by_operating_mic = {k: tuple(v)
+                                 for k, v in by_operating_mic.items()}
+        self.by_country = {k: tuple(v) for k, v in by_country.items()}
+        self._segments = {k: tuple(r for r in v if r.mic != k)
+                          for k, v in self.by_operating_mic.items()}
+        logger.debug('Indexed %d MICs, %d operating MICs, %d countries.',
+                     len(self.by_mic),
+                     len(self.by_operating_mic),
+                     len(self.by_country))
+
+    def __len__(self):
+        return len(self.by_mic)
+
+    def __contains__(self, mic):
+        return mic in self.by_mic
+
+    def lookup(self, mic):
+        """Return the `MICRecord` of `mic`, or `None` if unknown."""
+        return self.by_mic.get(mic)
+
+    def operating_mic(self, mic):
+        """Return the OPERATING MIC of `mic`, or `None` if unknown."""
+        r = self.by_mic.get(mic)
+        return None if r is None else r.operating_mic
+
+    def segments(self, operating_mic):
+        """Return the market segment `MICRecord`'s of `operating_mic`.
+
+        The record of the operating MIC itself is not included.
+        Returns an empty tuple if `operating_mic` is unknown.
+        """
+        return self._segments.get(operating_mic, ())
+
+    def country(self, iso_country_code):
+        """Return the `MICRecord`'s registered in `iso_country_code`."""
+        return self.by_country.get(iso_country_code, ())
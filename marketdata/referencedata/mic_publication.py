@@ -0,0 +1,118 @@
+# -*- coding: utf-8; mode: Python; -*-
+
+import re
+import html
+import datetime
+
+#
+# Headers of the columns of the publication table
+# on the MIC registry publication page, by metadata key.
+#
+PUBLICATION_HEADERS = (
+    ('csv_url', 'Comma Separated Values'),
+    ('xml_url', 'Extended Markup Language and Schema'),
+    ('publication_time', 'Publication date'),
+    ('implementation_time', 'Modification implementation date'),
+    ('next_publication_time', 'Next publication date'),
+)
+PUBLICATION_TIME_KEYS = ('publication_time',
+                         'implementation_time',
+                         'next_publication_time')
+
+_MONTHS = {m: i for i, m in enumerate(
+    ('january', 'february', 'march', 'april', 'may', 'june', 'july',
+     'august', 'september', 'october', 'november', 'december'), 1)}
+
+_TABLE = re.compile(rb'<table\b.*?</table>', re.S | re.I)
+_TH = re.compile(rb'<th\b[^>]*>(.*?)</th>', re.S | re.I)
+_FIRST_ROW = re.compile(rb'<tbody\b[^>]*>\s*<tr\b[^>]*>(.*?)</tr>',
+                        re.S | re.I)
+_TD = re.compile(rb'<td\b[^>]*>(.*?)</td>', re.S | re.I)
+_HREF = re.compile(rb'<a\b[^>]*\bhref="([^"]*)"', re.I)
+_TAG = re.compile(rb'<[^>]*>')
+_DATE = re.compile(r'(\d{1,2})\s+([A-Za-z]+)\s+(\d{4})')
+
+
+def _text(fragment):
+    text = html.unescape(_TAG.sub(b'', fragment).decode('utf-8'))
+    # Also normalizes no-break spaces
+    return ' '.join(text.split())
+
+
+def _date(fragment):
+    m = _DATE.search(_text(fragment))
+    if m is None or m.group(2).lower() not in _MONTHS:
+        return None
+    return datetime.datetime(int(m.group(3)), _MONTHS[m.group(2).lower()],
+                             int(m.group(1)), tzinfo=datetime.timezone.utc)
+
+
+def _href(fragment):
+    m = _HREF.search(fragment)
+    if m is None:
+        return None
+    return html.unescape(m.group(1).decode('utf-8')).replace('\u00A0', ' ')
+
+
+def extract_publication(binary_page_content):
+    """Extract the publication metadata from the MIC publication page.
+
+    A single pass of precompiled patterns over the page,
+    locating the publication table by its column headers,
+    rather than building a document tree.
+
+    Parameters
+    ----------
+    binary_page_content : bytes
+        The UTF-8 encoded publication page.
+
+    Returns
+    -------
+    dict or None
+        The relative URLs `csv_url` and `xml_url`
+        of the registry files, `None` if not published,
+        and `publication_time`, `implementation_time` and
+        `next_publication_time`,
+        or `None` if the page layout is not recognized.
+    """
+    for table in _TABLE.finditer(binary_page_content):
+        headers = [_text(th) for th in _TH.findall(table.group(0))]
+        if not all(h in headers for _, h in PUBLICATION_HEADERS):
+            continue
+        row = _FIRST_ROW.search(table.group(0))
+        if row is None:
+            return None
+        cells = _TD.findall(row.group(1))
+        if len(cells) != len(headers):
+            return None
+        meta = {}
+        for key, header in PUBLICATION_HEADERS:
+            cell = cells[headers.index(header)]
+            if key in PUBLICATION_TIME_KEYS:
+                meta[key] = _date(cell)
+                if meta[key] is None:
+                    return None
+            else:
+                meta[key] = _href(cell)
+        if meta['csv_url'] is None:
+            return None
+        return meta
+    return None
+
+
+def encode_publication(meta):
+    """Encode publication metadata as a JSON-serializable dict."""
+    meta = dict(meta)
+    for k in PUBLICATION_TIME_KEYS:
+        if meta.get(k) is not None:
+            meta[k] = meta[k].isoformat()
+    return meta
+
+
+def decode_publication(meta):
+    """Decode publication metadata encoded by `encode_publication()`."""
+    meta = dict(meta)
+    for k in PUBLICATION_TIME_KEYS:
+        if meta.get(k) is not None:
+            meta[k] = datetime.datetime.fromisoformat(meta[k])
+    return meta
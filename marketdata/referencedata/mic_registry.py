@@ -0,0 +1,274 @@
+# -*- coding: utf-8; mode: Python; -*-
+
+import logging
+import threading
+from .iso10383mic import classname
+
+
+module_logger = logging.getLogger(__name__)
+
+
+class MICVersion:
+    """One immutable version of the MIC registry.
+
+    Taken from an `ISO10383MIC` right after `download_mic()`.
+    Neither the version nor the objects it references
+    are modified afterwards,
+    so any number of threads can use it without locking.
+
+    Parameters
+    ----------
+
+    loader : ISO10383MIC
+        The loader to take the version from.
+
+    Attributes
+    ----------
+    mic : pandas.DataFrame
+        This version of the MIC registry.
+    index : MICIndex
+        Hash indexes over `mic`.
+    publication_time, implementation_time,
+    next_publication_time, fetch_time : datetime.datetime or None
+        As the attributes of `ISO10383MIC`.
+    from_cache, from_persisted : bool
+        As the attributes of `ISO10383MIC`.
+    changes : MICChangeSet or None
+        The changes from the previous version, if known.
+
+    Notes
+    -----
+
+    The enricher and search index of a version
+    are built on first use.
+    Threads racing to build one may each build it,
+    and all get an equivalent object.
+    """
+    __slots__ = ('mic', 'index', 'publication_time', 'implementation_time',
+                 'next_publication_time', 'fetch_time', 'from_cache',
+                 'from_persisted', 'changes', '_enricher', '_search_index')
+
+    def __init__(self, loader):
+        self.mic = loader.mic
+        self.index = loader.index
+        self.publication_time = loader.publication_time
+        self.implementation_time = loader.implementation_time
+        self.next_publication_time = loader.next_publication_time
+        self.fetch_time = loader.fetch_time
+        self.from_cache = loader.from_cache
+        self.from_persisted = loader.from_persisted
+        self.changes = loader.changes
+        self._enricher = None
+        self._search_index = None
+
+    def lookup(self, mic):
+        """Return the `MICRecord` of `mic`, or `None` if unknown."""
+        return self.index.lookup(mic)
+
+    def operating_mic(self, mic):
+        """Return the OPERATING MIC of `mic`, or `None` if unknown."""
+        return self.index.operating_mic(mic)
+
+    def segments(self, operating_mic):
+        """Return the market segment MICRecord's of `operating_mic`."""
+        return self.index.segments(operating_mic)
+
+    def _loaded_enricher(self):
+        enricher = self._enricher
+        if enricher is None:
+            from .mic_enrich import MICEnricher
+            enricher = self._enricher = MICEnricher(self.mic)
+        return enricher
+
+    def validate(self, mics):
+        """Validate MIC codes in bulk, see `ISO10383MIC.validate()`."""
+        return self._loaded_enricher().validate(mics)
+
+    def enrich(self, mics, columns=None):
+        """Enrich MIC codes in bulk, see `ISO10383MIC.enrich()`."""
+        enricher = self._loaded_enricher()
+        if columns is None:
+            return enricher.enrich(mics)
+        return enricher.enrich(mics, columns=columns)
+
+    def search(self, query, limit=10):
+        """Search MICs, see `ISO10383MIC.search()`."""
+        search_index = self._search_index
+        if search_index is None:
+            from .mic_search import MICSearchIndex
+            search_index = self._search_index = MICSearchIndex(self.mic)
+        return search_index.search(query, limit=limit)
+
+
+class MICRegistry:
+    """Thread-safe holder of the current version of the MIC registry.
+
+    A refresh loads the new version with a private `ISO10383MIC`,
+    off to the side of the readers,
+    and publishes it as a new `MICVersion`
+    with a single reference assignment.
+    Readers never lock, and see either the previous
+    or the new version, never a partially updated one.
+
+    Parameters
+    ----------
+
+    loader : ISO10383MIC, optional
+        The loader to refresh from.
+        It must not be used by anything else.
+        Defaults to `ISO10383MIC(**kwargs)`.
+    **kwargs
+        Parameters of the default loader.
+
+    Notes
+    -----
+
+    Use one version for related lookups,
+    as the registry may be refreshed in between::
+
+        version = registry.current
+        record = version.lookup(mic)
+        segments = version.segments(record.operating_mic)
+
+    The registry can be refreshed by a `RefreshScheduler`.
+    Refreshes are serialized by a lock that readers never take.
+    """
+    def __init__(self, loader=None, **kwargs):
+        logger = module_logger
+        logger.debug('Class "%s" instantiated.',
+                     classname(self))
+
+        if loader is None:
+            from .iso10383mic import ISO10383MIC
+            loader = ISO10383MIC(**kwargs)
+        self._loader = loader
+        self._refresh_lock = threading.Lock()
+        self._current = None
+
+    @property
+    def current(self):
+        """The current `MICVersion`, or `None` if never loaded."""
+        return self._current
+
+    def _loaded(self):
+        version = self._current
+        if version is None:
+            raise RuntimeError('MIC registry not loaded,'
+                               ' call refresh() first.')
+        return version
+
+    def refresh(self):
+        """Load the MIC registry, and publish it if it changed.
+
+        Returns
+        -------
+        MICVersion
+            The current version, after the refresh.
+        """
+        with self._refresh_lock:
+            loader = self._loader
+            loader.download_mic()
+            version = self._current
+            if (version is None
+                    or version.mic is not loader.mic
+                    or version.fetch_time != loader.fetch_time):
+                previous = version
+                version = MICVersion(loader)
+                if previous is not None and previous.mic is version.mic:
+                    # Same registry, keep what was built from it
+                    version._enricher = previous._enricher
+                    version._search_index = previous._search_index
+                # The one and only publication of the new version
+                self._current = version
+                module_logger.debug('Published version %s.',
+                                    version.publication_time)
+            return version
+
+    def download_mic(self):
+        """Refresh the MIC registry, as `ISO10383MIC.download_mic()`.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The current version of the MIC registry.
+        """
+        return self.refresh().mic
+
+    @property
+    def refresh_policy(self):
+        """The `RefreshPolicy` of the loader."""
+        return self._loader.refresh_policy
+
+    @property
+    def fetch_time(self):
+        version = self._current
+        return None if version is None else version.fetch_time
+
+    @property
+    def next_publication_time(self):
+        version = self._current
+        return None if version is None else version.next_publication_time
+
+    def subscribe(self, subscriber):
+        """Subscribe to changes, see `ISO10383MIC.subscribe()`.
+
+        Subscribers are called before the new version is published.
+        """
+        self._loader.subscribe(subscriber)
+
+    def unsubscribe(self, subscriber):
+        """Remove a subscriber added by `subscribe()`."""
+        self._loader.unsubscribe(subscriber)
+
+    def add_stats_hook(self, hook):
+        """Add a hook receiving the `LoadStats` of every refresh."""
+        self._loader.add_stats_hook(hook)
+
+    def remove_stats_hook(self, hook):
+        """Remove a hook added by `add_stats_hook()`."""
+        self._loader.remove_stats_hook(hook)
+
+    def lookup(self, mic):
+        """Look up a MIC in the current version, see `MICVersion`."""
+        return self._loaded().lookup(mic)
+
+    def operating_mic(self, mic):
+        """Return the OPERATING MIC of `mic` in the current version."""
+        return self._loaded().operating_mic(mic)
+
+    def segments(self, operating_mic):
+        """Return the segments of `operating_mic` in the current version."""
+        return self._loaded().segments(operating_mic)
+
+    def validate(self, mics):
+        """Validate MIC codes in bulk against the current version."""
+        return self._loaded().validate(mics)
+
+    def enrich(self, mics, columns=None):
+        """Enrich MIC codes in bulk from the current version."""
+        return self._loaded().enrich(mics, columns=columns)
+
+    def search(self, query, limit=10):
+        """Search MICs in the current version."""
+        return self._loaded().search(query, limit=limit)
+
+
+_default_registry = None
+_default_registry_lock = threading.Lock()
+
+
+def default_registry(**kwargs):
+    """Return the process-wide `MICRegistry`.
+
+    Created, but not loaded, by the first call,
+    with `**kwargs` as parameters of its `ISO10383MIC` loader.
+    Later calls return the same registry and ignore `**kwargs`.
+    """
+    global _default_registry
+    registry = _default_registry
+    if registry is None:
+        with _default_registry_lock:
+            if _default_registry is None:
+                _default_registry = MICRegistry(**kwargs)
+            registry = _default_registry
+    return registry
@@ -0,0 +1,114 @@
+# -*- coding: utf-8; mode: Python; -*-
+
+import functools
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    MIC_CODE_DTYPE = 'string[pyarrow]'
+except ImportError:
+    MIC_CODE_DTYPE = object
+
+#
+# Columns of the MIC registry with a small number of distinct values.
+#
+MIC_CATEGORICAL_COLUMNS = (
+    'COUNTRY',
+    'ISO COUNTRY CODE (ISO 3166)',
+    'O/S',
+    'STATUS',
+    'CITY',
+    'OPERATING MIC',
+)
+
+#
+# Columns of the MIC registry holding four character codes.
+#
+MIC_CODE_COLUMNS = (
+    'MIC',
+)
+
+#
+# Columns of the MIC registry holding month-year dates like 'JULY 2015'.
+#
+MIC_DATE_COLUMNS = (
+    'STATUS DATE',
+    'CREATION DATE',
+)
+
+_MONTHS = {m: i for i, m in enumerate(
+    ('JANUARY', 'FEBRUARY', 'MARCH', 'APRIL', 'MAY', 'JUNE', 'JULY',
+     'AUGUST', 'SEPTEMBER', 'OCTOBER', 'NOVEMBER', 'DECEMBER'), start=1)}
+
+
+@functools.lru_cache(maxsize=4096)
+def _month_year(s):
+    parts = s.split()[-2:]
+    if len(parts) != 2:
+        return np.datetime64('NaT', 'ns')
+    month = _MONTHS.get(parts[0].upper())
+    if month is None or not parts[1].isdigit():
+        return np.datetime64('NaT', 'ns')
+    return np.datetime64('{:04d}-{:02d}'.format(int(parts[1]), month), 'ns')
+
+
+def parse_month_year(values):
+    """Parse month-year strings like 'JULY 2015' to datetimes.
+
+    Each distinct value is parsed once,
+    and the results are broadcast back to all rows,
+    so the cost is proportional to the number of distinct values.
+    Parsed values are memoized across calls.
+
+    Parameters
+    ----------
+    values : pandas.Series or array-like of str
+        Month-year strings.
+        Only the trailing month and year are used,
+        so e.g. 'BEFORE JUNE 2005' is parsed as June 2005.
+        Empty or malformed values are parsed to `NaT`.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of `datetime64[ns]`, the first day of each month.
+    """
+    if not isinstance(values, (pd.Series, pd.Index, np.ndarray)):
+        values = np.asarray(values, dtype=object)
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    parsed = np.array([_month_year(str(u)) for u in uniques],
+                      dtype='datetime64[ns]')
+    return parsed[codes]
+
+
+def compact_mic(mic):
+    """Convert a MIC registry to a compact, typed representation.
+
+    Low cardinality columns are converted to categoricals,
+    MIC codes to a contiguous string array (if `pyarrow` is available),
+    and month-year columns to `datetime64[ns]`.
+    Other columns are left as they are.
+
+    Parameters
+    ----------
+    mic : pandas.DataFrame
+        The MIC registry, as parsed from the published csv file.
+
+    Returns
+    -------
+    pandas.DataFrame
+        A new DataFrame with the same columns and rows.
+    """
+    columns = {}
+    for c in mic.columns:
+        if c in MIC_CATEGORICAL_COLUMNS:
+            columns[c] = mic[c].astype('category')
+        elif c in MIC_CODE_COLUMNS:
+            columns[c] = mic[c].astype(MIC_CODE_DTYPE)
+        elif c in MIC_DATE_COLUMNS:
+            columns[c] = pd.Series(parse_month_year(mic[c]),
+                                   index=mic.index)
+        else:
+            columns[c] = mic[c]
+    return pd.DataFrame(columns, index=mic.index)
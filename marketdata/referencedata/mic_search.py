@@ -0,0 +1,203 @@
+# -*- coding: utf-8; mode: Python; -*-
+
+import re
+import bisect
+import heapq
+import logging
+import unicodedata
+from collections import namedtuple
+
+from .mic_index import MIC_COLUMNS, MICRecord
+from .iso10383mic import classname
+
+
+module_logger = logging.getLogger(__name__)
+
+
+#
+# Columns of the MIC registry searched by `MICSearchIndex`,
+# and the weight of a match in each.
+#
+SEARCH_COLUMNS = (
+    ('MIC', 4.0),
+    ('ACRONYM', 3.0),
+    ('NAME-INSTITUTION DESCRIPTION', 2.0),
+    ('CITY', 1.0),
+)
+
+# Quality of a match of a query term with an indexed token
+EXACT_MATCH = 1.0
+PREFIX_MATCH = 0.7
+FUZZY_MATCH = 0.5
+
+# Fuzzy matching of terms matching no token as prefix
+FUZZY_MIN_LENGTH = 4
+FUZZY_MIN_SIMILARITY = 0.4
+
+# Number of expanded query terms kept by `MICSearchIndex`
+_TERM_CACHE_SIZE = 4096
+
+_NON_ALNUM = re.compile(r'[^0-9A-Z]+')
+
+MICSearchHit = namedtuple('MICSearchHit', ['score', 'record'])
+MICSearchHit.__doc__ = """A ranked search result.
+
+`record` is the `MICRecord` found, and `score` its relevance.
+"""
+
+
+def tokenize(text):
+    """Split text into upper case tokens, without diacritics."""
+    text = unicodedata.normalize('NFKD', str(text))
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return [t for t in _NON_ALNUM.split(text.upper()) if t]
+
+
+def _trigrams(token):
+    padded = '$' + token + '$'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class MICSearchIndex:
+    """Ranked search over the names, acronyms and cities of MICs.
+
+    Built once per version of the MIC registry,
+    the index maps every token of the searched columns
+    to the rows containing it,
+    keeps the tokens sorted for prefix search,
+    and indexes their trigrams for fuzzy search.
+
+    Parameters
+    ----------
+
+    mic : pandas.DataFrame
+        The MIC registry to index.
+
+    Notes
+    -----
+
+    A query matches the MICs matching all of its terms.
+    A term matches a token it equals, or is a prefix of,
+    so partial words typed in an autocomplete match.
+    A term matching no token as a prefix
+    matches tokens with similar trigrams instead, to allow for typos.
+    Results are ranked by the sum, over the terms,
+    of the best match quality times the weight of the column matched,
+    see `SEARCH_COLUMNS`.
+    """
+    def __init__(self, mic):
+        logger = module_logger
+        logger.debug('Class "%s" instantiated.',
+                     classname(self))
+
+        values = [mic[c].tolist() if c in mic.columns else [None] * len(mic)
+                  for c, _ in MIC_COLUMNS]
+        self._records = [MICRecord._make(v) for v in zip(*values)]
+        #
+        # Postings: token -> {row: weight of the best column}
+        postings = {}
+        for column, weight in SEARCH_COLUMNS:
+            if column not in mic.columns:
+                continue
+            for row, text in enumerate(mic[column].tolist()):
+                for token in tokenize(text):
+                    rows = postings.setdefault(token, {})
+                    if rows.get(row, 0.0) < weight:
+                        rows[row] = weight
+        self._postings = postings
+        self._tokens = sorted(postings)
+        trigrams = {}
+        for token in self._tokens:
+            for g in _trigrams(token):
+                trigrams.setdefault(g, []).append(token)
+        self._trigrams = trigrams
+        self._terms = {}
+        # The slowest terms, single characters matching many tokens,
+        # are expanded up front, and kept
+        self._pinned = {}
+        for c in sorted({t[0] for t in self._tokens}):
+            self._pinned[c] = self._term_scores(c)
+        self._terms.clear()
+
+    def __len__(self):
+        """Number of distinct tokens indexed."""
+        return len(self._tokens)
+
+    def _prefixed(self, term):
+        i = bisect.bisect_left(self._tokens, term)
+        j = bisect.bisect_left(self._tokens, term + '\uffff', lo=i)
+        return self._tokens[i:j]
+
+    def _similar(self, term):
+        if len(term) < FUZZY_MIN_LENGTH:
+            return ()
+        grams = _trigrams(term)
+        shared = {}
+        for g in grams:
+            for token in self._trigrams.get(g, ()):
+                shared[token] = shared.get(token, 0) + 1
+        similar = []
+        for token, n in shared.items():
+            similarity = n / (len(grams) + len(_trigrams(token)) - n)
+            if similarity >= FUZZY_MIN_SIMILARITY:
+                similar.append((token, similarity))
+        return similar
+
+    def _term_scores(self, term):
+        """Return the score of each row matching one query term."""
+        scores = self._pinned.get(term)
+        if scores is None:
+            scores = self._terms.get(term)
+        if scores is not None:
+            return scores
+        scores = {}
+        matches = [(t, EXACT_MATCH if t == term else PREFIX_MATCH)
+                   for t in self._prefixed(term)]
+        if not matches:
+            matches = [(t, FUZZY_MATCH * s) for t, s in self._similar(term)]
+        for token, quality in matches:
+            for row, weight in self._postings[token].items():
+                score = quality * weight
+                if scores.get(row, 0.0) < score:
+                    scores[row] = score
+        if len(self._terms) >= _TERM_CACHE_SIZE:
+            self._terms.clear()
+        self._terms[term] = scores
+        return scores
+
+    def search(self, query, limit=10):
+        """Search MICs by name, acronym, city or code.
+
+        Parameters
+        ----------
+        query : str
+            Words, or prefixes of words, e.g. 'MERCADO GAS' or 'EXAN'.
+        limit : int or None, optional
+            Maximum number of results.
+            Defaults to 10, `None` for all.
+
+        Returns
+        -------
+        list of MICSearchHit
+            The matching MICs, best match first.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        # Start with the term matching the fewest rows
+        term_scores = sorted((self._term_scores(t) for t in terms), key=len)
+        total = dict(term_scores[0])
+        for scores in term_scores[1:]:
+            total = {row: s + scores[row]
+                     for row, s in total.items() if row in scores}
+            if not total:
+                return []
+
+        def rank(rs):
+            return (-rs[1], self._records[rs[0]].mic)
+        if limit is None:
+            ranked = sorted(total.items(), key=rank)
+        else:
+            ranked = heapq.nsmallest(limit, total.items(), key=rank)
+        return [MICSearchHit(score, self._records[row])
+                for row, score in ranked]
@@ -0,0 +1,233 @@
+# -*- coding: utf-8; mode: Python; -*-
+
+import os
+import logging
+import numpy as np
+
+try:
+    import pyarrow
+    from pyarrow import ipc
+except ImportError:
+    pyarrow = None
+
+from .mic_index import MIC_COLUMNS, MICRecord
+from .mic_snapshot import SNAPSHOT_META_KEY, encode_meta, decode_meta
+from .iso10383mic import classname
+
+
+module_logger = logging.getLogger(__name__)
+
+#
+# Index columns stored next to the registry columns in the shared file.
+# Each index is a pair of columns:
+# the sorted keys as fixed size binary, and the row number of each key.
+#
+_INDEXES = (
+    ('mic', 'MIC'),
+    ('operating_mic', 'OPERATING MIC'),
+    ('country', 'ISO COUNTRY CODE (ISO 3166)'),
+)
+
+
+def _key_column(name):
+    return '__{}_key'.format(name)
+
+
+def _row_column(name):
+    return '__{}_row'.format(name)
+
+
+def _encode_keys(values):
+    keys = np.array([str(v).encode('utf-8') for v in values])
+    if keys.dtype.itemsize == 0:
+        keys = keys.astype('S1')
+    return keys
+
+
+def read_shared_meta(fna):
+    """Return the metadata of a shared file, or `None` if unreadable."""
+    if pyarrow is None or not os.path.isfile(fna):
+        return None
+    try:
+        with pyarrow.memory_map(fna, 'r') as source:
+            schema = ipc.open_file(source).schema
+        return decode_meta(schema.metadata[SNAPSHOT_META_KEY])
+    except (pyarrow.ArrowInvalid, OSError, KeyError, ValueError):
+        return None
+
+
+def publish_shared(fna, mic, **meta):
+    """Publish a MIC registry and its lookup indexes to a shared file.
+
+    The registry is written uncompressed in the Arrow IPC file format,
+    so it can be memory-mapped without copying by `SharedMICRegistry`.
+    The file is written to a temporary file and renamed into place,
+    so processes mapping the previous version keep a consistent view
+    until they call `SharedMICRegistry.refresh()`.
+
+    Parameters
+    ----------
+    fna : str
+        Path name of the shared file.
+    mic : pandas.DataFrame
+        The parsed MIC registry.
+    **meta
+        Metadata to store with the registry, as for `write_snapshot()`.
+    """
+    table = pyarrow.Table.from_pandas(mic, preserve_index=False)
+    for name, column in _INDEXES:
+        if column not in mic.columns:
+            continue
+        keys = _encode_keys(mic[column].tolist())
+        order = np.argsort(keys, kind='stable').astype(np.int32)
+        table = table.append_column(
+            _key_column(name),
+            pyarrow.array(keys[order],
+                          type=pyarrow.binary(keys.dtype.itemsize)))
+        table = table.append_column(_row_column(name), pyarrow.array(order))
+    schema_meta = dict(table.schema.metadata or {})
+    schema_meta[SNAPSHOT_META_KEY] = encode_meta(meta)
+    table = table.replace_schema_metadata(schema_meta)
+    #
+    fna_tmp = '{}.{}.tmp'.format(fna, os.getpid())
+    with pyarrow.OSFile(fna_tmp, 'wb') as sink:
+        with ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=max(len(table), 1))
+    os.replace(fna_tmp, fna)
+    module_logger.debug('Published shared MIC registry "%s".', fna)
+
+
+class _SortedIndex:
+    """Binary search over a sorted, memory-mapped key column."""
+    def __init__(self, table, name):
+        keys = table.column(_key_column(name)).chunk(0)
+        width = keys.type.byte_width
+        self.keys = np.frombuffer(keys.buffers()[1],
+                                  dtype='S{}'.format(width),
+                                  count=len(keys),
+                                  offset=keys.offset * width)
+        rows = table.column(_row_column(name)).chunk(0)
+        self.rows = np.frombuffer(rows.buffers()[1],
+                                  dtype=np.int32,
+                                  count=len(rows),
+                                  offset=rows.offset * 4)
+        self.width = width
+
+    def find(self, key):
+        k = str(key).encode('utf-8')
+        if len(k) > self.width:
+            return self.rows[:0]
+        lo = np.searchsorted(self.keys, k, side='left')
+        hi = np.searchsorted(self.keys, k, side='right')
+        return self.rows[lo:hi]
+
+
+class SharedMICRegistry:
+    """Read-only MIC registry memory-mapped from a shared file.
+
+    All processes mapping the same file share the physical pages
+    of both the registry and its lookup indexes,
+    so memory use does not grow with the number of processes.
+
+    Parameters
+    ----------
+
+    fna : str
+        Path name of a file written by `publish_shared()`.
+
+    Attributes
+    ----------
+    publication_time : datetime.datetime or None
+        The publication time of the mapped version of the MIC registry.
+    implementation_time : datetime.datetime or None
+        The implementation time of the mapped version of the MIC registry.
+    next_publication_time : datetime.datetime or None
+        The expected time of the next publication of the MIC registry.
+    table : pyarrow.Table
+        The mapped MIC registry, including the index columns.
+
+    Notes
+    -----
+
+    Lookups use binary search over sorted keys,
+    as hash tables cannot be shared between processes.
+    """
+    def __init__(self, fna):
+        logger = module_logger
+        logger.debug('Class "%s" instantiated.',
+                     classname(self))
+
+        self._fna = fna
+        self._stat = None
+        self.refresh()
+
+    def refresh(self):
+        """Map the current version of the shared file, if it has changed.
+
+        Returns
+        -------
+        bool
+            Was a new version of the shared file mapped.
+        """
+        st = os.stat(self._fna)
+        if (st.st_dev, st.st_ino, st.st_mtime_ns) == self._stat:
+            return False
+        source = pyarrow.memory_map(self._fna, 'r')
+        # Identify the version actually mapped, it may have been replaced
+        st = os.fstat(source.fileno())
+        stat = (st.st_dev, st.st_ino, st.st_mtime_ns)
+        table = ipc.open_file(source).read_all()
+        meta = decode_meta(table.schema.metadata[SNAPSHOT_META_KEY])
+        #
+        self.table = table
+        self.publication_time = meta.get('publication_time')
+        self.implementation_time = meta.get('implementation_time')
+        self.next_publication_time = meta.get('next_publication_time')
+        self._registry = table.select([c for c, _ in MIC_COLUMNS
+                                       if c in table.column_names])
+        self._indexes = {name: _SortedIndex(table, name)
+                         for name, column in _INDEXES
+                         if _key_column(name) in table.column_names}
+        self._stat = stat
+        return True
+
+    def __len__(self):
+        return self.table.num_rows
+
+    def __contains__(self, mic):
+        return len(self._indexes['mic'].find(mic)) > 0
+
+    def _record(self, row):
+        values = self._registry.slice(row, 1).to_pylist()[0]
+        return MICRecord._make(values.get(c) for c, _ in MIC_COLUMNS)
+
+    def lookup(self, mic):
+        """Return the `MICRecord` of `mic`, or `None` if unknown."""
+        rows = self._indexes['mic'].find(mic)
+        return self._record(int(rows[0])) if len(rows) else None
+
+    def operating_mic(self, mic):
+        """Return the OPERATING MIC of `mic`, or `None` if unknown."""
+        r = self.lookup(mic)
+        return None if r is None else r.operating_mic
+
+    def segments(self, operating_mic):
+        """Return the market segment `MICRecord`'s of `operating_mic`."""
+        records = (self._record(int(row))
+                   for row in self._indexes['operating_mic'].find(
+                       operating_mic))
+        return tuple(r for r in records if r.mic != operating_mic)
+
+    def country(self, iso_country_code):
+        """Return the `MICRecord`'s registered in `iso_country_code`."""
+        return tuple(self._record(int(row))
+                     for row in self._indexes['country'].find(
+                         iso_country_code))
+
+    def to_pandas(self):
+        """Return the mapped MIC registry as a pandas.DataFrame.
+
+        String columns are backed by the mapped file, without copying.
+        """
+        import pandas as pd
+        return self._registry.to_pandas(types_mapper=pd.ArrowDtype)
@@ -0,0 +1,95 @@
+# -*- coding: utf-8; mode: Python; -*-
+
+import os
+import json
+import logging
+import datetime
+
+try:
+    import pyarrow
+    from pyarrow import feather
+except ImportError:
+    pyarrow = None
+
+module_logger = logging.getLogger(__name__)
+
+SNAPSHOT_META_KEY = b'marketdata.iso10383mic'
+SNAPSHOT_TIME_KEYS = ('publication_time',
+                      'implementation_time',
+                      'next_publication_time')
+
+
+def snapshot_available():
+    """Is the optional `pyarrow` dependency needed by snapshots installed."""
+    return pyarrow is not None
+
+
+def encode_meta(meta):
+    """Encode snapshot metadata as JSON, with datetimes in ISO 8601."""
+    meta = dict(meta)
+    for k in SNAPSHOT_TIME_KEYS:
+        if meta.get(k) is not None:
+            meta[k] = meta[k].isoformat()
+    return json.dumps(meta).encode('utf-8')
+
+
+def decode_meta(raw):
+    """Decode snapshot metadata encoded by `encode_meta()`."""
+    meta = json.loads(raw)
+    for k in SNAPSHOT_TIME_KEYS:
+        if meta.get(k) is not None:
+            meta[k] = datetime.datetime.fromisoformat(meta[k])
+    return meta
+
+
+def write_snapshot(fna, mic, **meta):
+    """Write a parsed MIC registry to a binary Feather snapshot file.
+
+    The file is written to a temporary file and renamed into place,
+    so readers never see a partially written snapshot.
+
+    Parameters
+    ----------
+    fna : str
+        Path name of the snapshot file.
+    mic : pandas.DataFrame
+        The parsed MIC registry.
+    **meta
+        Metadata to store with the registry.
+        Values must be JSON serializable,
+        except for `publication_time`, `implementation_time` and
+        `next_publication_time`, which are `datetime.datetime` or `None`.
+    """
+    table = pyarrow.Table.from_pandas(mic, preserve_index=False)
+    schema_meta = dict(table.schema.metadata or {})
+    schema_meta[SNAPSHOT_META_KEY] = encode_meta(meta)
+    table = table.replace_schema_metadata(schema_meta)
+    fna_tmp = '{}.{}.tmp'.format(fna, os.getpid())
+    feather.write_feather(table, fna_tmp)
+    os.replace(fna_tmp, fna)
+    module_logger.debug('Wrote snapshot "%s".', fna)
+
+
+def read_snapshot(fna):
+    """Read a MIC registry snapshot file written by `write_snapshot()`.
+
+    Parameters
+    ----------
+    fna : str
+        Path name of the snapshot file.
+
+    Returns
+    -------
+    tuple or None
+        The MIC registry as a `pandas.DataFrame` and the metadata dict,
+        or `None` if there is no usable snapshot.
+    """
+    if pyarrow is None or not os.path.isfile(fna):
+        return None
+    try:
+        table = feather.read_table(fna, memory_map=True)
+        meta = decode_meta(table.schema.metadata[SNAPSHOT_META_KEY])
+    except (pyarrow.ArrowInvalid, OSError, KeyError, ValueError) as e:
+        module_logger.warning('Ignore unreadable snapshot "%s": %s', fna, e)
+        return None
+    return table.to_pandas(), meta
@@ -0,0 +1,129 @@
+# -*- coding: utf-8; mode: Python; -*-
+
+import time
+import collections
+from collections import namedtuple
+
+#
+# Phases of a load of the MIC registry timed by `LoadStats`,
+# in the order they run.
+#
+PHASES = (
+    'page_read',       # read the persisted publication page
+    'page_fetch',      # fetch the publication page from mic_site
+    'page_parse',      # extract the publication metadata
+    'snapshot_read',   # read the snapshot of the parsed registry
+    'data_fetch',      # fetch the csv or xml file from mic_site
+    'data_parse',      # parse the csv or xml file to a DataFrame
+    'frame_build',     # convert the DataFrame, see mic_compact
+    'index_build',     # build the lookup indexes
+    'snapshot_write',  # write the snapshot of the parsed registry
+    'shared_publish',  # publish the memory-mapped registry
+    'history_add',     # add the publication to the history
+)
+
+PhaseStats = namedtuple('PhaseStats', ['seconds', 'nbytes'])
+PhaseStats.__doc__ = """Wall time, in seconds, and bytes processed by a phase.
+
+`nbytes` is `None` for phases processing no data of known size.
+"""
+
+
+class _PhaseTimer:
+    __slots__ = ('_stats', '_name', '_start', 'nbytes')
+
+    def __init__(self, stats, name, nbytes):
+        self._stats = stats
+        self._name = name
+        self.nbytes = nbytes
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stats.add(self._name, time.perf_counter() - self._start,
+                        self.nbytes)
+        return False
+
+
+class LoadStats:
+    """Timings and counters of one load of the MIC registry.
+
+    Filled in by `ISO10383MIC.download_mic()`,
+    and passed to the hooks added by `ISO10383MIC.add_stats_hook()`.
+
+    Attributes
+    ----------
+    phases : dict
+        The `PhaseStats` of every phase run, by name,
+        in the order run. See `PHASES`.
+    counters : collections.Counter
+        Events of the load:
+        `cache_hit` and `cache_miss`, the publication page served
+        from the HTTP cache or not,
+        `persisted`, the persisted files used without fetching,
+        `snapshot_hit`, the registry loaded from its snapshot,
+        and the `revalidation_counts` of `ISO10383MIC`
+        incremented by the load.
+    seconds : float or None
+        Wall time of the whole load, `None` until finished.
+    from_cache, from_persisted : bool
+        As the attributes of `ISO10383MIC`, after the load.
+    """
+    def __init__(self):
+        self.phases = {}
+        self.counters = collections.Counter()
+        self.seconds = None
+        self.from_cache = False
+        self.from_persisted = False
+        self._start = time.perf_counter()
+
+    def timed(self, phase, nbytes=None):
+        """Return a context manager timing `phase`.
+
+        The bytes processed can be set,
+        as the `nbytes` attribute of the context manager,
+        until the phase ends.
+        Phases run more than once add up.
+        """
+        return _PhaseTimer(self, phase, nbytes)
+
+    def add(self, phase, seconds, nbytes=None):
+        """Add the wall time and bytes of a run of `phase`."""
+        previous = self.phases.get(phase)
+        if previous is not None:
+            seconds += previous.seconds
+            if previous.nbytes is not None:
+                nbytes = previous.nbytes + (nbytes or 0)
+        self.phases[phase] = PhaseStats(seconds, nbytes)
+
+    def finish(self):
+        """Record the wall time of the whole load."""
+        self.seconds = time.perf_counter() - self._start
+
+    def as_dict(self):
+        """Flatten the stats, e.g. to forward them as metrics.
+
+        Returns
+        -------
+        dict
+            `<phase>.seconds` and `<phase>.bytes` of every phase,
+            every counter, `seconds`, `from_cache` and `from_persisted`.
+        """
+        d = {}
+        for phase, s in self.phases.items():
+            d[phase + '.seconds'] = s.seconds
+            if s.nbytes is not None:
+                d[phase + '.bytes'] = s.nbytes
+        d.update(self.counters)
+        d['seconds'] = self.seconds
+        d['from_cache'] = self.from_cache
+        d['from_persisted'] = self.from_persisted
+        return d
+
+    def __repr__(self):
+        return '{}({})'.format(
+            type(self).__name__,
+            ', '.join('{}={:.6f}s'.format(p, s.seconds)
+                      for p, s in self.phases.items()))
@@ -0,0 +1,106 @@
+# -*- coding: utf-8; mode: Python; -*-
+
+import re
+import sys
+import logging
+import pandas as pd
+
+module_logger = logging.getLogger(__name__)
+
+#
+# Element of the published xml file holding one row of the MIC registry.
+#
+MIC_XML_ROW_TAG = 'MICs_x0020_List_x0020_by_x0020_Country'
+
+_ESCAPED = re.compile(r'_x([0-9A-Fa-f]{4})_')
+
+
+def decode_xml_name(name):
+    """Decode an XML element name to the column name it escapes.
+
+    Characters not allowed in XML names are escaped as `_xHHHH_`,
+    e.g. `OPERATING_x0020_MIC` is the column `OPERATING MIC`.
+    """
+    return _ESCAPED.sub(lambda m: chr(int(m.group(1), 16)), name)
+
+
+def _iter_chunks(fna_xml, chunksize):
+    from lxml import etree
+    columns = {}
+    n = 0
+    for _, row in etree.iterparse(fna_xml, events=('end',),
+                                  tag=MIC_XML_ROW_TAG):
+        # Skips comments and processing instructions
+        for field in row.iterchildren(etree.Element):
+            values = columns.get(field.tag)
+            if values is None:
+                # A column first seen here is empty in the rows before
+                values = columns[field.tag] = [''] * n
+            values.append(field.text or '')
+        n += 1
+        # Empty fields may be left out of a row
+        for values in columns.values():
+            if len(values) < n:
+                values.append('')
+        # Free the parsed row, and the references to it kept by the root
+        row.clear()
+        while row.getprevious() is not None:
+            del row.getparent()[0]
+        if chunksize is not None and n == chunksize:
+            yield _frame(columns)
+            columns = {tag: [] for tag in columns}
+            n = 0
+    if n or chunksize is None:
+        yield _frame(columns)
+
+
+def _frame(columns):
+    return pd.DataFrame({decode_xml_name(tag): pd.Series(values, dtype=str)
+                         for tag, values in columns.items()})
+
+
+def read_mic_xml(fna_xml, chunksize=None):
+    """Read a MIC registry xml file to a pandas.DataFrame.
+
+    The file is parsed incrementally, one row element at a time,
+    and every element is freed once its fields are appended
+    to the columns,
+    so the parser holds no document tree.
+    The result is the same as `read_mic_csv()` of the csv file
+    of the same publication:
+    every field is kept as a string,
+    and missing or empty fields are kept as empty strings.
+
+    Parameters
+    ----------
+    fna_xml : str
+        Path name of the xml file.
+        The encoding is taken from its XML declaration.
+    chunksize : int or None, optional
+        If given, return an iterator of DataFrames
+        of at most `chunksize` rows each,
+        instead of a single DataFrame,
+        and parse with memory bounded by `chunksize`.
+
+    Returns
+    -------
+    pandas.DataFrame or iterator of pandas.DataFrame
+        The MIC registry, or chunks of it if `chunksize` is given.
+
+    Notes
+    -----
+
+    When the whole file is read,
+    a malformed file is logged as critical and terminates the process,
+    as a registry that cannot be parsed cannot be used.
+    When reading in chunks, parse errors are raised by the iterator.
+    """
+    if chunksize is not None:
+        return _iter_chunks(fna_xml, chunksize)
+    from lxml import etree
+    try:
+        return next(_iter_chunks(fna_xml, None))
+    except etree.XMLSyntaxError as e:
+        msg = 'file {}: {}'.format(fna_xml, e)
+        module_logger.critical(msg)
+        sys.exit(msg)
@@ -0,0 +1,118 @@
+# -*- coding: utf-8; mode: Python; -*-
+import datetime
+import calendar
+import logging
+from email.utils import parsedate, formatdate
+from cachecontrol.heuristics import BaseHeuristic
+from .iso10383mic import classname
+
+module_logger = logging.getLogger(__name__)
+
+
+class PublicationHeuristic(BaseHeuristic):
+    """Caching strategy for `CacheControl` aligned with MIC publications.
+
+    Every response is cached, regardless of the upstream caching strategy
+    communicated in the response,
+    for a fixed time to live, or until the next publication
+    of the MIC registry, when the registry can actually change.
+
+    Parameters
+    ----------
+
+    ttl : datetime.timedelta, optional
+        Time to live of a cached response.
+        Defaults to one day.
+    until_next_publication : bool, optional
+        Cache responses until `next_publication_time`, if later than `ttl`.
+        Defaults to `False`.
+    stale_while_revalidate : datetime.timedelta or None, optional
+        How long after expiry a stale response may still be used
+        while it is revalidated in the background.
+        Defaults to `None`, not at all.
+    stale_if_error : datetime.timedelta or None, optional
+        How long after expiry a stale response may still be used
+        if fetching a new one fails.
+        Defaults to `None`, not at all.
+
+    Attributes
+    ----------
+    next_publication_time : datetime.datetime or None
+        The announced next publication time of the MIC registry,
+        set by `ISO10383MIC` once known.
+
+    Notes
+    -----
+
+    When a response is received and we are testing for whether it is cacheable,
+    the heuristic is applied before checking its headers.
+    Responses lacking a `date` header are taken as sent now.
+    The stale windows are set as the `stale-while-revalidate`
+    and `stale-if-error` `cache-control` extensions of RFC 5861.
+    `CacheControl` ignores them,
+    but `ISO10383MIC` honours them for its persisted files.
+    We also set a warning header
+    to communicate why the response might be stale.
+
+    The `CacheControl` package contains
+    the httplib2 caching algorithms packaged up for use with requests.
+    Refer to the
+    `documentation <https://cachecontrol.readthedocs.io/en/latest/index.html>`_
+    and
+    `project repository <https://github.com/ionrock/cachecontrol>`_
+    """
+    def __init__(self, ttl=datetime.timedelta(days=1),
+                 until_next_publication=False,
+                 stale_while_revalidate=None,
+                 stale_if_error=None):
+        module_logger.debug('Class "%s" instantiated.',
+                            classname(self))
+        self.ttl = ttl
+        self.until_next_publication = until_next_publication
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stale_if_error = stale_if_error
+        self.next_publication_time = None
+
+    def expires(self, date):
+        """Return the expiry of a response sent at `date`."""
+        expires = date + self.ttl
+        next_publication_time = self.next_publication_time
+        if (self.until_next_publication
+                and next_publication_time is not None
+                and next_publication_time > expires):
+            expires = next_publication_time
+        return expires
+
+    def update_headers(self, response):
+        logger = module_logger
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            for h in ('date', 'expires', 'cache-control'):
+                logger.debug('"%s": response header "%s" = %s.',
+                             classname(self), h, response.headers.get(h))
+
+        date = parsedate(response.headers.get('date') or '')
+        if date is None:
+            date = datetime.datetime.now(tz=datetime.timezone.utc)
+        else:
+            date = datetime.datetime(*date[:6], tzinfo=datetime.timezone.utc)
+        expires = self.expires(date)
+        cache_control = ['public']
+        for directive, window in (
+                ('stale-while-revalidate', self.stale_while_revalidate),
+                ('stale-if-error', self.stale_if_error)):
+            if window is not None:
+                cache_control.append('{}={}'.format(
+                    directive, int(window.total_seconds())))
+        if debug:
+            logger.debug('"%s": modified header is now "expires" = %s.',
+                         classname(self), expires)
+        return {
+            'expires': formatdate(calendar.timegm(expires.utctimetuple()),
+                                  usegmt=True),
+            'cache-control': ', '.join(cache_control),
+        }
+
+    def warning(self, response):
+        msg = 'Automatically cached! Response is Stale.'
+        return '110 - "%s"' % msg
@@ -0,0 +1,372 @@
+# -*- coding: utf-8; mode: Python; -*-
+
+import time
+import logging
+import threading
+import concurrent.futures
+from .iso10383mic import classname
+
+
+module_logger = logging.getLogger(__name__)
+
+
+class ReferenceDataSource:
+    """A reference dataset, and how to load it.
+
+    Parameters
+    ----------
+
+    name : str
+        Name of the dataset, unique within a `ReferenceDataLoader`.
+    load : callable
+        Called with a dict of the results of the sources in
+        `depends_on`, by name, to load or refresh the dataset.
+        Returns the dataset, or raises.
+        It is called from a worker thread,
+        and never concurrently with itself by the same loader.
+    depends_on : iterable of str, optional
+        Names of the sources to load first.
+    timeout : float or None, optional
+        Seconds `load` may run before it is reported as failed
+        with a `TimeoutError`. Defaults to `None`, no timeout.
+
+    Notes
+    -----
+
+    A thread cannot be interrupted:
+    a `load` past its timeout still runs to its end in the background,
+    and its result is discarded.
+    Give the transport of `load` its own timeouts,
+    e.g. the `HTTPSessionPool` of an `ISO10383MIC`,
+    so it does end.
+    """
+    def __init__(self, name, load, depends_on=(), timeout=None):
+        self.name = name
+        self.load = load
+        self.depends_on = tuple(depends_on)
+        self.timeout = timeout
+
+    def __repr__(self):
+        return '{}({!r}, depends_on={!r}, timeout={!r})'.format(
+            classname(self), self.name, self.depends_on, self.timeout)
+
+
+class ReferenceDataError(RuntimeError):
+    """Loading some reference datasets failed.
+
+    Attributes
+    ----------
+    report : ReferenceDataReport
+        The report of the load.
+    """
+    def __init__(self, report):
+        super().__init__('Failed to load reference data: {}.'.format(
+            ', '.join(['{} ({!r})'.format(name, e)
+                       for name, e in report.errors.items()]
+                      + ['{} (skipped)'.format(name)
+                         for name in report.skipped])))
+        self.report = report
+
+
+class ReferenceDataReport:
+    """Outcome of one `ReferenceDataLoader.load()`.
+
+    Attributes
+    ----------
+    results : dict
+        The datasets loaded, by source name.
+    errors : dict
+        The exceptions of the sources that failed, by source name,
+        a `TimeoutError` for sources past their timeout.
+    skipped : dict
+        The sources not loaded because a dependency failed,
+        by name, with the names of the failed dependencies.
+    seconds : dict
+        Wall time of the loaded and failed sources, by name.
+        Sources past their timeout report their timeout.
+    elapsed : float
+        Wall time of the whole load, in seconds.
+    """
+    def __init__(self):
+        self.results = {}
+        self.errors = {}
+        self.skipped = {}
+        self.seconds = {}
+        self.elapsed = None
+
+    @property
+    def ok(self):
+        """Whether every source requested was loaded."""
+        return not self.errors and not self.skipped
+
+    def raise_for_errors(self):
+        """Raise a `ReferenceDataError` unless `ok`."""
+        if not self.ok:
+            raise ReferenceDataError(self)
+
+    def __repr__(self):
+        return '{}(results={}, errors={}, skipped={}, elapsed={})'.format(
+            classname(self), sorted(self.results), sorted(self.errors),
+            sorted(self.skipped), self.elapsed)
+
+
+class ReferenceDataLoader:
+    """Load reference datasets concurrently, in dependency order.
+
+    Sources are registered with `register()`,
+    and loaded, or refreshed, by `load()` on a thread pool.
+    A source starts as soon as its dependencies are loaded,
+    so, when sources are independent,
+    a load takes as long as its slowest source,
+    not as long as all of them.
+
+    Parameters
+    ----------
+
+    max_workers : int or None, optional
+        Maximum number of sources loading at once.
+        Defaults to `None`, one thread per source.
+
+    Attributes
+    ----------
+    results : dict
+        The last dataset loaded of every source, by name.
+        A source failing to refresh keeps its former dataset.
+
+    Examples
+    --------
+
+    >>> loader = ReferenceDataLoader()
+    >>> loader.register(mic_source(timeout=120))
+    >>> loader.register(ReferenceDataSource(
+    ...     'venues', lambda deps: venues_from(deps['mic']),
+    ...     depends_on=['mic']))
+    >>> report = loader.load()
+    >>> report.raise_for_errors()
+    >>> loader.results['venues']
+    """
+    def __init__(self, max_workers=None):
+        logger = module_logger
+        logger.debug('Class "%s" instantiated.',
+                     classname(self))
+
+        self.max_workers = max_workers
+        self.results = {}
+        self._sources = {}
+        # Serializes the loads, and so the calls of every source
+        self._load_lock = threading.Lock()
+        # Sources past their timeout, and still running
+        self._running = set()
+
+    @property
+    def sources(self):
+        """The registered `ReferenceDataSource` objects, by name."""
+        return dict(self._sources)
+
+    def register(self, source):
+        """Register a `ReferenceDataSource`.
+
+        Returns
+        -------
+        ReferenceDataSource
+            `source`.
+
+        Raises
+        ------
+        ValueError
+            If a source of the same name is registered.
+        """
+        if source.name in self._sources:
+            raise ValueError(
+                'Source {!r} already registered.'.format(source.name))
+        self._sources[source.name] = source
+        return source
+
+    def unregister(self, name):
+        """Remove the source `name`, and its last dataset."""
+        del self._sources[name]
+        self.results.pop(name, None)
+
+    def _order(self, names):
+        """Return the sources to load for `names`, dependencies first.
+
+        Raises `ValueError` for unknown sources and dependency cycles.
+        """
+        order = []
+        state = {}
+
+        def visit(name, path):
+            if state.get(name) == 'done':
+                return
+            if state.get(name) == 'visiting':
+                raise ValueError('Dependency cycle {}.'.format(
+                    ' -> '.join(path + [name])))
+            if name not in self._sources:
+                if path:
+                    raise ValueError(
+                        'Source {!r} depends on unknown source {!r}.'.format(
+                            path[-1], name))
+                raise ValueError('Unknown source {!r}.'.format(name))
+            state[name] = 'visiting'
+            for dep in self._sources[name].depends_on:
+                visit(dep, path + [name])
+            state[name] = 'done'
+            order.append(self._sources[name])
+
+        for name in names:
+            visit(name, [])
+        return order
+
+    def load(self, names=None):
+        """Load or refresh sources, and their dependencies, concurrently.
+
+        Parameters
+        ----------
+        names : iterable of str, optional
+            Names of the sources to load.
+            Defaults to `None`, all registered sources.
+
+        Returns
+        -------
+        ReferenceDataReport
+            What was loaded, and what failed.
+            Failures do not raise, see
+            `ReferenceDataReport.raise_for_errors()`.
+
+        Raises
+        ------
+        ValueError
+            For unknown sources, and dependency cycles.
+        """
+        logger = module_logger
+        with self._load_lock:
+            order = self._order(list(self._sources) if names is None
+                                else list(names))
+            report = ReferenceDataReport()
+            start = time.monotonic()
+            # Loading, or waiting for dependencies, by name
+            waiting = {source.name: source for source in order}
+            futures = {}
+            started = {}
+            executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_workers or max(len(order), 1),
+                thread_name_prefix=classname(self))
+
+            def run(source, deps):
+                started[source.name] = time.monotonic()
+                return source.load(deps)
+
+            def finish(name, result=None, error=None):
+                del waiting[name]
+                seconds = time.monotonic() - started[name]
+                if error is None:
+                    report.results[name] = result
+                    self.results[name] = result
+                    logger.debug('Loaded "%s" in %.3fs.', name, seconds)
+                else:
+                    report.errors[name] = error
+                    logger.warning('Failed to load "%s": %r.', name, error)
+                report.seconds[name] = seconds
+
+            try:
+                while waiting:
+                    # Start the sources whose dependencies are loaded,
+                    # skip those with a dependency failed
+                    for source in list(waiting.values()):
+                        if source.name in futures:
+                            continue
+                        failed = [d for d in source.depends_on
+                                  if d in report.errors or d in report.skipped]
+                        if failed:
+                            del waiting[source.name]
+                            report.skipped[source.name] = failed
+                            logger.warning('Skipped "%s", failed %s.',
+                                           source.name, failed)
+                        elif all(d in report.results
+                                 for d in source.depends_on):
+                            if source.name in self._running:
+                                # Still running since the last load
+                                del waiting[source.name]
+                                report.errors[source.name] = TimeoutError(
+                                    'Still loading since a former load.')
+                                continue
+                            deps = {d: report.results[d]
+                                    for d in source.depends_on}
+                            futures[source.name] = executor.submit(
+                                run, source, deps)
+                    pending = {futures[name]: name for name in waiting
+                               if name in futures}
+                    if not pending:
+                        continue
+                    # Wait for a source to finish, or to time out
+                    now = time.monotonic()
+                    deadlines = []
+                    for name in pending.values():
+                        timeout = waiting[name].timeout
+                        if timeout is not None:
+                            # Poll for queued sources to start
+                            deadlines.append(
+                                started[name] + timeout if name in started
+                                else now + 0.05)
+                    wait = max(min(deadlines) - now, 0) if deadlines else None
+                    done, _ = concurrent.futures.wait(
+                        pending, timeout=wait,
+                        return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        name = pending[future]
+                        error = future.exception()
+                        finish(name, None if error else future.result(),
+                               error)
+                    now = time.monotonic()
+                    for future, name in pending.items():
+                        source = waiting.get(name)
+                        if (future not in done and source is not None
+                                and source.timeout is not None
+                                and name in started
+                                and now >= started[name] + source.timeout):
+                            finish(name, error=TimeoutError(
+                                'Load of {!r} timed out after {}s.'.format(
+                                    name, source.timeout)))
+                            report.seconds[name] = source.timeout
+                            self._running.add(name)
+                            future.add_done_callback(
+                                lambda f, name=name:
+                                self._running.discard(name))
+            finally:
+                # Never wait for sources past their timeout
+                executor.shutdown(wait=False)
+            report.elapsed = time.monotonic() - start
+            logger.debug('Load done in %.3fs: %r.', report.elapsed, report)
+            return report
+
+
+def mic_source(registry=None, name='mic', timeout=None, **kwargs):
+    """Return a `ReferenceDataSource` of the MIC registry.
+
+    Its dataset is the current `MICVersion` of `registry`,
+    refreshed by every load.
+
+    Parameters
+    ----------
+    registry : MICRegistry, optional
+        The registry to refresh.
+        Defaults to a new `MICRegistry(**kwargs)`.
+    name : str, optional
+        Name of the source. Defaults to 'mic'.
+    timeout : float or None, optional
+        Timeout of the source, see `ReferenceDataSource`.
+    **kwargs
+        Parameters of the `ISO10383MIC` loader of the default registry.
+
+    Returns
+    -------
+    ReferenceDataSource
+        The source, with `registry` as its `registry` attribute.
+    """
+    if registry is None:
+        from .mic_registry import MICRegistry
+        registry = MICRegistry(**kwargs)
+    source = ReferenceDataSource(name, lambda deps: registry.refresh(),
+                                 timeout=timeout)
+    source.registry = registry
+    return source
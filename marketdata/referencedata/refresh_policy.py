@@ -0,0 +1,98 @@
+# -*- coding: utf-8; mode: Python; -*-
+
+import datetime
+
+
+class RefreshPolicy:
+    """Decide when persisted reference data must be fetched again.
+
+    Subclasses implement `next_check()`.
+
+    Notes
+    -----
+
+    All times are timezone aware `datetime.datetime`'s.
+    """
+
+    def next_check(self, fetch_time, next_publication_time):
+        """Return the time persisted data should be fetched again.
+
+        Parameters
+        ----------
+        fetch_time : datetime.datetime
+            The time the persisted data was fetched from its source.
+        next_publication_time : datetime.datetime or None
+            The announced time of the next publication of the data,
+            as known when it was fetched.
+
+        Returns
+        -------
+        datetime.datetime
+        """
+        raise NotImplementedError
+
+    def is_fresh(self, fetch_time, next_publication_time, now=None):
+        """Can persisted data fetched at `fetch_time` still be used."""
+        if now is None:
+            now = datetime.datetime.now(tz=datetime.timezone.utc)
+        return now < self.next_check(fetch_time, next_publication_time)
+
+
+class FixedAgeRefreshPolicy(RefreshPolicy):
+    """Fetch persisted data again when it reaches a fixed age.
+
+    Parameters
+    ----------
+
+    max_age : datetime.timedelta, optional
+        Age at which persisted data is fetched again.
+        Defaults to 23 hours.
+    """
+    def __init__(self, max_age=datetime.timedelta(hours=23)):
+        self.max_age = max_age
+
+    def next_check(self, fetch_time, next_publication_time):
+        return fetch_time + self.max_age
+
+
+class PublicationRefreshPolicy(RefreshPolicy):
+    """Trust persisted data until the announced next publication.
+
+    Persisted data is used until its `next_publication_time`.
+    Once that has passed, the source is polled with exponential backoff,
+    from `min_backoff` up to `max_backoff` between polls,
+    until a new publication with a later `next_publication_time` appears.
+
+    Parameters
+    ----------
+
+    min_backoff : datetime.timedelta, optional
+        Delay before the first poll after a fetch
+        which found no new publication.
+        Defaults to 15 minutes.
+    max_backoff : datetime.timedelta, optional
+        Maximum delay between polls.
+        Also used if no next publication time is known.
+        Defaults to 6 hours.
+
+    Notes
+    -----
+
+    The policy is stateless:
+    the delay doubles because it is derived from
+    how long the publication was overdue at the last fetch.
+    """
+    def __init__(self,
+                 min_backoff=datetime.timedelta(minutes=15),
+                 max_backoff=datetime.timedelta(hours=6)):
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+
+    def next_check(self, fetch_time, next_publication_time):
+        if next_publication_time is None:
+            return fetch_time + self.max_backoff
+        if fetch_time < next_publication_time:
+            return next_publication_time
+        overdue = fetch_time - next_publication_time
+        return fetch_time + min(max(overdue, self.min_backoff),
+                                self.max_backoff)
@@ -0,0 +1,111 @@
+# -*- coding: utf-8; mode: Python; -*-
+
+import datetime
+import logging
+import threading
+from .iso10383mic import classname
+
+
+module_logger = logging.getLogger(__name__)
+
+
+class RefreshScheduler:
+    """Refresh a registry in a background thread, when its policy says so.
+
+    The thread sleeps until the time returned by
+    `RefreshPolicy.next_check()` of the registry's refresh policy
+    for the loaded version of the registry,
+    and then calls `download_mic()`.
+    Failed refreshes are retried with exponential backoff.
+
+    Parameters
+    ----------
+
+    registry : ISO10383MIC or MICRegistry
+        The registry to refresh.
+        Use a `MICRegistry` if other threads read the registry.
+    retry_min : datetime.timedelta, optional
+        Delay before retrying a failed refresh,
+        and minimum delay between refreshes.
+        Defaults to 1 minute.
+    retry_max : datetime.timedelta, optional
+        Maximum delay between retries of failed refreshes.
+        Defaults to 1 hour.
+    on_refresh : callable, optional
+        Called with `registry` after every successful refresh.
+
+    Attributes
+    ----------
+    next_check : datetime.datetime or None
+        The time of the next scheduled refresh.
+    failures : int
+        Number of consecutive failed refreshes.
+    """
+    def __init__(self, registry,
+                 retry_min=datetime.timedelta(minutes=1),
+                 retry_max=datetime.timedelta(hours=1),
+                 on_refresh=None):
+        logger = module_logger
+        logger.debug('Class "%s" instantiated.',
+                     classname(self))
+
+        self.registry = registry
+        self.retry_min = retry_min
+        self.retry_max = retry_max
+        self.on_refresh = on_refresh
+        self.next_check = None
+        self.failures = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start refreshing in a daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run,
+                                        name=classname(self),
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Stop refreshing, and wait for the thread to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _schedule(self):
+        now = datetime.datetime.now(tz=datetime.timezone.utc)
+        if self.failures:
+            delay = min(self.retry_min * 2 ** (self.failures - 1),
+                        self.retry_max)
+            return now + delay
+        if self.registry.fetch_time is None:
+            return now
+        next_check = self.registry.refresh_policy.next_check(
+            self.registry.fetch_time, self.registry.next_publication_time)
+        if self.next_check is not None and next_check <= now:
+            # Never spin, whatever the policy says
+            return now + self.retry_min
+        return next_check
+
+    def _run(self):
+        while True:
+            self.next_check = self._schedule()
+            module_logger.debug('Next refresh check at %s.',
+                                self.next_check.isoformat())
+            now = datetime.datetime.now(tz=datetime.timezone.utc)
+            delay = (self.next_check - now).total_seconds()
+            if self._stop.wait(max(delay, 0)):
+                return
+            try:
+                self.registry.download_mic()
+            except Exception:
+                self.failures += 1
+                module_logger.exception('Refresh failed (%d in a row).',
+                                        self.failures)
+                continue
+            self.failures = 0
+            if self.on_refresh is not None:
+                self.on_refresh(self.registry)
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; mode: Python; -*-
+import os
+import time
+import socket
+import inspect
+import threading
+import http.server
+import pytest
+import requests
+
+from marketdata.referencedata.iso10383mic import ISO10383MIC
+from marketdata.referencedata.http_session import (HTTPSessionPool,
+                                                   shared_pool,
+                                                   configure_shared_pool)
+from marketdata.referencedata import http_session
+from marketdata.referencedata.http_session import _PooledAdapter
+
+FIXTURE_DIR = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)),
+    'data',
+)
+
+ISO20022ORG_SAMPLES_DIR = pytest.mark.datafiles(
+    os.path.join(FIXTURE_DIR, 'iso10383mic', 'www.iso20022.org'),
+    keep_top_dir=True,
+)
+
+
+class _KeepAliveHandler(http.server.SimpleHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    connections = 0
+    requests = 0
+    # Requests answered 503 before the others
+    unavailable = 0
+
+    def setup(self):
+        type(self).connections += 1
+        super().setup()
+
+    def do_GET(self):
+        type(self).requests += 1
+        if type(self).unavailable > 0:
+            type(self).unavailable -= 1
+            self.send_error(503)
+            return
+        super().do_GET()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def http_site(datafiles):
+    d_path = os.path.join(str(datafiles), 'www.iso20022.org')
+
+    class Handler(_KeepAliveHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=d_path, **kwargs)
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield 'http://127.0.0.1:{}/'.format(server.server_port), Handler
+    server.shutdown()
+    server.server_close()
+
+
+@ISO20022ORG_SAMPLES_DIR
+def test_iso10383mic_http_pool(datafiles, http_site):
+    """Verify instances fetch through the connections of a shared pool."""
+
+    print('Function: "{}"'.format(inspect.currentframe().f_code.co_name))
+    site, handler = http_site
+    tmp_path = str(datafiles)
+    pool = HTTPSessionPool()
+    dfs = []
+    for name in ('a', 'b'):
+        mic = ISO10383MIC(mic_site=site,
+                          mic_rel_url='market-identifier-codes.html',
+                          mic_cache_dir=os.path.join(tmp_path, 'cache'),
+                          mic_persistence_dir=os.path.join(tmp_path,
+                                                           'persist_' + name),
+                          mic_snapshot=False,
+                          mic_cache='memory',
+                          mic_http_pool=pool)
+        dfs.append(mic.download_mic())
+        assert mic.from_cache is False
+    assert dfs[0].equals(dfs[1])
+    # Page and data file, twice, over a single kept-alive connection
+    assert handler.requests == 4
+    assert handler.connections == 1
+    # Closing a session leaves the connections of the pool open
+    mic._cached_session().close()
+    assert len(pool.pool_manager().pools) == 1
+    pool.clear()
+    assert len(pool.pool_manager().pools) == 0
+
+
+@ISO20022ORG_SAMPLES_DIR
+def test_http_pool_retries(datafiles, http_site):
+    """Verify unavailable responses are retried, then returned."""
+
+    print('Function: "{}"'.format(inspect.currentframe().f_code.co_name))
+    site, handler = http_site
+    url = site + 'market-identifier-codes.html'
+    sess = HTTPSessionPool(backoff_factor=0).session()
+    handler.unavailable = 2
+    assert sess.get(url).status_code == 200
+    assert handler.requests == 3
+    sess = HTTPSessionPool(retries=1, backoff_factor=0).session()
+    handler.unavailable = 3
+    assert sess.get(url).status_code == 503
+    assert handler.requests == 5
+
+
+def test_http_pool_timeout():
+    """Verify requests time out with the timeout of the pool."""
+    # Connections are accepted by the kernel, but never answered
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        sock.listen(8)
+        url = 'http://127.0.0.1:{}/'.format(sock.getsockname()[1])
+        sess = HTTPSessionPool(timeout=0.2, retries=0).session()
+        t0 = time.perf_counter()
+        with pytest.raises(requests.Timeout):
+            sess.get(url)
+        assert time.perf_counter() - t0 < 5
+        # Unless given for the request
+        sess = HTTPSessionPool(timeout=60, retries=0).session()
+        t0 = time.perf_counter()
+        with pytest.raises(requests.Timeout):
+            sess.get(url, timeout=0.2)
+        assert time.perf_counter() - t0 < 5
+
+
+def test_http_pool_adapter_send():
+    """Verify the adapter passes its parameters on as keywords."""
+    sent = {}
+
+    class Adapter(requests.adapters.HTTPAdapter):
+        # Another parameter second
+        def send(self, request, cacheable_methods=None, **kwargs):
+            sent.update(kwargs, cacheable_methods=cacheable_methods)
+
+    class PooledAdapter(_PooledAdapter, Adapter):
+        pass
+    adapter = PooledAdapter(HTTPSessionPool(timeout=7))
+    adapter.send(None, stream=True, verify=False)
+    assert sent == {'stream': True, 'timeout': 7, 'verify': False,
+                    'cacheable_methods': None}
+
+
+def test_shared_pool(monkeypatch):
+    """Verify instances default to the process-wide pool."""
+    monkeypatch.setattr(http_session, '_shared_pool', None)
+    pool = shared_pool()
+    assert shared_pool() is pool
+    mic = ISO10383MIC(mic_cache='memory')
+    adapter = mic._cached_session().get_adapter('https://www.iso20022.org')
+    assert adapter.poolmanager is pool.pool_manager()
+    assert adapter.session_pool.timeout == (10, 60)
+    new_pool = configure_shared_pool(timeout=30, retries=5)
+    assert shared_pool() is new_pool
+    assert new_pool.retry().total == 5
+    assert ISO10383MIC(mic_cache='memory')._cached_session().get_adapter(
+        'http://').session_pool is new_pool
@@ -1,6 +1,12 @@
 #!/usr/bin/env python
 # -*- coding: utf-8; mode: Python; -*-
 import os
+import sys
+import subprocess
+import threading
+import asyncio
+import json
+import queue
 import logging
 import inspect
 import datetime
@@ -8,6 +14,12 @@ import pytest
 import pandas
 
 from marketdata.referencedata.iso10383mic import ISO10383MIC
+from marketdata.referencedata.mic_diff import diff_mic
+from marketdata.referencedata import mic_diff
+from marketdata.referencedata import mic_publication
+from marketdata.referencedata.mic_schema import parse_month_year
+from marketdata.referencedata.mic_xml import read_mic_xml
+from marketdata.referencedata.refresh_policy import FixedAgeRefreshPolicy
 
 FIXTURE_DIR = os.path.join(
     os.path.dirname(os.path.realpath(__file__)),
@@ -234,3 +246,779 @@ def test_iso10383mic_from_iso_site(datafiles, caplog):
     assert mic.from_cache is True
     assert mic.from_persisted is False
     #
+
+
+@ISO20022ORG_SAMPLES_DIR
+def test_iso10383mic_lookup(datafiles, caplog):
+    """Verify ISO10383MIC lookups.
+
+    Look up MICs, operating MICs and market segments
+    in the indexed sample data.
+    """
+
+    print('Function: "{}"'.format(inspect.currentframe().f_code.co_name))
+    tmp_path = str(datafiles)
+    d_path = os.path.join(tmp_path, 'www.iso20022.org')
+    mic = ISO10383MIC(mic_site='file://' + d_path + '/',
+                      mic_rel_url='market-identifier-codes.html',
+                      mic_cache_dir=os.path.join(tmp_path, 'cache_lookup'),
+                      mic_persistence_dir=os.path.join(tmp_path,
+                                                       'persistence_lookup'))
+    assert mic.index is None
+    with pytest.raises(RuntimeError):
+        mic.lookup('XCSE')
+    #
+    df = mic.download_mic()
+    assert len(mic.index) == len(df)
+    #
+    r = mic.lookup('EXMP')
+    assert r.mic == 'EXMP'
+    assert r.operating_mic == 'EXEU'
+    assert r.iso_country_code == 'GB'
+    assert r.os == 'S'
+    assert mic.lookup('NONE') is None
+    assert mic.operating_mic('EXMP') == 'EXEU'
+    assert mic.operating_mic('NONE') is None
+    #
+    segments = mic.segments('EXEU')
+    assert 'EXMP' in [s.mic for s in segments]
+    assert 'EXEU' not in [s.mic for s in segments]
+    assert all(s.operating_mic == 'EXEU' for s in segments)
+    assert mic.segments('NONE') == ()
+    assert all(r.iso_country_code == 'GB' for r in mic.index.country('GB'))
+    #
+    old_index = mic.index
+    mic.download_mic()
+    assert mic.index is not old_index
+
+
+@ISO20022ORG_SAMPLES_DIR
+def test_iso10383mic_compact(datafiles, caplog):
+    """Verify the compact, typed MIC registry.
+
+    Compare the compact registry with the plain string registry
+    parsed from the same sample data.
+    """
+
+    print('Function: "{}"'.format(inspect.currentframe().f_code.co_name))
+    tmp_path = str(datafiles)
+    d_path = os.path.join(tmp_path, 'www.iso20022.org')
+    kwargs = dict(mic_site='file://' + d_path + '/',
+                  mic_rel_url='market-identifier-codes.html',
+                  mic_cache_dir=os.path.join(tmp_path, 'cache_compact'),
+                  mic_persistence_dir=os.path.join(tmp_path,
+                                                   'persistence_compact'))
+    df = ISO10383MIC(**kwargs).download_mic()
+    mic = ISO10383MIC(mic_compact=True, **kwargs)
+    cdf = mic.download_mic()
+    #
+    assert list(cdf.columns) == list(df.columns)
+    assert len(cdf) == len(df)
+    assert isinstance(cdf['COUNTRY'].dtype, pandas.CategoricalDtype)
+    assert isinstance(cdf['O/S'].dtype, pandas.CategoricalDtype)
+    assert cdf['STATUS DATE'].dtype.kind == 'M'
+    assert cdf['CREATION DATE'].dtype.kind == 'M'
+    assert list(cdf['MIC']) == list(df['MIC'])
+    assert list(cdf['COUNTRY']) == list(df['COUNTRY'])
+    assert (cdf.memory_usage(deep=True).sum()
+            < df.memory_usage(deep=True).sum())
+    #
+    i = list(df['MIC']).index('MIBG')
+    assert df['STATUS DATE'].iloc[i] == 'JULY 2015'
+    assert cdf['STATUS DATE'].iloc[i] == pandas.Timestamp(2015, 7, 1)
+    assert mic.lookup('MIBG').creation_date == pandas.Timestamp(2015, 7, 1)
+
+
+def test_parse_month_year():
+    """Verify parsing of month-year registry dates."""
+    values = parse_month_year(['JULY 2015', 'BEFORE JUNE 2005', '',
+                               'JULY 2015', 'NOT A DATE'])
+    assert values.dtype.kind == 'M'
+    assert pandas.Timestamp(values[0]) == pandas.Timestamp(2015, 7, 1)
+    assert pandas.Timestamp(values[1]) == pandas.Timestamp(2005, 6, 1)
+    assert pandas.isna(values[2])
+    assert values[3] == values[0]
+    assert pandas.isna(values[4])
+
+
+@ISO20022ORG_SAMPLES_DIR
+def test_iso10383mic_from_snapshot(datafiles, caplog):
+    """Verify ISO10383MIC with a persisted snapshot.
+
+    Load the MIC registry from the binary snapshot
+    of the parsed sample data, without the csv file.
+    """
+
+    print('Function: "{}"'.format(inspect.currentframe().f_code.co_name))
+    pytest.importorskip('pyarrow')
+    tmp_path = str(datafiles)
+    d_path = os.path.join(tmp_path, 'www.iso20022.org')
+    persist_dir = os.path.join(tmp_path, 'persistence_snapshot')
+    kwargs = dict(mic_site='file://' + d_path + '/',
+                  mic_rel_url='market-identifier-codes.html',
+                  mic_cache_dir=os.path.join(tmp_path, 'cache_snapshot'),
+                  mic_persistence_dir=persist_dir)
+    mic = ISO10383MIC(**kwargs)
+    df = mic.download_mic()
+    assert mic.from_persisted is False
+    assert os.path.isfile(os.path.join(persist_dir, 'ISO10383_MIC.feather'))
+    #
+    # The snapshot replaces the csv file
+    os.remove(os.path.join(persist_dir, 'ISO10383_MIC.csv'))
+    mic2 = ISO10383MIC(**kwargs)
+    df2 = mic2.download_mic()
+    assert mic2.from_persisted is True
+    assert mic2.publication_time == mic.publication_time
+    assert mic2.implementation_time == mic.implementation_time
+    assert mic2.next_publication_time == mic.next_publication_time
+    assert df2.equals(df)
+    assert mic2.lookup('EXMP') == mic.lookup('EXMP')
+    #
+    # A snapshot of the compact registry keeps its types
+    mic3 = ISO10383MIC(mic_compact=True, **kwargs)
+    mic3.download_mic()
+    mic4 = ISO10383MIC(mic_compact=True, **kwargs)
+    df4 = mic4.download_mic()
+    assert mic4.from_persisted is True
+    assert isinstance(df4['COUNTRY'].dtype, pandas.CategoricalDtype)
+    assert df4['STATUS DATE'].dtype.kind == 'M'
+
+
+@ISO20022ORG_SAMPLES_DIR
+def test_iso10383mic_shared(datafiles, caplog):
+    """Verify the shared, memory-mapped MIC registry.
+
+    Publish the sample data to a shared file,
+    map it, and look up MICs in the mapped registry.
+    """
+
+    print('Function: "{}"'.format(inspect.currentframe().f_code.co_name))
+    pyarrow = pytest.importorskip('pyarrow')
+    tmp_path = str(datafiles)
+    d_path = os.path.join(tmp_path, 'www.iso20022.org')
+    persist_dir = os.path.join(tmp_path, 'persistence_shared')
+    kwargs = dict(mic_site='file://' + d_path + '/',
+                  mic_rel_url='market-identifier-codes.html',
+                  mic_cache_dir=os.path.join(tmp_path, 'cache_shared'),
+                  mic_persistence_dir=persist_dir)
+    mic = ISO10383MIC(**kwargs)
+    shared = mic.open_shared()
+    assert os.path.isfile(os.path.join(persist_dir, 'ISO10383_MIC.arrow'))
+    assert len(shared) == len(mic.mic)
+    assert shared.publication_time == mic.publication_time
+    #
+    # Mapped, not copied
+    allocated = pyarrow.total_allocated_bytes()
+    shared2 = ISO10383MIC(**kwargs).open_shared()
+    assert pyarrow.total_allocated_bytes() == allocated
+    assert shared2.lookup('EXMP') == mic.lookup('EXMP')
+    #
+    assert 'EXMP' in shared
+    assert 'NONE' not in shared
+    assert shared.lookup('NONE') is None
+    assert shared.operating_mic('EXMP') == 'EXEU'
+    assert (sorted(r.mic for r in shared.segments('EXEU'))
+            == sorted(r.mic for r in mic.segments('EXEU')))
+    assert (sorted(r.mic for r in shared.country('GB'))
+            == sorted(r.mic for r in mic.index.country('GB')))
+    assert list(shared.to_pandas()['MIC']) == list(mic.mic['MIC'])
+    #
+    # A new publication atomically replaces the shared file
+    assert shared.refresh() is False
+    mic_compact = ISO10383MIC(mic_compact=True, mic_shared=True, **kwargs)
+    mic_compact.download_mic()
+    assert shared.refresh() is True
+    assert shared.lookup('EXMP').mic == 'EXMP'
+    assert shared2.lookup('EXMP') == mic.lookup('EXMP')
+
+
+def test_iso10383mic_logging_level():
+    """Verify importing ISO10383MIC leaves logging levels alone."""
+    import marketdata.referencedata.iso10383mic as iso10383mic
+    assert iso10383mic.module_logger.level == logging.NOTSET
+    logger = iso10383mic.method_logger('ISO10383MIC', '_load_mic')
+    assert logger is logging.getLogger('ISO10383MIC._load_mic')
+    assert iso10383mic.method_logger('ISO10383MIC', '_load_mic') is logger
+
+
+HEAVY_MODULES = ('lxml', 'dateutil', 'requests', 'cachecontrol',
+                 'requests_testadapter', 'pandas', 'pyarrow')
+
+
+def imported_heavy_modules(code):
+    """Run `code` in a fresh interpreter, return heavy modules imported."""
+    code += ('\nimport sys\n'
+             'print(" ".join(m for m in {!r} if m in sys.modules))'.format(
+                 HEAVY_MODULES))
+    out = subprocess.run([sys.executable, '-c', code],
+                         check=True, stdout=subprocess.PIPE,
+                         universal_newlines=True,
+                         cwd=os.path.dirname(os.path.dirname(
+                             os.path.realpath(__file__))))
+    return set(out.stdout.split())
+
+
+def test_iso10383mic_lazy_imports():
+    """Verify importing ISO10383MIC imports no heavy dependencies."""
+    assert imported_heavy_modules(
+        'import marketdata.referencedata.iso10383mic') == set()
+    assert imported_heavy_modules(
+        'from marketdata.referencedata.iso10383mic import ISO10383MIC\n'
+        'ISO10383MIC(mic_snapshot=False)') == set()
+
+
+@ISO20022ORG_SAMPLES_DIR
+def test_iso10383mic_lazy_imports_from_snapshot(datafiles, caplog):
+    """Verify loading from a snapshot skips the download dependencies."""
+
+    print('Function: "{}"'.format(inspect.currentframe().f_code.co_name))
+    pytest.importorskip('pyarrow')
+    tmp_path = str(datafiles)
+    d_path = os.path.join(tmp_path, 'www.iso20022.org')
+    kwargs = dict(mic_site='file://' + d_path + '/',
+                  mic_rel_url='market-identifier-codes.html',
+                  mic_cache_dir=os.path.join(tmp_path, 'cache_lazy'),
+                  mic_persistence_dir=os.path.join(tmp_path,
+                                                   'persistence_lazy'))
+    ISO10383MIC(**kwargs).open_shared()
+    code = ('from marketdata.referencedata.iso10383mic import ISO10383MIC\n'
+            'mic = ISO10383MIC(**{!r})\n'.format(kwargs))
+    modules = imported_heavy_modules(
+        code + 'assert mic.download_mic() is not None')
+    assert not modules & {'lxml', 'requests', 'cachecontrol'}
+    modules = imported_heavy_modules(
+        code + 'assert mic.open_shared().lookup("EXMP") is not None')
+    assert not modules & {'lxml', 'requests', 'cachecontrol', 'pandas'}
+
+
+@ISO20022ORG_SAMPLES_DIR
+def test_iso10383mic_enrich(datafiles, caplog):
+    """Verify bulk validation and enrichment of MIC codes."""
+
+    print('Function: "{}"'.format(inspect.currentframe().f_code.co_name))
+    tmp_path = str(datafiles)
+    d_path = os.path.join(tmp_path, 'www.iso20022.org')
+    mic = ISO10383MIC(mic_site='file://' + d_path + '/',
+                      mic_rel_url='market-identifier-codes.html',
+                      mic_cache_dir=os.path.join(tmp_path, 'cache_enrich'),
+                      mic_persistence_dir=os.path.join(tmp_path,
+                                                       'persistence_enrich'))
+    mic.download_mic()
+    venues = pandas.Series(['EXMP', 'NONE', 'MIBG', 'EXMP'],
+                           index=[10, 11, 12, 13])
+    for mics in (venues, venues.astype('category'), list(venues)):
+        assert list(mic.validate(mics)) == [True, False, True, True]
+        df = mic.enrich(mics)
+        assert list(df.columns) == ['OPERATING MIC', 'COUNTRY', 'STATUS',
+                                    'O/S', 'VALID']
+        assert list(df['VALID']) == [True, False, True, True]
+        assert df['OPERATING MIC'].iloc[0] == 'EXEU'
+        assert pandas.isna(df['OPERATING MIC'].iloc[1])
+        assert df['COUNTRY'].iloc[2] == 'SPAIN'
+        assert df['O/S'].iloc[3] == 'S'
+    assert list(mic.enrich(venues).index) == [10, 11, 12, 13]
+    df = mic.enrich(venues, columns=['CITY'])
+    assert list(df['CITY'].iloc[[0, 2]]) == ['LONDON', 'MADRID']
+    #
+    # Compact registry, with categorical columns
+    mic = ISO10383MIC(mic_site='file://' + d_path + '/',
+                      mic_rel_url='market-identifier-codes.html',
+                      mic_cache_dir=os.path.join(tmp_path, 'cache_enrich'),
+                      mic_persistence_dir=os.path.join(
+                          tmp_path, 'persistence_enrich_compact'),
+                      mic_compact=True)
+    mic.download_mic()
+    assert isinstance(mic.mic['COUNTRY'].dtype, pandas.CategoricalDtype)
+    df = mic.enrich(['XLON', 'NONE', 'EXMP', 'MIBG'])
+    assert list(df['VALID']) == [True, False, True, True]
+    assert df['OPERATING MIC'].iloc[0] == 'XLON'
+    assert df['COUNTRY'].iloc[0] == 'UNITED KINGDOM'
+    assert pandas.isna(df['COUNTRY'].iloc[1])
+    assert df['OPERATING MIC'].iloc[2] == 'EXEU'
+    assert df['COUNTRY'].iloc[3] == 'SPAIN'
+    # As looked up, for every MIC of the registry
+    df = mic.enrich(mic.mic['MIC'])
+    for i in range(0, len(df), 97):
+        record = mic.lookup(mic.mic['MIC'].iloc[i])
+        assert (df['OPERATING MIC'].iloc[i], df['COUNTRY'].iloc[i],
+                df['STATUS'].iloc[i], df['O/S'].iloc[i]) \
+            == (record.operating_mic, record.country, record.status,
+                record.os)
+
+
+@ISO20022ORG_SAMPLES_DIR
+def test_iso10383mic_aload(datafiles, caplog):
+    """Verify asyncio loading, with concurrent callers sharing one load."""
+
+    print('Function: "{}"'.format(inspect.currentframe().f_code.co_name))
+    tmp_path = str(datafiles)
+    d_path = os.path.join(tmp_path, 'www.iso20022.org')
+    mic = ISO10383MIC(mic_site='file://' + d_path + '/',
+                      mic_rel_url='market-identifier-codes.html',
+                      mic_cache_dir=os.path.join(tmp_path, 'cache_aload'),
+                      mic_persistence_dir=os.path.join(tmp_path,
+                                                       'persistence_aload'))
+    calls = []
+    download_mic = mic.download_mic
+
+    def counting_download_mic():
+        calls.append(threading.current_thread())
+        return download_mic()
+
+    mic.download_mic = counting_download_mic
+
+    async def load_concurrently():
+        return await asyncio.gather(mic.aload(), mic.aload(), mic.aload())
+
+    dfs = asyncio.run(load_concurrently())
+    assert len(calls) == 1
+    assert calls[0] is not threading.main_thread()
+    assert all(df is dfs[0] for df in dfs)
+    assert isinstance(dfs[0], pandas.DataFrame)
+    assert mic.lookup('EXMP').operating_mic == 'EXEU'
+    #
+    # A completed load is not shared with later callers
+    asyncio.run(mic.aload())
+    assert len(calls) == 2
+    assert mic.from_persisted is True
+
+
+@ISO20022ORG_SAMPLES_DIR
+def test_iso10383mic_revalidation(datafiles, caplog):
+    """Verify refreshes skip fetching and parsing an unchanged csv file."""
+
+    print('Function: "{}"'.format(inspect.currentframe().f_code.co_name))
+    tmp_path = str(datafiles)
+    d_path = os.path.join(tmp_path, 'www.iso20022.org')
+    persist_dir = os.path.join(tmp_path, 'persistence_revalidation')
+    mic = ISO10383MIC(mic_site='file://' + d_path + '/',
+                      mic_rel_url='market-identifier-codes.html',
+                      mic_cache_dir=os.path.join(tmp_path,
+                                                 'cache_revalidation'),
+                      mic_persistence_dir=persist_dir,
+                      mic_snapshot=False,
+                      mic_refresh_policy=FixedAgeRefreshPolicy(
+                          max_age=datetime.timedelta(0)))
+    df = mic.download_mic()
+    assert mic.revalidation_counts == {'modified': 1}
+    fna_validators = os.path.join(persist_dir, 'ISO10383_MIC.csv.json')
+    with open(fna_validators) as fh:
+        validators = json.load(fh)
+    assert validators['etag']
+    assert validators['last_modified']
+    assert validators['sha1']
+    assert validators['publication_time'] == mic.publication_time.isoformat()
+    #
+    # Same publication, no fetch, no parse
+    assert mic.download_mic() is df
+    assert mic.from_persisted is False
+    assert mic.revalidation_counts['same_publication'] == 1
+    assert mic.revalidation_counts['parse_skipped'] == 1
+    #
+    # Conditional request
+    validators['publication_time'] = None
+    with open(fna_validators, 'w') as fh:
+        json.dump(validators, fh)
+    assert mic.download_mic() is df
+    assert mic.revalidation_counts['not_modified'] == 1
+    assert mic.revalidation_counts['parse_skipped'] == 2
+    #
+    # Fetched, but with unchanged content
+    validators['etag'] = '"stale"'
+    validators['last_modified'] = None
+    with open(fna_validators, 'w') as fh:
+        json.dump(validators, fh)
+    assert mic.download_mic() is df
+    assert mic.revalidation_counts['unchanged'] == 1
+    assert mic.revalidation_counts['parse_skipped'] == 3
+    assert mic.revalidation_counts['modified'] == 1
+    assert not [f for f in os.listdir(persist_dir) if f.endswith('.tmp')]
+    #
+    # A new instance parses the persisted csv file once
+    mic2 = ISO10383MIC(mic_site='file://' + d_path + '/',
+                       mic_rel_url='market-identifier-codes.html',
+                       mic_cache_dir=os.path.join(tmp_path,
+                                                  'cache_revalidation'),
+                       mic_persistence_dir=persist_dir,
+                       mic_snapshot=False)
+    assert mic2.download_mic().equals(df)
+    assert mic2.revalidation_counts['parse_skipped'] == 0
+
+
+@ISO20022ORG_SAMPLES_DIR
+def test_local_file_adapter_stream(datafiles):
+    """Verify file responses are streamed from the open file."""
+
+    print('Function: "{}"'.format(inspect.currentframe().f_code.co_name))
+    import requests
+    from marketdata.referencedata.local_file_adapter import LocalFileAdapter
+    fna = os.path.join(str(datafiles), 'www.iso20022.org',
+                       'ISO10383_MIC.pdf')
+    with open(fna, 'rb') as fh:
+        content = fh.read()
+    sess = requests.session()
+    sess.mount('file://', LocalFileAdapter())
+    resp = sess.get('file://' + fna)
+    assert resp.content == content
+    assert resp.raw.closed
+    assert resp.headers['Content-Length'] == str(len(content))
+    # Read as iterated, and closed at the end
+    resp = sess.get('file://' + fna, stream=True)
+    assert not resp.raw.closed
+    chunks = list(resp.iter_content(2**16))
+    assert max(len(c) for c in chunks) == 2**16
+    assert b''.join(chunks) == content
+    assert resp.raw.closed
+    # Or when closed
+    with sess.get('file://' + fna, stream=True) as resp:
+        assert resp.raw.read(4) == b'%PDF'
+    assert resp.raw.closed
+    resp = sess.get('file://' + fna, stream=True,
+                    headers={'If-None-Match': resp.headers['ETag']})
+    assert resp.status_code == 304
+    assert resp.content == b''
+
+
+SINGLE_FLIGHT_CODE = """
+from marketdata.referencedata.iso10383mic import ISO10383MIC
+mic = ISO10383MIC(mic_site={site!r},
+                  mic_rel_url='market-identifier-codes.html',
+                  mic_cache_dir={cache_dir!r},
+                  mic_persistence_dir={persist_dir!r})
+df = mic.download_mic()
+print(mic.from_persisted, len(df))
+"""
+
+
+@ISO20022ORG_SAMPLES_DIR
+def test_iso10383mic_single_flight(datafiles):
+    """Verify concurrent processes fetch the MIC registry once."""
+
+    print('Function: "{}"'.format(inspect.currentframe().f_code.co_name))
+    tmp_path = str(datafiles)
+    d_path = os.path.join(tmp_path, 'www.iso20022.org')
+    persist_dir = os.path.join(tmp_path, 'persistence_single_flight')
+    code = SINGLE_FLIGHT_CODE.format(
+        site='file://' + d_path + '/',
+        cache_dir=os.path.join(tmp_path, 'cache_single_flight'),
+        persist_dir=persist_dir)
+    procs = [subprocess.Popen([sys.executable, '-c', code],
+                              stdout=subprocess.PIPE,
+                              universal_newlines=True,
+                              cwd=os.path.dirname(os.path.dirname(
+                                  os.path.realpath(__file__))))
+             for _ in range(4)]
+    results = [p.communicate()[0].split() for p in procs]
+    assert all(p.returncode == 0 for p in procs)
+    # One process fetched, the others waited and reused its result
+    assert sorted(r[0] for r in results) == ['False', 'True', 'True', 'True']
+    assert len({r[1] for r in results}) == 1
+    assert not [f for f in os.listdir(persist_dir) if f.endswith('.tmp')]
+    #
+    # Waiting longer than the timeout
+    from filelock import FileLock
+    mic = ISO10383MIC(mic_site='file://' + d_path + '/',
+                      mic_rel_url='market-identifier-codes.html',
+                      mic_cache_dir=os.path.join(tmp_path,
+                                                 'cache_single_flight'),
+                      mic_persistence_dir=persist_dir,
+                      mic_lock_timeout=0.1)
+    with FileLock(os.path.join(persist_dir, 'ISO10383_MIC.lock')):
+        with pytest.raises(TimeoutError):
+            mic.download_mic()
+    assert mic.mic is None
+
+
+@ISO20022ORG_SAMPLES_DIR
+def test_iso10383mic_stats(datafiles):
+    """Verify the per-phase timings and counters of loads."""
+
+    print('Function: "{}"'.format(inspect.currentframe().f_code.co_name))
+    tmp_path = str(datafiles)
+    d_path = os.path.join(tmp_path, 'www.iso20022.org')
+    kwargs = dict(mic_site='file://' + d_path + '/',
+                  mic_rel_url='market-identifier-codes.html',
+                  mic_cache_dir=os.path.join(tmp_path, 'cache_stats'),
+                  mic_persistence_dir=os.path.join(tmp_path,
+                                                   'persistence_stats'),
+                  mic_compact=True)
+    mic = ISO10383MIC(**kwargs)
+    assert mic.stats is None
+    received = []
+    mic.add_stats_hook(received.append)
+    mic.add_stats_hook(lambda stats: 1 / 0)
+    mic.download_mic()
+    stats = mic.stats
+    assert received == [stats]
+    # Cold load
+    assert list(stats.phases) == ['page_fetch', 'page_parse',
+                                  'snapshot_read', 'data_fetch',
+                                  'data_parse', 'frame_build',
+                                  'index_build', 'snapshot_write']
+    assert all(s.seconds >= 0 for s in stats.phases.values())
+    assert stats.phases['page_fetch'].nbytes == os.path.getsize(
+        os.path.join(d_path, 'market-identifier-codes.html'))
+    assert stats.phases['data_fetch'].nbytes > 0
+    assert (stats.phases['data_parse'].nbytes
+            == stats.phases['data_fetch'].nbytes)
+    assert stats.phases['snapshot_read'].nbytes is None
+    assert stats.phases['index_build'].nbytes is None
+    assert stats.counters == {'cache_miss': 1, 'modified': 1}
+    assert stats.seconds >= sum(s.seconds for s in stats.phases.values())
+    assert stats.from_persisted is False
+    metrics = stats.as_dict()
+    assert metrics['data_fetch.bytes'] == stats.phases['data_fetch'].nbytes
+    assert 'index_build.bytes' not in metrics
+    assert metrics['cache_miss'] == 1
+    #
+    # Warm load, from the persisted page and snapshot
+    mic2 = ISO10383MIC(**kwargs)
+    mic2.download_mic()
+    assert list(mic2.stats.phases) == ['page_read', 'snapshot_read',
+                                       'index_build']
+    assert mic2.stats.counters == {'persisted': 1, 'snapshot_hit': 1}
+    assert mic2.stats.from_persisted is True
+    #
+    mic.remove_stats_hook(received.append)
+    mic.download_mic()
+    assert len(received) == 1
+
+
+def test_diff_mic():
+    """Verify the classification of changes between registry versions."""
+    columns = ['MIC', 'OPERATING MIC', 'NAME-INSTITUTION DESCRIPTION',
+               'STATUS']
+    old = pandas.DataFrame([['XAAA', 'XAAA', 'A', 'ACTIVE'],
+                            ['XBBB', 'XAAA', 'B', 'ACTIVE'],
+                            ['XCCC', 'XCCC', 'C', 'ACTIVE'],
+                            ['XDDD', 'XDDD', 'D', 'ACTIVE']],
+                           columns=columns)
+    new = pandas.DataFrame([['XEEE', 'XEEE', 'E', 'ACTIVE'],
+                            ['XDDD', 'XDDD', 'D', 'ACTIVE'],
+                            ['XCCC', 'XCCC', 'C', 'DELETED'],
+                            ['XBBB', 'XAAA', 'B2', 'MODIFIED']],
+                           columns=columns)
+    changes = diff_mic(old, new)
+    assert [c.mic for c in changes.added] == ['XEEE']
+    assert changes.added[0].old is None
+    assert changes.added[0].new.name == 'E'
+    assert [c.mic for c in changes.modified] == ['XBBB']
+    assert changes.modified[0].fields == ('NAME-INSTITUTION DESCRIPTION',
+                                          'STATUS')
+    assert changes.modified[0].old.name == 'B'
+    assert changes.modified[0].new.name == 'B2'
+    assert [c.mic for c in changes.deactivated] == ['XCCC']
+    assert changes.deactivated[0].fields == ('STATUS',)
+    assert [c.mic for c in changes.removed] == ['XAAA']
+    assert changes.removed[0].new is None
+    assert len(changes) == 4
+    assert changes.mics == {'XAAA', 'XBBB', 'XCCC', 'XEEE'}
+    assert not diff_mic(old, old.iloc[::-1])
+
+
+@ISO20022ORG_SAMPLES_DIR
+def test_iso10383mic_subscribe(datafiles, caplog):
+    """Verify subscribers receive the changes of a new registry version."""
+
+    print('Function: "{}"'.format(inspect.currentframe().f_code.co_name))
+    tmp_path = str(datafiles)
+    d_path = os.path.join(tmp_path, 'www.iso20022.org')
+    persist_dir = os.path.join(tmp_path, 'persistence_subscribe')
+    mic = ISO10383MIC(mic_site='file://' + d_path + '/',
+                      mic_rel_url='market-identifier-codes.html',
+                      mic_cache_dir=os.path.join(tmp_path, 'cache_subscribe'),
+                      mic_persistence_dir=persist_dir,
+                      mic_snapshot=False,
+                      mic_refresh_policy=FixedAgeRefreshPolicy(
+                          max_age=datetime.timedelta(0)))
+    received = []
+    q = queue.Queue()
+    mic.subscribe(received.append)
+    mic.subscribe(q)
+    df = mic.download_mic()
+    assert mic.changes is None
+    assert received == []
+    #
+    # Publish a changed csv file
+    changed = df.copy()
+    changed.loc[changed['MIC'] == 'XAMS', 'STATUS'] = 'DELETED'
+    changed.loc[changed['MIC'] == 'XNYS', 'CITY'] = 'BROOKLYN'
+    changed = changed[changed['MIC'] != 'MIBG']
+    changed.to_csv(os.path.join(d_path, 'ISO10383_MIC.csv'),
+                   index=False, encoding='windows-1252', quoting=1)
+    os.remove(os.path.join(persist_dir, 'ISO10383_MIC.csv.json'))
+    mic.download_mic()
+    #
+    assert len(received) == 1
+    assert q.get_nowait() is received[0]
+    changes = received[0]
+    assert changes is mic.changes
+    assert changes.added == ()
+    assert [c.mic for c in changes.deactivated] == ['XAMS']
+    assert [(c.mic, c.fields) for c in changes.modified] == [
+        ('XNYS', ('CITY',))]
+    assert [c.mic for c in changes.removed] == ['MIBG']
+    #
+    # No new version, no changes
+    mic.unsubscribe(q)
+    mic.download_mic()
+    assert len(received) == 1
+    assert q.empty()
+
+
+@ISO20022ORG_SAMPLES_DIR
+def test_iso10383mic_subscribe_same_file(datafiles, monkeypatch):
+    """Verify a reload of the same file is not diffed."""
+
+    print('Function: "{}"'.format(inspect.currentframe().f_code.co_name))
+    tmp_path = str(datafiles)
+    d_path = os.path.join(tmp_path, 'www.iso20022.org')
+    kwargs = dict(mic_site='file://' + d_path + '/',
+                  mic_rel_url='market-identifier-codes.html',
+                  mic_cache_dir=os.path.join(tmp_path, 'cache_same_file'),
+                  mic_persistence_dir=os.path.join(tmp_path,
+                                                   'persistence_same_file'))
+    ISO10383MIC(**kwargs).download_mic()
+    diffs = []
+
+    def counting_diff_mic(*args, **kwargs):
+        diffs.append(args)
+        return diff_mic(*args, **kwargs)
+    monkeypatch.setattr(mic_diff, 'diff_mic', counting_diff_mic)
+    # Previous version and reload, both from the snapshot of the same file
+    received = []
+    mic = ISO10383MIC(**kwargs)
+    mic.subscribe(received.append)
+    mic.download_mic()
+    assert diffs == []
+    assert received == []
+    assert mic.changes is None
+
+
+@ISO20022ORG_SAMPLES_DIR
+def test_read_mic_xml(datafiles, tmp_path):
+    """Verify the xml file holds the same registry as the csv file."""
+    d_path = os.path.join(str(datafiles), 'www.iso20022.org')
+    fna_xml = os.path.join(d_path, 'ISO10383_MIC.xml')
+    df_csv = pandas.read_csv(os.path.join(d_path, 'ISO10383_MIC.csv'),
+                             encoding='windows-1252', dtype=str,
+                             keep_default_na=False)
+    df = read_mic_xml(fna_xml)
+    assert list(df.columns) == list(df_csv.columns)
+    assert len(df) == len(df_csv)
+    # Only names the windows-1252 csv file cannot represent differ
+    differs = (df != df_csv).any(axis=1)
+    assert df.loc[differs, 'MIC'].tolist() == ['CESI', 'CELP', 'CSOB']
+    assert df.loc[differs, 'NAME-INSTITUTION DESCRIPTION'].str.startswith(
+        'ČESKOSLOVENSK').all()
+    #
+    chunks = list(read_mic_xml(fna_xml, chunksize=500))
+    assert [len(c) for c in chunks] == [500, 500, 500, len(df) - 1500]
+    assert pandas.concat(chunks, ignore_index=True).equals(df)
+    #
+    # Empty fields may be left out
+    fna = str(tmp_path / 'sparse.xml')
+    with open(fna, 'w', encoding='utf-8') as fh:
+        fh.write('<?xml version="1.0" encoding="UTF-8"?>\n<dataroot>'
+                 '<MICs_x0020_List_x0020_by_x0020_Country>'
+                 '<MIC>XAAA</MIC>'
+                 '</MICs_x0020_List_x0020_by_x0020_Country>'
+                 '<MICs_x0020_List_x0020_by_x0020_Country>'
+                 '<MIC>XBBB</MIC><O_x002F_S>O</O_x002F_S><CITY/>'
+                 '</MICs_x0020_List_x0020_by_x0020_Country>'
+                 '</dataroot>')
+    df = read_mic_xml(fna)
+    assert df.to_dict('list') == {'MIC': ['XAAA', 'XBBB'],
+                                  'O/S': ['', 'O'],
+                                  'CITY': ['', '']}
+
+
+@ISO20022ORG_SAMPLES_DIR
+def test_iso10383mic_xml(datafiles, caplog):
+    """Verify downloading the registry in xml format."""
+
+    print('Function: "{}"'.format(inspect.currentframe().f_code.co_name))
+    tmp_path = str(datafiles)
+    d_path = os.path.join(tmp_path, 'www.iso20022.org')
+    persist_dir = os.path.join(tmp_path, 'persistence')
+    with pytest.raises(ValueError):
+        ISO10383MIC(mic_format='xls')
+    csv_mic = ISO10383MIC(mic_site='file://' + d_path + '/',
+                          mic_rel_url='market-identifier-codes.html',
+                          mic_cache_dir=os.path.join(tmp_path, 'cache'),
+                          mic_persistence_dir=persist_dir)
+    df_csv = csv_mic.download_mic()
+    mic = ISO10383MIC(mic_site='file://' + d_path + '/',
+                      mic_rel_url='market-identifier-codes.html',
+                      mic_cache_dir=os.path.join(tmp_path, 'cache'),
+                      mic_persistence_dir=persist_dir,
+                      mic_format='xml')
+    df = mic.download_mic()
+    assert os.path.isfile(os.path.join(persist_dir, 'ISO10383_MIC.xml'))
+    # Not served from the snapshot of the csv file
+    assert not df.equals(df_csv)
+    assert df['MIC'].tolist() == df_csv['MIC'].tolist()
+    assert mic.lookup('CSOB').name.startswith('ČESKOSLOVENSK')
+    assert mic.publication_time == csv_mic.publication_time
+    #
+    # And the snapshot of the xml file is used by the next instance
+    mic = ISO10383MIC(mic_site='file://' + d_path + '/',
+                      mic_rel_url='market-identifier-codes.html',
+                      mic_cache_dir=os.path.join(tmp_path, 'cache'),
+                      mic_persistence_dir=persist_dir,
+                      mic_format='xml')
+    assert mic.download_mic().equals(df)
+
+
+@ISO20022ORG_SAMPLES_DIR
+def test_extract_publication(datafiles, caplog, monkeypatch):
+    """Verify publication metadata extraction, caching and fallback."""
+
+    print('Function: "{}"'.format(inspect.currentframe().f_code.co_name))
+    tmp_path = str(datafiles)
+    d_path = os.path.join(tmp_path, 'www.iso20022.org')
+    fna_page = os.path.join(d_path, 'market-identifier-codes.html')
+    with open(fna_page, 'rb') as fh:
+        content = fh.read()
+    meta = mic_publication.extract_publication(content)
+    assert meta == ISO10383MIC()._parse_publication_page(content)
+    assert meta['csv_url'] == 'ISO10383_MIC.csv'
+    assert meta['xml_url'] == 'ISO10383_MIC.xml'
+    assert meta['publication_time'] == datetime.datetime(
+        2020, 7, 13, tzinfo=datetime.timezone.utc)
+    #
+    # The persisted page is never parsed again
+    persist_dir = os.path.join(tmp_path, 'persistence')
+
+    def new_mic():
+        return ISO10383MIC(mic_site='file://' + d_path + '/',
+                           mic_rel_url='market-identifier-codes.html',
+                           mic_cache_dir=os.path.join(tmp_path, 'cache'),
+                           mic_persistence_dir=persist_dir,
+                           mic_snapshot=False)
+    df = new_mic().download_mic()
+    fna_json = os.path.join(persist_dir, 'market-identifier-codes.html.json')
+    assert os.path.isfile(fna_json)
+
+    def fail(*args):
+        raise AssertionError('publication page parsed')
+    monkeypatch.setattr(mic_publication, 'extract_publication', fail)
+    monkeypatch.setattr(ISO10383MIC, '_parse_publication_page', fail)
+    mic = new_mic()
+    assert mic.download_mic().equals(df)
+    assert mic.from_persisted
+    assert mic.publication_time == meta['publication_time']
+    monkeypatch.undo()
+    #
+    # Fall back to XPath for an unknown layout
+    content = content.replace(b'<th>Publication date</th>',
+                              b'<th>Published</th>')
+    assert mic_publication.extract_publication(content) is None
+    with open(fna_page, 'wb') as fh:
+        fh.write(content)
+    os.remove(os.path.join(persist_dir, 'market-identifier-codes.html'))
+    caplog.set_level(logging.WARNING)
+    mic = new_mic()
+    assert mic.download_mic().equals(df)
+    assert mic.publication_time == meta['publication_time']
+    assert 'fall back to XPath' in caplog.text
@@ -0,0 +1,333 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; mode: Python; -*-
+import os
+import time
+import inspect
+import threading
+import email.utils
+import http.server
+import pytest
+
+from marketdata.referencedata.iso10383mic import ISO10383MIC
+from marketdata.referencedata.mic_cache import (LRUCache, SQLiteCache,
+                                                make_cache)
+
+FIXTURE_DIR = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)),
+    'data',
+)
+
+ISO20022ORG_SAMPLES_DIR = pytest.mark.datafiles(
+    os.path.join(FIXTURE_DIR, 'iso10383mic', 'www.iso20022.org'),
+    keep_top_dir=True,
+)
+
+
+def test_lru_cache():
+    """Verify the LRU cache bounds, expiry and statistics."""
+    cache = LRUCache(max_entries=3, max_bytes=10)
+    assert cache.get('a') is None
+    cache.set('a', b'aaaa')
+    cache.set('b', b'bbbb')
+    assert cache.get('a') == b'aaaa'
+    # Over max_bytes, evicts the least recently used
+    cache.set('c', b'cccc')
+    assert cache.get('b') is None
+    assert cache.get('a') == b'aaaa'
+    assert cache.nbytes == 8
+    cache.set('d', b'd')
+    cache.set('e', b'e')
+    assert len(cache) == 3
+    assert cache.get('c') is None
+    # Larger than the cache
+    cache.set('f', b'f' * 11)
+    assert cache.get('f') is None
+    assert cache.stats.evictions == 3
+    assert cache.stats.hits == 2
+    assert cache.stats.misses == 4
+    assert cache.stats.hit_rate == pytest.approx(2 / 6)
+    # Expiry set by CacheControl
+    cache.set('g', b'g', expires=0)
+    assert cache.get('g') is None
+    assert cache.stats.expirations == 1
+    cache.delete('a')
+    assert cache.get('a') is None
+    assert cache.stats.as_dict()['sets'] == 6
+    #
+    cache = LRUCache(max_age=0.05)
+    cache.set('a', b'a', expires=3600)
+    assert cache.get('a') == b'a'
+    time.sleep(0.1)
+    assert cache.get('a') is None
+    assert len(cache) == 0
+
+
+def test_sqlite_cache(tmp_path):
+    """Verify the SQLite cache bounds, expiry and persistence."""
+    fna = str(tmp_path / 'cache' / 'http.sqlite')
+    cache = SQLiteCache(fna, max_bytes=10)
+    assert cache.get('a') is None
+    cache.set('a', b'aaaa')
+    cache.set('b', b'bbbb')
+    assert cache.get('a') == b'aaaa'
+    cache.set('c', b'cccc')
+    assert cache.get('b') is None
+    assert cache.get('a') == b'aaaa'
+    assert cache.nbytes == 8
+    cache.set('d', b'd' * 11)
+    assert cache.get('d') is None
+    cache.set('e', b'e', expires=0)
+    assert cache.get('e') is None
+    assert cache.stats.as_dict() == {
+        'hits': 2, 'misses': 4, 'sets': 4, 'evictions': 2,
+        'expirations': 1, 'hit_rate': pytest.approx(1 / 3)}
+    cache.close()
+    # A single file, shared by the instances opening it
+    assert os.listdir(os.path.dirname(fna))[0].startswith('http.sqlite')
+    cache = SQLiteCache(fna, max_bytes=10)
+    assert len(cache) == 2
+    assert cache.get('c') == b'cccc'
+    cache.delete('c')
+    assert cache.get('c') is None
+    cache.close()
+
+
+def test_make_cache(tmp_path):
+    """Verify the selection of cache backends."""
+    assert isinstance(make_cache('memory', str(tmp_path)), LRUCache)
+    cache = make_cache('sqlite', str(tmp_path))
+    assert isinstance(cache, SQLiteCache)
+    cache.close()
+    lru = LRUCache()
+    assert make_cache(lru, str(tmp_path)) is lru
+    with pytest.raises(ValueError):
+        make_cache('redis', str(tmp_path))
+    with pytest.raises(ValueError):
+        ISO10383MIC(mic_cache='redis')
+
+
+class _CachingHandler(http.server.SimpleHTTPRequestHandler):
+
+    def end_headers(self):
+        self.send_header('Cache-Control', 'public, max-age=86400')
+        self.send_header('Expires', email.utils.formatdate(
+            time.time() + 86400, usegmt=True))
+        super().end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class _FlakyHandler(_CachingHandler):
+    # Names of the files answered 404 Not Found, without caching headers
+    missing = set()
+    # Paths of the requests received
+    paths = []
+
+    def do_GET(self):
+        self.paths.append(self.path)
+        if os.path.basename(self.path) not in self.missing:
+            return super().do_GET()
+        body = b'<!DOCTYPE HTML>\n<html><body>Not Found</body></html>\n'
+        self.send_response(404)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        http.server.BaseHTTPRequestHandler.end_headers(self)
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def http_site(datafiles):
+    d_path = os.path.join(str(datafiles), 'www.iso20022.org')
+
+    def handler(*args, **kwargs):
+        return _FlakyHandler(*args, directory=d_path, **kwargs)
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield 'http://127.0.0.1:{}/'.format(server.server_port)
+    server.shutdown()
+    server.server_close()
+    _FlakyHandler.missing.clear()
+    _FlakyHandler.paths.clear()
+
+
+@ISO20022ORG_SAMPLES_DIR
+@pytest.mark.parametrize('backend', ['memory', 'sqlite'])
+def test_iso10383mic_cache_backend(datafiles, http_site, backend):
+    """Verify ISO10383MIC fetches through the selected cache backend."""
+
+    print('Function: "{}"'.format(inspect.currentframe().f_code.co_name))
+    tmp_path = str(datafiles)
+    cache_dir = os.path.join(tmp_path, 'cache_' + backend)
+    mic = ISO10383MIC(mic_site=http_site,
+                      mic_rel_url='market-identifier-codes.html',
+                      mic_cache_dir=cache_dir,
+                      mic_persistence_dir=os.path.join(tmp_path,
+                                                       'persist_' + backend),
+                      mic_snapshot=False,
+                      mic_cache=backend)
+    assert mic.http_cache is None
+    df = mic.download_mic()
+    cache = mic.http_cache
+    # The page only, the data file is persisted
+    assert cache.stats.sets == 1
+    assert cache.stats.hits == 0
+    assert mic.from_cache is False
+    #
+    # Same instance, cache and session, with empty persistence
+    mic._mic_persistence_dir = os.path.join(tmp_path,
+                                            'persist_2_' + backend)
+    assert mic.download_mic().equals(df)
+    assert mic.http_cache is cache
+    assert mic.from_cache is True
+    assert cache.stats.hits == 1
+    assert cache.stats.sets == 1
+    assert 0 < cache.stats.hit_rate < 1
+    if backend == 'sqlite':
+        # Database, and write-ahead log files
+        assert all(f.startswith('ISO10383MIC.sqlite')
+                   for f in os.listdir(cache_dir))
+
+
+@ISO20022ORG_SAMPLES_DIR
+def test_iso10383mic_data_fetch_error(datafiles, http_site):
+    """Verify an error response is never persisted as the data file."""
+
+    print('Function: "{}"'.format(inspect.currentframe().f_code.co_name))
+    import requests
+    tmp_path = str(datafiles)
+    persist_dir = os.path.join(tmp_path, 'persist_error')
+    kwargs = dict(mic_site=http_site,
+                  mic_rel_url='market-identifier-codes.html',
+                  mic_cache_dir=os.path.join(tmp_path, 'cache_error'),
+                  mic_persistence_dir=persist_dir)
+    _FlakyHandler.missing.add('ISO10383_MIC.csv')
+    with pytest.raises(requests.HTTPError):
+        ISO10383MIC(**kwargs).download_mic()
+    # Neither the data file, its validators, nor a snapshot
+    assert not [f for f in os.listdir(persist_dir)
+                if f.startswith('ISO10383_MIC.')
+                and not f.endswith('.lock')]
+    # Once recovered, a new instance, sharing the HTTP cache, loads it
+    _FlakyHandler.missing.clear()
+    mic = ISO10383MIC(**kwargs)
+    df = mic.download_mic()
+    assert len(df) > 1000
+    assert 'MIC' in df.columns
+    assert mic.lookup('XLON').country == 'UNITED KINGDOM'
+
+
+@ISO20022ORG_SAMPLES_DIR
+def test_iso10383mic_refresh_bypasses_cache(datafiles, http_site):
+    """Verify a refresh due by the policy polls the site, not the cache."""
+
+    print('Function: "{}"'.format(inspect.currentframe().f_code.co_name))
+    tmp_path = str(datafiles)
+    persist_dir = os.path.join(tmp_path, 'persist_poll')
+    kwargs = dict(mic_site=http_site,
+                  mic_rel_url='market-identifier-codes.html',
+                  mic_cache_dir=os.path.join(tmp_path, 'cache_poll'),
+                  mic_persistence_dir=persist_dir,
+                  mic_snapshot=False)
+    df = ISO10383MIC(**kwargs).download_mic()
+    page = '/market-identifier-codes.html'
+    assert _FlakyHandler.paths.count(page) == 1
+    # Not due: the persisted page
+    mic = ISO10383MIC(**kwargs)
+    assert mic.download_mic().equals(df)
+    assert mic.from_persisted is True
+    assert _FlakyHandler.paths.count(page) == 1
+    # Overdue publication, polled again 6 hours after the fetch,
+    # within the day the heuristic caches the page for
+    fna_pub = os.path.join(persist_dir, 'market-identifier-codes.html')
+    mtime = time.time() - 7 * 3600
+    os.utime(fna_pub, (mtime, mtime))
+    mic = ISO10383MIC(**kwargs)
+    assert mic.download_mic().equals(df)
+    assert mic.from_persisted is False
+    assert _FlakyHandler.paths.count(page) == 2
+
+
+@ISO20022ORG_SAMPLES_DIR
+def test_iso10383mic_new_publication(datafiles, http_site):
+    """Verify the data file of a new publication is fetched from the site."""
+
+    print('Function: "{}"'.format(inspect.currentframe().f_code.co_name))
+    tmp_path = str(datafiles)
+    d_path = os.path.join(tmp_path, 'www.iso20022.org')
+    persist_dir = os.path.join(tmp_path, 'persist_new')
+    kwargs = dict(mic_site=http_site,
+                  mic_rel_url='market-identifier-codes.html',
+                  mic_cache_dir=os.path.join(tmp_path, 'cache_new'),
+                  mic_persistence_dir=persist_dir,
+                  mic_snapshot=False)
+    assert len(ISO10383MIC(**kwargs).download_mic()) == 1975
+    # Next publication, with 100 MICs less, at the same URLs
+    fna_page = os.path.join(d_path, 'market-identifier-codes.html')
+    with open(fna_page, 'rb') as fh:
+        page = fh.read()
+    with open(fna_page, 'wb') as fh:
+        # Dates separated by non-breaking spaces
+        fh.write(page.replace(b'10\xc2\xa0August', b'14\xc2\xa0September')
+                 .replace(b'27\xc2\xa0July', b'24\xc2\xa0August')
+                 .replace(b'13\xc2\xa0July', b'10\xc2\xa0August'))
+    fna_csv = os.path.join(d_path, 'ISO10383_MIC.csv')
+    with open(fna_csv, 'rb') as fh:
+        lines = fh.readlines()
+    with open(fna_csv, 'wb') as fh:
+        fh.writelines(lines[:-100])
+    # Modified after the Last-Modified of the former files
+    mtime = time.time() + 60
+    for fna in (fna_page, fna_csv):
+        os.utime(fna, (mtime, mtime))
+    # Polled after the publication is due
+    fna_pub = os.path.join(persist_dir, 'market-identifier-codes.html')
+    mtime = time.time() - 7 * 3600
+    os.utime(fna_pub, (mtime, mtime))
+    mic = ISO10383MIC(**kwargs)
+    assert len(mic.download_mic()) == 1875
+    assert mic.publication_time.isoformat() == '2020-08-10T00:00:00+00:00'
+    assert _FlakyHandler.paths.count('/ISO10383_MIC.csv') == 2
+    assert mic.revalidation_counts['modified'] == 1
+    # Later instances load the data file of the new publication
+    mic = ISO10383MIC(**kwargs)
+    assert len(mic.download_mic()) == 1875
+    assert mic.from_persisted is True
+
+
+@ISO20022ORG_SAMPLES_DIR
+def test_iso10383mic_page_fetch_error(datafiles, http_site):
+    """Verify an error response is never persisted as the page."""
+
+    print('Function: "{}"'.format(inspect.currentframe().f_code.co_name))
+    import requests
+    tmp_path = str(datafiles)
+    persist_dir = os.path.join(tmp_path, 'persist_page_error')
+    kwargs = dict(mic_site=http_site,
+                  mic_rel_url='market-identifier-codes.html',
+                  mic_cache_dir=os.path.join(tmp_path, 'cache_page_error'),
+                  mic_persistence_dir=persist_dir,
+                  mic_snapshot=False)
+    df = ISO10383MIC(**kwargs).download_mic()
+    fna_pub = os.path.join(persist_dir, 'market-identifier-codes.html')
+    with open(fna_pub, 'rb') as fh:
+        page = fh.read()
+    # Polled when due, answered 404 Not Found
+    mtime = time.time() - 7 * 3600
+    os.utime(fna_pub, (mtime, mtime))
+    _FlakyHandler.missing.add('market-identifier-codes.html')
+    with pytest.raises(requests.HTTPError):
+        ISO10383MIC(**kwargs).download_mic()
+    with open(fna_pub, 'rb') as fh:
+        assert fh.read() == page
+    # An unparseable persisted page, e.g. an error page, is refreshed
+    with open(fna_pub, 'wb') as fh:
+        fh.write(b'<html><body>Not Found</body></html>')
+    with pytest.raises(requests.HTTPError):
+        ISO10383MIC(**kwargs).download_mic()
+    _FlakyHandler.missing.clear()
+    mic = ISO10383MIC(**kwargs)
+    assert mic.download_mic().equals(df)
+    assert mic.from_persisted is False
+    with open(fna_pub, 'rb') as fh:
+        assert fh.read() == page
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; mode: Python; -*-
+import os
+import inspect
+import datetime
+import pytest
+import pandas
+
+from marketdata.referencedata.iso10383mic import ISO10383MIC
+from marketdata.referencedata.mic_history import MICHistory
+
+FIXTURE_DIR = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)),
+    'data',
+)
+
+ISO20022ORG_SAMPLES_DIR = pytest.mark.datafiles(
+    os.path.join(FIXTURE_DIR, 'iso10383mic', 'www.iso20022.org'),
+    keep_top_dir=True,
+)
+
+UTC = datetime.timezone.utc
+COLUMNS = ['MIC', 'OPERATING MIC', 'COUNTRY', 'STATUS', 'O/S']
+V1 = pandas.DataFrame([['XAAA', 'XAAA', 'FRANCE', 'ACTIVE', 'O'],
+                       ['XBBB', 'XAAA', 'FRANCE', 'ACTIVE', 'S']],
+                      columns=COLUMNS)
+V2 = pandas.DataFrame([['XAAA', 'XAAA', 'FRANCE', 'ACTIVE', 'O'],
+                       ['XBBB', 'XAAA', 'FRANCE', 'DELETED', 'S'],
+                       ['XCCC', 'XCCC', 'GERMANY', 'ACTIVE', 'O']],
+                      columns=COLUMNS)
+PUB1 = datetime.datetime(2020, 1, 10, tzinfo=UTC)
+IMP1 = datetime.datetime(2020, 1, 15, tzinfo=UTC)
+PUB2 = datetime.datetime(2020, 2, 10, tzinfo=UTC)
+IMP2 = datetime.datetime(2020, 2, 15, tzinfo=UTC)
+
+
+def test_mic_history(tmp_path):
+    """Verify point-in-time lookups in the MIC registry history."""
+    fna = str(tmp_path / 'history.feather')
+    history = MICHistory(fna)
+    assert history.as_of('XAAA', '2020-01-20') is None
+    assert history.add(V1, PUB1, IMP1)
+    assert history.add(V2, PUB2, IMP2)
+    assert not history.add(V2, PUB2, IMP2)
+    with pytest.raises(ValueError):
+        history.add(V1, PUB1 - datetime.timedelta(days=1), IMP1)
+    #
+    # Unchanged MICs keep a single state
+    history = MICHistory(fna)
+    assert history.versions == ((PUB1, IMP1), (PUB2, IMP2))
+    assert len(history) == 4
+    #
+    assert history.as_of('XAAA', '2020-01-14') is None
+    assert history.as_of('XBBB', '2020-01-15').status == 'ACTIVE'
+    assert history.as_of('XBBB', datetime.date(2020, 2, 20)).status \
+        == 'DELETED'
+    assert history.as_of('XCCC', '2020-01-20') is None
+    assert history.as_of('XCCC', '2020-02-20').country == 'GERMANY'
+    assert history.as_of('XXXX', '2020-02-20') is None
+    #
+    # Known before the second publication
+    assert history.as_of('XBBB', '2020-02-20',
+                         known_at=PUB2 - datetime.timedelta(days=1)
+                         ).status == 'ACTIVE'
+    assert history.as_of('XCCC', '2020-02-20', known_at=PUB1) is None
+
+
+def test_mic_history_as_of_join(tmp_path):
+    """Verify bulk point-in-time enrichment."""
+    history = MICHistory(str(tmp_path / 'history.feather'))
+    history.add(V1, PUB1, IMP1)
+    history.add(V2, PUB2, IMP2)
+    mics = pandas.Series(['XBBB', 'XBBB', 'XCCC', 'XCCC', 'XXXX', 'XAAA'],
+                         index=list('abcdef'))
+    dates = ['2020-01-20', '2020-02-20', '2020-01-20', '2020-02-20',
+             '2020-02-20', '2020-01-01']
+    df = history.as_of_join(mics, dates)
+    assert list(df.index) == list('abcdef')
+    assert df['VALID'].tolist() == [True, True, False, True, False, False]
+    assert df['STATUS'].astype(object).where(df['VALID'], None).tolist() \
+        == ['ACTIVE', 'DELETED', None, 'ACTIVE', None, None]
+    assert df['OPERATING MIC'].tolist()[:2] == ['XAAA', 'XAAA']
+    #
+    df = history.as_of_join(mics, dates, columns=['STATUS'], known_at=PUB1)
+    assert list(df.columns) == ['STATUS', 'VALID']
+    assert df['STATUS'].tolist()[:2] == ['ACTIVE', 'ACTIVE']
+    assert not df['VALID']['d']
+
+
+@ISO20022ORG_SAMPLES_DIR
+def test_iso10383mic_history(datafiles, caplog):
+    """Verify downloaded publications are added to the history."""
+
+    print('Function: "{}"'.format(inspect.currentframe().f_code.co_name))
+    tmp_path = str(datafiles)
+    d_path = os.path.join(tmp_path, 'www.iso20022.org')
+    mic = ISO10383MIC(mic_site='file://' + d_path + '/',
+                      mic_rel_url='market-identifier-codes.html',
+                      mic_cache_dir=os.path.join(tmp_path, 'cache'),
+                      mic_persistence_dir=os.path.join(tmp_path,
+                                                       'persistence'),
+                      mic_history=True)
+    df = mic.download_mic()
+    mic.download_mic()
+    history = mic.open_history()
+    assert history.versions == ((mic.publication_time,
+                                 mic.implementation_time),)
+    assert len(history) == len(df)
+    assert history.as_of('XNYS', mic.implementation_time) \
+        == mic.lookup('XNYS')
+    assert history.as_of('XNYS', mic.publication_time) is None
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; mode: Python; -*-
+import os
+import time
+import inspect
+import threading
+import pytest
+import pandas
+
+from marketdata.referencedata.mic_index import MICIndex
+from marketdata.referencedata.mic_registry import (MICRegistry,
+                                                   default_registry)
+
+FIXTURE_DIR = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)),
+    'data',
+)
+
+ISO20022ORG_SAMPLES_DIR = pytest.mark.datafiles(
+    os.path.join(FIXTURE_DIR, 'iso10383mic', 'www.iso20022.org'),
+    keep_top_dir=True,
+)
+
+
+class SlowLoader:
+    """Loader updating its attributes one by one, like ISO10383MIC."""
+    def __init__(self):
+        self.generation = 0
+        self.mic = None
+        self.index = None
+        self.publication_time = None
+        self.implementation_time = None
+        self.next_publication_time = None
+        self.fetch_time = None
+        self.from_cache = False
+        self.from_persisted = False
+        self.changes = None
+
+    def download_mic(self):
+        self.generation += 1
+        self.publication_time = self.generation
+        time.sleep(0.001)
+        self.mic = pandas.DataFrame({
+            'MIC': ['XTST'],
+            'OPERATING MIC': ['XTST'],
+            'NAME-INSTITUTION DESCRIPTION': [str(self.generation)]})
+        time.sleep(0.001)
+        self.index = MICIndex(self.mic)
+        self.fetch_time = self.generation
+        return self.mic
+
+
+def test_mic_registry_copy_on_write():
+    """Verify readers never see a partially refreshed registry."""
+    registry = MICRegistry(loader=SlowLoader())
+    assert registry.current is None
+    with pytest.raises(RuntimeError):
+        registry.lookup('XTST')
+    registry.refresh()
+    torn = []
+    seen = set()
+    stop = threading.Event()
+
+    def read():
+        while not stop.is_set():
+            version = registry.current
+            seen.add(version.publication_time)
+            if (version.lookup('XTST').name != str(version.publication_time)
+                    or version.fetch_time != version.publication_time):
+                torn.append(version)
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for t in readers:
+        t.start()
+    for _ in range(50):
+        registry.refresh()
+    stop.set()
+    for t in readers:
+        t.join()
+    assert torn == []
+    assert len(seen) > 1
+    assert registry.current.publication_time == 51
+    assert registry.lookup('XTST').name == '51'
+
+
+@ISO20022ORG_SAMPLES_DIR
+def test_mic_registry(datafiles, caplog):
+    """Verify the registry serves lookups from the current version."""
+
+    print('Function: "{}"'.format(inspect.currentframe().f_code.co_name))
+    tmp_path = str(datafiles)
+    d_path = os.path.join(tmp_path, 'www.iso20022.org')
+    registry = MICRegistry(mic_site='file://' + d_path + '/',
+                           mic_rel_url='market-identifier-codes.html',
+                           mic_cache_dir=os.path.join(tmp_path, 'cache'),
+                           mic_persistence_dir=os.path.join(tmp_path,
+                                                            'persistence'))
+    df = registry.download_mic()
+    version = registry.current
+    assert version.mic is df
+    assert registry.fetch_time == version.fetch_time
+    assert registry.next_publication_time == version.next_publication_time
+    assert registry.lookup('XNYS').mic == 'XNYS'
+    assert registry.operating_mic('XNYS') == 'XNYS'
+    assert registry.validate(['XNYS', 'QQQQ']).tolist() == [True, False]
+    assert registry.enrich(['XNYS'])['VALID'].tolist() == [True]
+    assert registry.search('NEW YORK STOCK')[0].record.mic == 'XNYS'
+    #
+    # Every refresh publishes a new version, the old one is left intact
+    refreshed = registry.refresh()
+    assert refreshed is registry.current
+    assert refreshed is not version
+    assert refreshed.publication_time == version.publication_time
+    assert version.lookup('XNYS') == refreshed.lookup('XNYS')
+
+
+def test_default_registry():
+    """Verify there is one registry per process."""
+    registry = default_registry()
+    assert default_registry(mic_format='xml') is registry
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; mode: Python; -*-
+import os
+import inspect
+import pytest
+
+from marketdata.referencedata.iso10383mic import ISO10383MIC
+from marketdata.referencedata.mic_csv import read_mic_csv
+from marketdata.referencedata.mic_search import MICSearchIndex, tokenize
+
+FIXTURE_DIR = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)),
+    'data',
+)
+
+ISO20022ORG_SAMPLES_DIR = pytest.mark.datafiles(
+    os.path.join(FIXTURE_DIR, 'iso10383mic', 'www.iso20022.org'),
+    keep_top_dir=True,
+)
+
+
+@pytest.fixture(scope='module')
+def index():
+    return MICSearchIndex(read_mic_csv(os.path.join(
+        FIXTURE_DIR, 'iso10383mic', 'www.iso20022.org', 'ISO10383_MIC.csv')))
+
+
+def test_tokenize():
+    """Verify tokens are upper case words without diacritics."""
+    assert tokenize('Československá obchodní banka, a.s.') == [
+        'CESKOSLOVENSKA', 'OBCHODNI', 'BANKA', 'A', 'S']
+    assert tokenize(' ... ') == []
+
+
+def test_mic_search(index):
+    """Verify matching and ranking of searches."""
+    hits = index.search('MERCADO ... GAS')
+    assert [h.record.mic for h in hits] == ['MIBG']
+    # Case, diacritics and partial words
+    assert [h.record.mic for h in index.search('mercado org g')] == ['MIBG']
+    assert {h.record.mic for h in index.search('českoslov', limit=None)} \
+        == {'CBSK', 'CELP', 'CESI', 'CSOB'}
+    #
+    # A MIC code ranks above names
+    hits = index.search('XNYS')
+    assert hits[0].record.mic == 'XNYS'
+    # All terms must match
+    assert [h.record.mic for h in index.search('NEW YORK STOCK EXCHANGE')][0] \
+        == 'XNYS'
+    assert index.search('NEW YORK MADRID') == []
+    #
+    # Ranked by score, then MIC
+    hits = index.search('EXANE', limit=None)
+    assert len(hits) > 3
+    assert all(a.score >= b.score for a, b in zip(hits, hits[1:]))
+    assert all(a.record.mic < b.record.mic
+               for a, b in zip(hits, hits[1:]) if a.score == b.score)
+    assert len(index.search('EXANE', limit=2)) == 2
+    assert index.search('') == []
+
+
+def test_mic_search_fuzzy(index):
+    """Verify terms matching no prefix match similar tokens."""
+    exact = index.search('STOCKHOLM', limit=None)
+    fuzzy = index.search('STOKHOLM', limit=None)
+    assert {h.record.mic for h in fuzzy} == {h.record.mic for h in exact}
+    assert fuzzy[0].score < exact[0].score
+    assert index.search('QQQQQQ') == []
+
+
+@ISO20022ORG_SAMPLES_DIR
+def test_iso10383mic_search(datafiles, caplog):
+    """Verify searching the downloaded MIC registry."""
+
+    print('Function: "{}"'.format(inspect.currentframe().f_code.co_name))
+    tmp_path = str(datafiles)
+    d_path = os.path.join(tmp_path, 'www.iso20022.org')
+    mic = ISO10383MIC(mic_site='file://' + d_path + '/',
+                      mic_rel_url='market-identifier-codes.html',
+                      mic_cache_dir=os.path.join(tmp_path, 'cache'),
+                      mic_persistence_dir=os.path.join(tmp_path,
+                                                       'persistence'))
+    with pytest.raises(RuntimeError):
+        mic.search('EXANE')
+    mic.download_mic()
+    hits = mic.search('madrid gas')
+    assert hits[0].record == mic.lookup('MIBG')
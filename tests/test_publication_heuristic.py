@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; mode: Python; -*-
+import os
+import inspect
+import datetime
+from email.utils import parsedate_to_datetime
+import pytest
+from requests.structures import CaseInsensitiveDict
+
+from marketdata.referencedata.iso10383mic import ISO10383MIC
+from marketdata.referencedata.publication_heuristic import (
+    PublicationHeuristic)
+from marketdata.referencedata.one_day_heuristic import OneDayHeuristic
+from marketdata.referencedata.one_week_heuristic import OneWeekHeuristic
+from marketdata.referencedata import one_week_heuristic
+from marketdata.referencedata.refresh_policy import FixedAgeRefreshPolicy
+from marketdata.referencedata.http_session import HTTPSessionPool
+
+FIXTURE_DIR = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)),
+    'data',
+)
+
+ISO20022ORG_SAMPLES_DIR = pytest.mark.datafiles(
+    os.path.join(FIXTURE_DIR, 'iso10383mic', 'www.iso20022.org'),
+    keep_top_dir=True,
+)
+
+DATE = 'Mon, 10 Aug 2020 12:00:00 GMT'
+SENT = datetime.datetime(2020, 8, 10, 12, tzinfo=datetime.timezone.utc)
+
+
+class Response:
+    def __init__(self, **headers):
+        self.headers = CaseInsensitiveDict(headers)
+
+
+def expires(heuristic, response):
+    return parsedate_to_datetime(heuristic.update_headers(response)['expires'])
+
+
+def test_publication_heuristic_ttl():
+    """Verify the fixed time to live, with and without headers."""
+    assert expires(PublicationHeuristic(), Response(date=DATE)) \
+        == SENT + datetime.timedelta(days=1)
+    assert expires(OneDayHeuristic(), Response(date=DATE)) \
+        == SENT + datetime.timedelta(days=1)
+    assert expires(OneWeekHeuristic(), Response(date=DATE)) \
+        == SENT + datetime.timedelta(weeks=1)
+    assert one_week_heuristic.OneDayHeuristic is OneWeekHeuristic
+    # No date, expires or cache-control headers: sent now
+    now = datetime.datetime.now(tz=datetime.timezone.utc)
+    e = expires(PublicationHeuristic(ttl=datetime.timedelta(hours=2)),
+                Response())
+    assert (now + datetime.timedelta(hours=2) - e
+            < datetime.timedelta(seconds=2))
+    # Cached, with a warning
+    response = Response(date=DATE)
+    OneDayHeuristic().apply(response)
+    assert response.headers['cache-control'] == 'public'
+    assert response.headers['warning'].startswith('110')
+
+
+def test_publication_heuristic_next_publication():
+    """Verify caching until the next publication."""
+    heuristic = PublicationHeuristic(until_next_publication=True)
+    assert expires(heuristic, Response(date=DATE)) \
+        == SENT + datetime.timedelta(days=1)
+    heuristic.next_publication_time = SENT + datetime.timedelta(days=20)
+    assert expires(heuristic, Response(date=DATE)) \
+        == SENT + datetime.timedelta(days=20)
+    # Overdue publication, not before the time to live
+    heuristic.next_publication_time = SENT - datetime.timedelta(days=1)
+    assert expires(heuristic, Response(date=DATE)) \
+        == SENT + datetime.timedelta(days=1)
+    heuristic = PublicationHeuristic()
+    heuristic.next_publication_time = SENT + datetime.timedelta(days=20)
+    assert expires(heuristic, Response(date=DATE)) \
+        == SENT + datetime.timedelta(days=1)
+
+
+def test_publication_heuristic_stale_windows():
+    """Verify the stale windows are set as cache-control extensions."""
+    heuristic = PublicationHeuristic(
+        stale_while_revalidate=datetime.timedelta(hours=1),
+        stale_if_error=datetime.timedelta(days=2))
+    assert heuristic.update_headers(Response(date=DATE))['cache-control'] \
+        == 'public, stale-while-revalidate=3600, stale-if-error=172800'
+
+
+def persisted_kwargs(tmp_path, name):
+    d_path = os.path.join(tmp_path, 'www.iso20022.org')
+    return dict(mic_site='file://' + d_path + '/',
+                mic_rel_url='market-identifier-codes.html',
+                mic_cache_dir=os.path.join(tmp_path, 'cache_' + name),
+                mic_persistence_dir=os.path.join(tmp_path, 'persist_' + name))
+
+
+@ISO20022ORG_SAMPLES_DIR
+def test_iso10383mic_stale_if_error(datafiles):
+    """Verify stale persisted files are used if fetching fails."""
+
+    print('Function: "{}"'.format(inspect.currentframe().f_code.co_name))
+    import requests
+    kwargs = persisted_kwargs(str(datafiles), 'stale_if_error')
+    df = ISO10383MIC(**kwargs).download_mic()
+    # Due for refresh, from an unreachable site, without retries
+    kwargs.update(mic_site='http://127.0.0.1:9/',
+                  mic_http_pool=HTTPSessionPool(retries=0),
+                  mic_refresh_policy=FixedAgeRefreshPolicy(
+                      max_age=datetime.timedelta(0)))
+    with pytest.raises(requests.ConnectionError):
+        ISO10383MIC(**kwargs).download_mic()
+    mic = ISO10383MIC(mic_heuristic=PublicationHeuristic(
+        stale_if_error=datetime.timedelta(days=1)), **kwargs)
+    assert mic.download_mic().equals(df)
+    assert mic.from_persisted is True
+    assert mic.stats.counters['stale_if_error'] == 1
+    # Past the window
+    mic = ISO10383MIC(mic_heuristic=PublicationHeuristic(
+        stale_if_error=datetime.timedelta(0)), **kwargs)
+    with pytest.raises(requests.ConnectionError):
+        mic.download_mic()
+
+
+@ISO20022ORG_SAMPLES_DIR
+def test_iso10383mic_stale_while_revalidate(datafiles):
+    """Verify stale persisted files are used while revalidated."""
+
+    print('Function: "{}"'.format(inspect.currentframe().f_code.co_name))
+    kwargs = persisted_kwargs(str(datafiles), 'stale_while_revalidate')
+    mic = ISO10383MIC(**kwargs)
+    df = mic.download_mic()
+    fetch_time = mic.fetch_time
+    kwargs.update(mic_refresh_policy=FixedAgeRefreshPolicy(
+        max_age=datetime.timedelta(0)))
+    mic = ISO10383MIC(mic_heuristic=PublicationHeuristic(
+        stale_while_revalidate=datetime.timedelta(hours=1)), **kwargs)
+    assert mic.download_mic().equals(df)
+    assert mic.from_persisted is True
+    assert mic.fetch_time == fetch_time
+    assert mic.stats.counters['stale_while_revalidate'] == 1
+    # Revalidated by another instance, in the background
+    mic._revalidation.join(timeout=30)
+    fna_pub = os.path.join(kwargs['mic_persistence_dir'],
+                           'market-identifier-codes.html')
+    assert datetime.datetime.fromtimestamp(
+        os.stat(fna_pub).st_mtime, datetime.timezone.utc) >= fetch_time
+    assert mic.http_cache is None
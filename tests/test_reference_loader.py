@@ -0,0 +1,194 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; mode: Python; -*-
+import os
+import time
+import inspect
+import threading
+import pytest
+
+from marketdata.referencedata.reference_loader import (
+    ReferenceDataSource, ReferenceDataLoader, ReferenceDataError, mic_source)
+from marketdata.referencedata.mic_registry import MICVersion
+
+FIXTURE_DIR = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)),
+    'data',
+)
+
+ISO20022ORG_SAMPLES_DIR = pytest.mark.datafiles(
+    os.path.join(FIXTURE_DIR, 'iso10383mic', 'www.iso20022.org'),
+    keep_top_dir=True,
+)
+
+
+def sleeping(seconds, result=None):
+    def load(deps):
+        time.sleep(seconds)
+        return result
+    return load
+
+
+def failing(deps):
+    raise ValueError('unavailable')
+
+
+def test_reference_loader_concurrent():
+    """Verify independent sources load concurrently."""
+    loader = ReferenceDataLoader()
+    for name in ('a', 'b', 'c'):
+        loader.register(ReferenceDataSource(name, sleeping(0.3, name)))
+    t0 = time.perf_counter()
+    report = loader.load()
+    elapsed = time.perf_counter() - t0
+    assert report.ok
+    assert report.results == {'a': 'a', 'b': 'b', 'c': 'c'}
+    assert loader.results == report.results
+    # Bounded by the slowest source, not the sum
+    assert elapsed < 0.6
+    assert all(s >= 0.3 for s in report.seconds.values())
+    # Or one at a time
+    loader.max_workers = 1
+    assert loader.load(['a', 'b']).elapsed >= 0.6
+
+
+def test_reference_loader_dependencies():
+    """Verify sources load after, and from, their dependencies."""
+    loader = ReferenceDataLoader()
+    order = []
+    lock = threading.Lock()
+
+    def source(name, value, depends_on=(), seconds=0.1):
+        def load(deps):
+            time.sleep(seconds)
+            with lock:
+                order.append(name)
+            return value + sum(deps.values())
+        return loader.register(ReferenceDataSource(name, load,
+                                                   depends_on=depends_on))
+    source('d', 1000, depends_on=['b', 'c'])
+    source('a', 1, seconds=0.2)
+    source('b', 10, depends_on=['a'])
+    source('c', 100)
+    report = loader.load()
+    assert report.results == {'a': 1, 'c': 100, 'b': 11, 'd': 1111}
+    assert order == ['c', 'a', 'b', 'd']
+    # With dependencies only
+    order.clear()
+    assert loader.load(['b']).results == {'a': 1, 'b': 11}
+    assert order == ['a', 'b']
+    with pytest.raises(ValueError):
+        loader.register(ReferenceDataSource('a', failing))
+    with pytest.raises(ValueError):
+        loader.load(['x'])
+    loader.register(ReferenceDataSource('e', failing, depends_on=['x']))
+    with pytest.raises(ValueError, match="unknown source 'x'"):
+        loader.load()
+    loader.unregister('e')
+    # Cycles
+    loader.register(ReferenceDataSource('f', failing, depends_on=['g']))
+    loader.register(ReferenceDataSource('g', failing, depends_on=['f']))
+    with pytest.raises(ValueError, match='cycle f -> g -> f'):
+        loader.load(['f'])
+
+
+def test_reference_loader_failures():
+    """Verify failures are reported, and skip their dependents only."""
+    loader = ReferenceDataLoader()
+    loader.register(ReferenceDataSource('a', sleeping(0, 'a')))
+    loader.register(ReferenceDataSource('b', failing))
+    loader.register(ReferenceDataSource('c', sleeping(0, 'c'),
+                                        depends_on=['b']))
+    loader.register(ReferenceDataSource('d', sleeping(0, 'd'),
+                                        depends_on=['c']))
+    report = loader.load()
+    assert not report.ok
+    assert report.results == {'a': 'a'}
+    assert isinstance(report.errors['b'], ValueError)
+    assert report.skipped == {'c': ['b'], 'd': ['c']}
+    with pytest.raises(ReferenceDataError) as excinfo:
+        report.raise_for_errors()
+    assert excinfo.value.report is report
+    assert 'b (ValueError' in str(excinfo.value)
+    # A failed refresh keeps the former dataset
+    loader = ReferenceDataLoader()
+    calls = []
+
+    def load(deps):
+        calls.append(deps)
+        if len(calls) > 1:
+            raise ConnectionError('unreachable')
+        return 'first'
+    loader.register(ReferenceDataSource('a', load))
+    assert loader.load().ok
+    report = loader.load()
+    assert isinstance(report.errors['a'], ConnectionError)
+    assert loader.results == {'a': 'first'}
+
+
+def test_reference_loader_timeout():
+    """Verify sources past their timeout fail, without waiting."""
+    loader = ReferenceDataLoader()
+    release = threading.Event()
+
+    def hanging(deps):
+        release.wait(10)
+        return 'late'
+    loader.register(ReferenceDataSource('a', hanging, timeout=0.2))
+    loader.register(ReferenceDataSource('b', sleeping(0, 'b'),
+                                        depends_on=['a']))
+    loader.register(ReferenceDataSource('c', sleeping(0.1, 'c'),
+                                        timeout=5))
+    t0 = time.perf_counter()
+    report = loader.load()
+    assert time.perf_counter() - t0 < 1
+    assert isinstance(report.errors['a'], TimeoutError)
+    assert report.seconds['a'] == 0.2
+    assert report.skipped == {'b': ['a']}
+    assert report.results == {'c': 'c'}
+    # Never run twice at once
+    report = loader.load(['a'])
+    assert isinstance(report.errors['a'], TimeoutError)
+    assert report.seconds == {}
+    release.set()
+    time.sleep(0.2)
+    assert 'late' not in loader.results.values()
+    assert loader.load(['a']).results == {'a': 'late'}
+    # Timed out once started, after waiting for a worker
+    release.clear()
+    loader = ReferenceDataLoader(max_workers=1)
+    loader.register(ReferenceDataSource('c', sleeping(0.1, 'c')))
+    loader.register(ReferenceDataSource('a', hanging, timeout=0.2))
+    report = loader.load()
+    assert report.results == {'c': 'c'}
+    assert isinstance(report.errors['a'], TimeoutError)
+    assert str(report.errors['a']).startswith("Load of 'a' timed out")
+    assert report.elapsed < 1
+    release.set()
+
+
+@ISO20022ORG_SAMPLES_DIR
+def test_reference_loader_mic(datafiles):
+    """Verify the MIC registry, and datasets derived from it, load."""
+
+    print('Function: "{}"'.format(inspect.currentframe().f_code.co_name))
+    tmp_path = str(datafiles)
+    d_path = os.path.join(tmp_path, 'www.iso20022.org')
+    loader = ReferenceDataLoader()
+    source = loader.register(mic_source(
+        mic_site='file://' + d_path + '/',
+        mic_rel_url='market-identifier-codes.html',
+        mic_cache_dir=os.path.join(tmp_path, 'cache'),
+        mic_persistence_dir=os.path.join(tmp_path, 'persist'),
+        timeout=60))
+    loader.register(ReferenceDataSource(
+        'countries',
+        lambda deps: set(deps['mic'].mic['ISO COUNTRY CODE (ISO 3166)']),
+        depends_on=['mic']))
+    report = loader.load()
+    report.raise_for_errors()
+    version = report.results['mic']
+    assert isinstance(version, MICVersion)
+    assert version is source.registry.current
+    assert 'US' in report.results['countries']
+    # Refreshed, from the persisted files
+    assert loader.load().results['mic'].from_persisted is True
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8; mode: Python; -*-
+import os
+import inspect
+import datetime
+import threading
+import pytest
+
+from marketdata.referencedata.iso10383mic import ISO10383MIC
+from marketdata.referencedata.refresh_policy import (
+    FixedAgeRefreshPolicy, PublicationRefreshPolicy)
+from marketdata.referencedata.refresh_scheduler import RefreshScheduler
+
+FIXTURE_DIR = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)),
+    'data',
+)
+
+ISO20022ORG_SAMPLES_DIR = pytest.mark.datafiles(
+    os.path.join(FIXTURE_DIR, 'iso10383mic', 'www.iso20022.org'),
+    keep_top_dir=True,
+)
+
+UTC = datetime.timezone.utc
+MINUTE = datetime.timedelta(minutes=1)
+HOUR = datetime.timedelta(hours=1)
+
+
+def test_fixed_age_refresh_policy():
+    """Verify persisted data is fresh for a fixed age."""
+    policy = FixedAgeRefreshPolicy(max_age=23 * HOUR)
+    fetched = datetime.datetime(2020, 7, 20, tzinfo=UTC)
+    assert policy.next_check(fetched, None) == fetched + 23 * HOUR
+    assert policy.is_fresh(fetched, None, now=fetched + 22 * HOUR)
+    assert not policy.is_fresh(fetched, None, now=fetched + 23 * HOUR)
+
+
+def test_publication_refresh_policy():
+    """Verify persisted data is fresh until the next publication.
+
+    And that the source is polled with backoff once it is overdue.
+    """
+    policy = PublicationRefreshPolicy(min_backoff=15 * MINUTE,
+                                      max_backoff=6 * HOUR)
+    next_pub = datetime.datetime(2020, 8, 10, tzinfo=UTC)
+    fetched = datetime.datetime(2020, 7, 14, tzinfo=UTC)
+    assert policy.next_check(fetched, next_pub) == next_pub
+    assert policy.is_fresh(fetched, next_pub, now=next_pub - MINUTE)
+    assert not policy.is_fresh(fetched, next_pub, now=next_pub)
+    #
+    # Overdue, the delay between polls doubles
+    fetched = next_pub
+    polls = []
+    for _ in range(8):
+        fetched = policy.next_check(fetched, next_pub)
+        polls.append(fetched - next_pub)
+    assert polls[:4] == [15 * MINUTE, 30 * MINUTE, 60 * MINUTE, 120 * MINUTE]
+    assert polls[-1] - polls[-2] == 6 * HOUR
+    #
+    assert (policy.next_check(fetched, None) == fetched + 6 * HOUR)
+
+
+@ISO20022ORG_SAMPLES_DIR
+def test_refresh_scheduler(datafiles, caplog):
+    """Verify the background refresh of a registry."""
+
+    print('Function: "{}"'.format(inspect.currentframe().f_code.co_name))
+    tmp_path = str(datafiles)
+    d_path = os.path.join(tmp_path, 'www.iso20022.org')
+    mic = ISO10383MIC(mic_site='file://' + d_path + '/',
+                      mic_rel_url='market-identifier-codes.html',
+                      mic_cache_dir=os.path.join(tmp_path, 'cache_sched'),
+                      mic_persistence_dir=os.path.join(tmp_path,
+                                                       'persistence_sched'),
+                      mic_refresh_policy=FixedAgeRefreshPolicy(
+                          max_age=datetime.timedelta(0)))
+    refreshed = []
+    done = threading.Event()
+
+    def on_refresh(registry):
+        refreshed.append(registry.fetch_time)
+        if len(refreshed) == 2:
+            done.set()
+
+    scheduler = RefreshScheduler(mic,
+                                 retry_min=datetime.timedelta(seconds=0.01),
+                                 on_refresh=on_refresh)
+    scheduler.start()
+    assert done.wait(30)
+    scheduler.stop(timeout=30)
+    assert scheduler.failures == 0
+    assert mic.lookup('EXMP') is not None
+    assert mic.from_persisted is False